@@ -0,0 +1,84 @@
+"""Topologies and helpers shared by the benchmarks.
+
+Topologies are identified by a name used as benchmark parameter, made of the
+model or dataset and its size, e.g. *waxman-1000* or *fat_tree-16*. Random
+topologies are generated with a fixed seed, so that all commits are
+benchmarked against the same topologies.
+"""
+from os import path
+
+import fnss
+
+# Folder of the datasets used by the tests, also used by the benchmarks
+RES_DIR = path.abspath(path.join(path.dirname(__file__), path.pardir,
+                                 'test', 'resources'))
+
+SEED = 1
+
+# Topologies parametrized by size
+SIZED_TOPOLOGIES = {
+    'waxman': lambda n: fnss.waxman_1_topology(n, alpha=0.1, beta=0.05,
+                                               seed=SEED),
+    'ba': lambda n: fnss.barabasi_albert_topology(n, 2, 3, seed=SEED),
+    'fat_tree': fnss.fat_tree_topology,
+}
+
+# Topologies parsed from datasets
+DATASET_TOPOLOGIES = {
+    'rocketfuel-1239': lambda: fnss.parse_rocketfuel_isp_latency(
+        path.join(RES_DIR, 'rocketfuel-1239.latencies.intra'),
+        path.join(RES_DIR, 'rocketfuel-1239.weights.intra')),
+    'rocketfuel-2914': lambda: fnss.parse_rocketfuel_isp_map(
+        path.join(RES_DIR, 'rocketfuel-2914.cch')),
+    'caida': lambda: fnss.parse_caida_as_relationships(
+        path.join(RES_DIR, 'caida-as-rel.txt')),
+}
+
+
+def topology(name):
+    """Return a topology by name, without link attributes
+
+    Parameters
+    ----------
+    name : str
+        The name of the topology, either a dataset or a model followed by
+        its size, e.g. *ba-1000*
+
+    Returns
+    -------
+    topology : Topology or DirectedTopology
+        The topology
+    """
+    if name in DATASET_TOPOLOGIES:
+        return DATASET_TOPOLOGIES[name]()
+    model, size = name.rsplit('-', 1)
+    return SIZED_TOPOLOGIES[model](int(size))
+
+
+def configured_topology(name):
+    """Return a topology by name, with capacities, weights and delays
+    assigned to all links
+
+    Parameters
+    ----------
+    name : str
+        The name of the topology, see :func:`topology`
+
+    Returns
+    -------
+    topology : Topology or DirectedTopology
+        The topology
+    """
+    topo = topology(name)
+    fnss.set_capacities_degree_gravity(topo, [10, 40, 100, 400], 'Mbps')
+    fnss.set_weights_inverse_capacity(topo)
+    fnss.set_delays_constant(topo, 2, 'ms')
+    return topo
+
+
+def disable_memo():
+    """Disable the memoization of results derived from topologies, if
+    supported by the benchmarked version, so that each run is timed in full
+    """
+    if hasattr(fnss, 'set_memo_size'):
+        fnss.set_memo_size(0)
@@ -0,0 +1,40 @@
+"""Benchmarks of the time taken to import FNSS.
+
+Each benchmark returns code that is timed in a fresh interpreter, following
+the conventions of the *timeraw* benchmarks of airspeed velocity (asv). They
+can also be run directly with ``python benchmarks/imports.py``.
+"""
+
+
+def timeraw_import_fnss():
+    return "import fnss"
+
+
+def timeraw_import_fnss_units():
+    return "import fnss; fnss.convert_capacity_value(1, 'Gbps', 'Mbps')"
+
+
+def timeraw_import_fnss_topology():
+    return "import fnss; fnss.Topology"
+
+
+def timeraw_import_fnss_all():
+    return "from fnss import *"
+
+
+if __name__ == '__main__':
+    import subprocess
+    import sys
+    import timeit
+
+    def run(code, repeat=10):
+        """Return the minimum time taken by a fresh interpreter to run code"""
+        return min(timeit.repeat(
+                lambda: subprocess.check_call([sys.executable, '-c', code]),
+                number=1, repeat=repeat))
+
+    startup = run('pass')
+    for name, benchmark in sorted(globals().items()):
+        if name.startswith('timeraw_'):
+            elapsed = run(benchmark()) - startup
+            print('%-30s %8.1f ms' % (name, 1000 * elapsed))
@@ -0,0 +1,51 @@
+"""Benchmarks of the configuration of link and node attributes"""
+import fnss
+
+from .common import topology, configured_topology, disable_memo
+
+
+class TimeLinkAttributes(object):
+    """Functions setting link attributes from local properties of the
+    topology"""
+
+    params = ['waxman-1000', 'ba-1000', 'fat_tree-16', 'rocketfuel-2914',
+              'caida']
+    param_names = ['topology']
+
+    def setup(self, name):
+        self.topology = topology(name)
+        fnss.set_capacities_constant(self.topology, 10, 'Gbps')
+
+    def time_set_capacities_constant(self, name):
+        fnss.set_capacities_constant(self.topology, 10, 'Gbps')
+
+    def time_set_capacities_degree_gravity(self, name):
+        fnss.set_capacities_degree_gravity(self.topology, [10, 40, 100, 400])
+
+    def time_set_weights_inverse_capacity(self, name):
+        fnss.set_weights_inverse_capacity(self.topology)
+
+    def time_set_delays_constant(self, name):
+        fnss.set_delays_constant(self.topology, 2, 'ms')
+
+
+class TimeRoutingLinkAttributes(object):
+    """Functions setting link attributes from the shortest paths of the
+    topology"""
+
+    params = ['ba-100', 'ba-300', 'fat_tree-8', 'rocketfuel-1239']
+    param_names = ['topology']
+
+    def setup(self, name):
+        disable_memo()
+        self.topology = configured_topology(name)
+
+    def time_set_capacities_edge_betweenness(self, name):
+        fnss.set_capacities_edge_betweenness(self.topology, [10, 100, 1000])
+
+    def time_set_capacities_betweenness_gravity(self, name):
+        fnss.set_capacities_betweenness_gravity(self.topology,
+                                                [10, 100, 1000])
+
+    def time_set_buffer_sizes_bw_delay_prod(self, name):
+        fnss.set_buffer_sizes_bw_delay_prod(self.topology)
@@ -0,0 +1,81 @@
+"""Benchmarks of reading and writing topologies, traffic matrices and event
+schedules from/to XML files"""
+from os import path
+from shutil import rmtree
+import random
+import tempfile
+
+import fnss
+
+from .common import SEED, configured_topology
+
+
+class TimeTopologyXML(object):
+
+    params = ['waxman-1000', 'ba-1000', 'fat_tree-16', 'rocketfuel-2914',
+              'caida']
+    param_names = ['topology']
+    timeout = 120
+
+    def setup(self, name):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = path.join(self.tmp_dir, 'topology.xml')
+        self.topology = configured_topology(name)
+        fnss.write_topology(self.topology, self.path)
+
+    def teardown(self, name):
+        rmtree(self.tmp_dir)
+
+    def time_write_topology(self, name):
+        fnss.write_topology(self.topology, self.path)
+
+    def time_read_topology(self, name):
+        fnss.read_topology(self.path)
+
+
+class TimeTrafficMatrixXML(object):
+
+    params = ['ba-100', 'fat_tree-8', 'rocketfuel-1239']
+    param_names = ['topology']
+
+    def setup(self, name):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = path.join(self.tmp_dir, 'traffic_matrix.xml')
+        self.traffic_matrix = fnss.static_traffic_matrix(
+                configured_topology(name), 10, 1)
+        fnss.write_traffic_matrix(self.traffic_matrix, self.path)
+
+    def teardown(self, name):
+        rmtree(self.tmp_dir)
+
+    def time_write_traffic_matrix(self, name):
+        fnss.write_traffic_matrix(self.traffic_matrix, self.path)
+
+    def time_read_traffic_matrix(self, name):
+        fnss.read_traffic_matrix(self.path)
+
+
+class TimeEventScheduleXML(object):
+
+    params = [1000, 100000]
+    param_names = ['n_events']
+
+    def setup(self, n_events):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = path.join(self.tmp_dir, 'event_schedule.xml')
+        rand = random.Random(SEED)
+        self.event_schedule = fnss.EventSchedule(t_unit='ms')
+        for t in range(n_events):
+            self.event_schedule.add(t, {'src': rand.randint(0, 99),
+                                        'dst': rand.randint(0, 99),
+                                        'size': rand.expovariate(0.001)})
+        fnss.write_event_schedule(self.event_schedule, self.path)
+
+    def teardown(self, n_events):
+        rmtree(self.tmp_dir)
+
+    def time_write_event_schedule(self, n_events):
+        fnss.write_event_schedule(self.event_schedule, self.path)
+
+    def time_read_event_schedule(self, n_events):
+        fnss.read_event_schedule(self.path)
@@ -0,0 +1,46 @@
+"""Benchmarks of the generation and parsing of topologies"""
+import fnss
+
+from .common import SEED, DATASET_TOPOLOGIES
+
+
+class TimeWaxman(object):
+
+    params = [100, 1000, 2000]
+    param_names = ['n']
+
+    def time_waxman_1_topology(self, n):
+        fnss.waxman_1_topology(n, alpha=0.1, beta=0.05, seed=SEED)
+
+    def time_waxman_2_topology(self, n):
+        fnss.waxman_2_topology(n, alpha=0.1, beta=0.05, seed=SEED)
+
+
+class TimeBarabasiAlbert(object):
+
+    params = [100, 1000, 3000]
+    param_names = ['n']
+
+    def time_barabasi_albert_topology(self, n):
+        fnss.barabasi_albert_topology(n, 2, 3, seed=SEED)
+
+    def time_extended_barabasi_albert_topology(self, n):
+        fnss.extended_barabasi_albert_topology(n, 2, 3, 0.1, 0.1, seed=SEED)
+
+
+class TimeFatTree(object):
+
+    params = [8, 16, 32]
+    param_names = ['k']
+
+    def time_fat_tree_topology(self, k):
+        fnss.fat_tree_topology(k)
+
+
+class TimeParsers(object):
+
+    params = sorted(DATASET_TOPOLOGIES)
+    param_names = ['dataset']
+
+    def time_parse(self, dataset):
+        DATASET_TOPOLOGIES[dataset]()
@@ -0,0 +1,76 @@
+"""Benchmarks of the generation of traffic matrices and event schedules and
+of the calculation of link loads"""
+import random
+
+import fnss
+from fnss.traffic import trafficmatrices
+
+from .common import SEED, configured_topology, disable_memo
+
+# Topologies on which traffic matrices are generated for all OD pairs
+TRAFFIC_TOPOLOGIES = ['ba-100', 'ba-300', 'fat_tree-8', 'rocketfuel-1239']
+
+
+class TimeTrafficMatrices(object):
+
+    params = TRAFFIC_TOPOLOGIES
+    param_names = ['topology']
+    timeout = 120
+
+    def setup(self, name):
+        disable_memo()
+        self.topology = configured_topology(name)
+        self.traffic_matrix = fnss.static_traffic_matrix(self.topology, 10, 1)
+
+    def time_static_traffic_matrix(self, name):
+        fnss.static_traffic_matrix(self.topology, 10, 1, max_u=0.9)
+
+    def time_stationary_traffic_matrix(self, name):
+        fnss.stationary_traffic_matrix(self.topology, 10, 1, 0.8, 0.2, 5,
+                                       max_u=0.9)
+
+    def time_link_loads(self, name):
+        fnss.link_loads(self.topology, self.traffic_matrix)
+
+    def time_validate_traffic_matrix(self, name):
+        fnss.validate_traffic_matrix(self.topology, self.traffic_matrix,
+                                     validate_load=True)
+
+
+class TimeNfur(object):
+    """Number of Flows Under Failure (NFUR) used by the Ranking Metrics
+    Heuristic on small topologies, computed in a single process"""
+
+    params = ['ba-50', 'ba-100', 'fat_tree-4']
+    param_names = ['topology']
+    timeout = 120
+
+    def setup(self, name):
+        disable_memo()
+        self.topology = configured_topology(name)
+        self.calc_nfur = getattr(trafficmatrices, '__calc_nfur')
+
+    def time_calc_nfur(self, name):
+        self.calc_nfur(self.topology, False, False)
+
+
+def _event(**kwargs):
+    return {'src': random.randint(0, 99), 'dst': random.randint(0, 99),
+            'size': random.expovariate(0.001)}
+
+
+class TimeEventSchedules(object):
+
+    params = [1000, 100000]
+    param_names = ['n_events']
+
+    def setup(self, n_events):
+        random.seed(SEED)
+
+    def time_poisson_process_event_schedule(self, n_events):
+        fnss.poisson_process_event_schedule(1, 0, n_events, 'ms', _event,
+                                            seed=SEED)
+
+    def time_deterministic_process_event_schedule(self, n_events):
+        fnss.deterministic_process_event_schedule(1, 0, n_events, 'ms',
+                                                  _event)
@@ -46,24 +46,26 @@ event_schedule = fnss.poisson_process_event_schedule(
                         duration=60,  # 2 hours
                         t_unit='min',  # minutes
                         event_generator=rand_failure,  # event gen function
-                        links=topology.edges(),  # 'links' argument
+                        links=list(topology.edges()),  # 'links' argument
                         )
 
 # Now let's create a schedule with link restoration events
 # We assume that the duration of a failure is exponentially distributed with
 # average 1 minute.
+# Restore events are not generated in chronological order, so they are all
+# added at once, which sorts them in a single pass
 restore_schedule = fnss.EventSchedule(t_start=0, t_unit='min')
-for failure_time, event in event_schedule:
-    link = event['link']
-    restore_time = failure_time + random.expovariate(1)
-    restore_schedule.add(time=restore_time,
-                         event={'link': link, 'action': 'up'},
-                         absolute_time=True
-                         )
+restore_schedule.add_many(
+        times=[failure_time + random.expovariate(1)
+               for failure_time, _ in event_schedule],
+        events=[{'link': event['link'], 'action': 'up'}
+                for _, event in event_schedule],
+        absolute_time=True
+        )
 
 # Now merge failure and restoration schedules
 # After merging events are still chronologically sorted
-event_schedule.add_schedule(restore_schedule)
+event_schedule.merge(restore_schedule)
 
 # Note: there are several ways to create this link failure-restoration schedule
 # This method has been used to illustrate a variety of functions and methods
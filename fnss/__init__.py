@@ -20,10 +20,9 @@ schedules to the desired target simulator or emulator.
 """
 # check Python version
 import sys
-if sys.version_info[:2] < (2, 7):
-    m = "Python version 2.7 or later is required for FNSS (%d.%d detected)."
+if sys.version_info[:2] < (3, 5):
+    m = "Python version 3.5 or later is required for FNSS (%d.%d detected)."
     raise ImportError(m % sys.version_info[:2])
-del sys
 
 # Import release information
 import fnss.release as release
@@ -32,9 +31,30 @@ __author__ = release.author
 __version__ = release.version
 __license__ = release.license_short
 
-# import all subpackages and modules
-from fnss.topologies import *
-from fnss.netconfig import *
-from fnss.traffic import *
-from fnss.adapters import *
+# import all subpackages and modules. On Python 3.7+ the modules of the
+# subpackages are imported when one of their names is first accessed
+# (PEP 562), so that importing fnss does not import all its dependencies
+from fnss import topologies, netconfig, traffic, adapters
 from fnss.units import *
+import fnss.units as units
+import fnss.util as util
+
+__all__ = (['release', 'units', 'util', 'topologies', 'netconfig', 'traffic',
+            'adapters'] + units.__all__ + topologies.__all__
+           + netconfig.__all__ + traffic.__all__ + adapters.__all__)
+
+if sys.version_info[:2] >= (3, 7):
+    from fnss.util import _lazy_attributes
+    __getattr__, __dir__ = _lazy_attributes(__name__, {
+        'topologies': topologies.__all__,
+        'netconfig': netconfig.__all__,
+        'traffic': traffic.__all__,
+        'adapters': adapters.__all__,
+        })
+    del _lazy_attributes
+else:
+    from fnss.topologies import *
+    from fnss.netconfig import *
+    from fnss.traffic import *
+    from fnss.adapters import *
+del sys
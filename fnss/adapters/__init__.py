@@ -1,8 +1,40 @@
 """Tools for exporting and importing FNSS data structures (topologies,
 event schedules and traffic matrices) to/from other simulators or emulators
 """
-from fnss.adapters.autonetkit import *
-from fnss.adapters.mn import *
-from fnss.adapters.ns2 import *
-from fnss.adapters.omnetpp import *
-from fnss.adapters.jfed import *
+import sys
+
+# Public names of the modules of the package
+_modules = {
+    'autonetkit': (
+        'from_autonetkit', 'to_autonetkit'
+        ),
+    'mn': (
+        'from_mininet', 'to_mininet'
+        ),
+    'ns2': (
+        'to_ns2', 'validate_ns2_stacks'
+        ),
+    'omnetpp': (
+        'to_omnetpp',
+        ),
+    'jfed': (
+        'to_jfed', 'from_jfed'
+        ),
+}
+
+__all__ = list(_modules) + list(name for module in _modules
+                                for name in _modules[module])
+
+# On Python 3.7+ modules are imported when one of their names is first
+# accessed (PEP 562), so that importing the package is fast
+if sys.version_info[:2] >= (3, 7):
+    from fnss.util import _lazy_attributes
+    __getattr__, __dir__ = _lazy_attributes(__name__, _modules)
+    del _lazy_attributes
+else:
+    from fnss.adapters.autonetkit import *
+    from fnss.adapters.mn import *
+    from fnss.adapters.ns2 import *
+    from fnss.adapters.omnetpp import *
+    from fnss.adapters.jfed import *
+del sys
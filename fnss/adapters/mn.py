@@ -8,7 +8,7 @@ import re
 import networkx as nx
 
 from fnss.units import capacity_units, time_units
-from fnss.topologies.topology import Topology
+from fnss.topologies.topology import Topology, _node_index
 from fnss.netconfig import set_delays_constant
 
 __all__ = [
@@ -102,6 +102,19 @@ def to_mininet(topology, switches=None, hosts=None, relabel_nodes=True):
     except ImportError:
         raise ImportError('Cannot import mininet.topo package. '
                           'Make sure Mininet is installed on this machine.')
+    # nodes are labeled from their types, looked up in the node index of the
+    # topology, if all nodes are indexed, rather than checking the type of
+    # all nodes. Otherwise, all nodes are checked, so that nodes without a
+    # type are reported
+    types = _node_index(topology, 'type')
+    if types is not None and sum(len(nodes) for nodes in types.values()) \
+            == topology.number_of_nodes():
+        if hosts is None:
+            hosts = (v for node_type, nodes in types.items()
+                     if 'host' in node_type for v in nodes)
+        if switches is None:
+            switches = (v for node_type, nodes in types.items()
+                        if 'switch' in node_type for v in nodes)
     if hosts is None:
         hosts = (v for v in topology.nodes()
                  if 'host' in topology.node[v]['type'])
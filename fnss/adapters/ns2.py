@@ -9,6 +9,7 @@ from fnss.units import time_units, capacity_units
 from fnss.netconfig.nodeconfig import get_stack, \
                                       get_application_names, \
                                       get_application_properties
+from fnss.topologies.topology import _node_index
 
 
 __all__ = [
@@ -196,7 +197,9 @@ def to_ns2(topology, path, stacks=True):
             warn('Some application stacks cannot be parsed correctly. The '
                  'output file will be generated without stack assignments.')
             stacks = False
-        if not any('stack' in topology.node[v] for v in topology.nodes()):
+        stack_index = _node_index(topology, 'stack')
+        if not (any('stack' in topology.node[v] for v in topology.nodes())
+                if stack_index is None else stack_index):
             stacks = False
     template = Template(__TEMPLATE)
     variables = {
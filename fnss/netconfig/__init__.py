@@ -3,8 +3,55 @@
 The functions provided allow users to add link capacities, delays, weights,
 buffer sizes and deploy protocol stacks and applications
 """
-from fnss.netconfig.buffers import *
-from fnss.netconfig.capacities import *
-from fnss.netconfig.delays import *
-from fnss.netconfig.nodeconfig import *
-from fnss.netconfig.weights import *
+import sys
+
+# Public names of the modules of the package
+_modules = {
+    'buffers': (
+        'set_buffer_sizes_bw_delay_prod', 'set_buffer_sizes_link_bandwidth',
+        'set_buffer_sizes_constant', 'get_buffer_sizes', 'clear_buffer_sizes'
+        ),
+    'capacities': (
+        'set_capacities_constant', 'set_capacities_random',
+        'set_capacities_random_uniform', 'set_capacities_random_power_law',
+        'set_capacities_random_zipf', 'set_capacities_random_zipf_mandelbrot',
+        'set_capacities_degree_gravity', 'set_capacities_betweenness_gravity',
+        'set_capacities_eigenvector_gravity',
+        'set_capacities_communicability_gravity',
+        'set_capacities_pagerank_gravity', 'set_capacities_edge_betweenness',
+        'set_capacities_edge_communicability', 'get_capacities',
+        'clear_capacities'
+        ),
+    'delays': (
+        'PROPAGATION_DELAY_VACUUM', 'PROPAGATION_DELAY_FIBER',
+        'set_delays_constant', 'set_delays_geo_distance', 'get_delays',
+        'clear_delays', 'e2e_delay_matrix', 'rtt_matrix'
+        ),
+    'nodeconfig': (
+        'add_stack', 'get_stack', 'remove_stack', 'clear_stacks',
+        'add_application', 'get_application_names',
+        'get_application_properties', 'remove_application',
+        'clear_applications'
+        ),
+    'weights': (
+        'set_weights_inverse_capacity', 'set_weights_constant',
+        'set_weights_delays', 'get_weights', 'clear_weights'
+        ),
+}
+
+__all__ = list(_modules) + list(name for module in _modules
+                                for name in _modules[module])
+
+# On Python 3.7+ modules are imported when one of their names is first
+# accessed (PEP 562), so that importing the package is fast
+if sys.version_info[:2] >= (3, 7):
+    from fnss.util import _lazy_attributes
+    __getattr__, __dir__ = _lazy_attributes(__name__, _modules)
+    del _lazy_attributes
+else:
+    from fnss.netconfig.buffers import *
+    from fnss.netconfig.capacities import *
+    from fnss.netconfig.delays import *
+    from fnss.netconfig.nodeconfig import *
+    from fnss.netconfig.weights import *
+del sys
@@ -1,8 +1,12 @@
 """Function to assign and manipulate buffer sizes of network interfaces."""
 import networkx as nx
-from numpy import mean
+import numpy as np
+from numpy import isinf
 
 from fnss.units import capacity_units, time_units
+from fnss.topologies.routing import _shortest_paths
+from fnss.netconfig.delays import e2e_delay_matrix
+from fnss.topologies.topology import get_edge_array, set_edge_array
 
 
 __all__ = [
@@ -52,41 +56,30 @@ def set_buffer_sizes_bw_delay_prod(topology, buffer_unit='bytes',
     topology.graph['buffer_unit'] = buffer_unit
     # this filters potential self-loops which would crash the function
     edges = [(u, v) for (u, v) in topology.edges() if u != v]
-    # dictionary listing all end-to-end routes in which a link appears
-    route_presence = dict(zip(edges, [[] for _ in range(len(edges))]))
-    # dictionary with all network routes
-    route = dict(nx.all_pairs_dijkstra_path(topology, weight='weight'))
-    # Dictionary storing end-to-end path delays for each OD pair
-    e2e_delay = {}
-
+    # end-to-end delays and round-trip times between all OD pairs, computed
+    # over the same routes
+    nodes, e2e_delay = e2e_delay_matrix(topology)
+    rtt = e2e_delay + e2e_delay.T
+    index = {v: i for i, v in enumerate(nodes)}
+    # sum and number of RTTs of the end-to-end routes in which a link appears
+    rtt_sum = dict.fromkeys(edges, 0.0)
+    rtt_count = dict.fromkeys(edges, 0)
+    route = _shortest_paths(topology)
     for orig in route:
-        e2e_delay[orig] = {}
-        for dest in route[orig]:
-            path = route[orig][dest]
+        for dest, path in route[orig].items():
             if len(path) <= 1:
                 continue
-            path_delay = 0
+            od_rtt = rtt[index[orig], index[dest]]
             for u, v in zip(path[:-1], path[1:]):
-                if 'delay' in topology.adj[u][v]:
-                    if (u, v) in route_presence:
-                        route_presence[(u, v)].append((orig, dest))
-                    else:
-                        route_presence[(v, u)].append((orig, dest))
-                    path_delay += topology.adj[u][v]['delay']
-                else:
-                    raise ValueError('No link delays available')
-            e2e_delay[orig][dest] = path_delay
+                link = (u, v) if (u, v) in rtt_sum else (v, u)
+                rtt_sum[link] += od_rtt
+                rtt_count[link] += 1
 
     # dict containing mean RTT experienced by flows traversing a specific link
     mean_rtt_dict = {}
-    for (u, v), route in route_presence.items():
-        if route:
-            try:
-                mean_rtt = mean([e2e_delay[o][d] + e2e_delay[d][o]
-                                 for (o, d) in route])
-            except KeyError:
-                raise ValueError('Cannot assign buffer sizes because some '
-                                 'paths do not have corresponding return path')
+    for u, v in edges:
+        if rtt_count[(u, v)] > 0:
+            mean_rtt = rtt_sum[(u, v)] / rtt_count[(u, v)]
         else:
             # if this is the case, then this link is in any shortest path,
             # not even in the one between its endpoint because there is an
@@ -94,24 +87,24 @@ def set_buffer_sizes_bw_delay_prod(topology, buffer_unit='bytes',
             # In this case we arbitrarily set the RTT as the RTT between the
             # link endpoint if that link was used, i.e. twice the delay of the
             # link
-            if (v, u) in edges:
+            if (v, u) in rtt_count:
                 mean_rtt = topology.adj[u][v]['delay'] + \
                            topology.adj[v][u]['delay']
             else:
-                try:
-                    mean_rtt = topology.adj[u][v]['delay'] + e2e_delay[v][u]
-                except KeyError:
-                    raise ValueError('Cannot assign buffer sizes because some '
-                                 'paths do not have corresponding return path')
+                mean_rtt = topology.adj[u][v]['delay'] + \
+                           e2e_delay[index[v], index[u]]
+        if isinf(mean_rtt):
+            raise ValueError('Cannot assign buffer sizes because some '
+                             'paths do not have corresponding return path')
         mean_rtt_dict[(u, v)] = mean_rtt
     norm_factor = capacity_units[capacity_unit] * \
                   time_units[delay_unit] / 8000.0
     if buffer_unit == 'packets':
         norm_factor /= packet_size
-    for u, v in edges:
-        capacity = topology.adj[u][v]['capacity']
-        buffer_size = int(mean_rtt_dict[(u, v)] * capacity * norm_factor)
-        topology.adj[u][v]['buffer'] = buffer_size
+    mean_rtt = np.array([mean_rtt_dict[link] for link in edges])
+    buffer_sizes = mean_rtt * get_edge_array(topology, 'capacity', edges) \
+                   * norm_factor
+    set_edge_array(topology, 'buffer', buffer_sizes.astype(np.int64), edges)
     return
 
 
@@ -167,13 +160,14 @@ def set_buffer_sizes_link_bandwidth(topology, k=1.0, default_size=None,
     norm_factor = capacity_units[topology.graph['capacity_unit']] / 8.0
     if buffer_unit == 'packets':
         norm_factor /= packet_size
-    for u, v in topology.edges():
-        if 'capacity' in topology.adj[u][v]:
-            capacity = topology.adj[u][v]['capacity']
-            buffer_size = int(k * capacity * norm_factor)
-        else:
-            buffer_size = default_size
-        topology.adj[u][v]['buffer'] = buffer_size
+    capacities = get_edge_array(topology, 'capacity')
+    missing = np.isnan(capacities)
+    buffer_sizes = (k * np.where(missing, 0, capacities) * norm_factor
+                    ).astype(np.int64).tolist()
+    if missing.any():
+        buffer_sizes = [default_size if m else size
+                        for m, size in zip(missing.tolist(), buffer_sizes)]
+    set_edge_array(topology, 'buffer', buffer_sizes)
 
 
 def set_buffer_sizes_constant(topology, buffer_size, buffer_unit='bytes',
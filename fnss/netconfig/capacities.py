@@ -6,9 +6,11 @@ to various models.
 from looseversion import LooseVersion
 
 import networkx as nx
+import numpy as np
 
 from fnss.util import random_from_pdf
 from fnss.units import capacity_units
+from fnss.topologies.topology import _memoized, set_edge_array
 
 
 __all__ = [
@@ -68,9 +70,8 @@ def set_capacities_constant(topology, capacity, capacity_unit='Mbps',
                                 / capacity_units[curr_capacity_unit]
     else:
         topology.graph['capacity_unit'] = capacity_unit
-    edges = links or topology.edges()
-    for u, v in edges:
-        topology.adj[u][v]['capacity'] = capacity * conversion_factor
+    set_edge_array(topology, 'capacity', capacity * conversion_factor,
+                   links or None)
     return
 
 
@@ -105,8 +106,9 @@ def set_capacities_random(topology, capacity_pdf, capacity_unit='Mbps'):
     if any((capacity < 0 for capacity in capacity_pdf.keys())):
         raise ValueError('All capacities in capacity_pdf must be positive')
     topology.graph['capacity_unit'] = capacity_unit
-    for u, v in topology.edges():
-        topology.adj[u][v]['capacity'] = random_from_pdf(capacity_pdf)
+    set_edge_array(topology, 'capacity',
+                   [random_from_pdf(capacity_pdf)
+                    for _ in range(topology.number_of_edges())])
     return
 
 
@@ -298,8 +300,10 @@ def set_capacities_betweenness_gravity(topology, capacities,
         shortest paths are calculated based on hop count.
     """
     weight = 'weight' if weighted else None
-    centrality = nx.betweenness_centrality(topology, normalized=False,
-                                           weight=weight)
+    centrality = _memoized(topology, 'betweenness_centrality', (weight,),
+                           (weight,) if weight else (),
+                           nx.betweenness_centrality, topology,
+                           normalized=False, weight=weight)
     _set_capacities_gravity(topology, capacities, centrality, capacity_unit)
 
 
@@ -326,7 +330,9 @@ def set_capacities_eigenvector_gravity(topology, capacities,
     RuntimeError : if the algorithm does not converge in max_iter iterations
     """
     try:
-        centrality = nx.eigenvector_centrality(topology, max_iter=max_iter)
+        centrality = _memoized(topology, 'eigenvector_centrality',
+                               (max_iter,), (), nx.eigenvector_centrality,
+                               topology, max_iter=max_iter)
     except nx.NetworkXError:
         raise RuntimeError('Algorithm did not converge in %d iterations'
                            % max_iter)
@@ -354,8 +360,10 @@ def set_capacities_pagerank_gravity(topology, capacities, capacity_unit='Mbps',
         attributes include *capacity* *delay* and *weight*. If ``None``, all
         links are assigned the same weight.
     """
-    centrality = nx.pagerank_numpy(topology, alpha=alpha, personalization=None,
-                             weight=weight)
+    centrality = _memoized(topology, 'pagerank', (alpha, weight),
+                           (weight,) if weight else (), nx.pagerank_numpy,
+                           topology, alpha=alpha, personalization=None,
+                           weight=weight)
     _set_capacities_gravity(topology, capacities, centrality, capacity_unit)
 
 
@@ -377,7 +385,8 @@ def set_capacities_communicability_gravity(topology, capacities,
     if LooseVersion(nx.__version__) < LooseVersion("2.0"):
         centrality = nx.communicability_centrality(topology)
     else:
-        centrality = nx.subgraph_centrality(topology)
+        centrality = _memoized(topology, 'subgraph_centrality', (), (),
+                               nx.subgraph_centrality, topology)
     _set_capacities_gravity(topology, capacities, centrality, capacity_unit)
 
 
@@ -401,8 +410,10 @@ def set_capacities_edge_betweenness(topology, capacities, capacity_unit='Mbps',
         shortest paths are calculated based on hop count.
     """
     weight = 'weight' if weighted else None
-    centrality = nx.edge_betweenness_centrality(topology, normalized=False,
-                                                weight=weight)
+    centrality = _memoized(topology, 'edge_betweenness_centrality',
+                           (weight,), (weight,) if weight else (),
+                           nx.edge_betweenness_centrality, topology,
+                           normalized=False, weight=weight)
     _set_capacities_proportionally(topology, capacities, centrality,
                                    capacity_unit=capacity_unit)
 
@@ -422,7 +433,8 @@ def set_capacities_edge_communicability(topology, capacities,
     capacity_unit : str, optional
         The unit in which capacity value is expressed (e.g. Mbps, Gbps etc..)
     """
-    communicability = nx.communicability(topology)
+    communicability = _memoized(topology, 'communicability', (), (),
+                                nx.communicability, topology)
     centrality = {(u, v): communicability[u][v]
                   for (u, v) in topology.edges()}
     _set_capacities_proportionally(topology, capacities, centrality,
@@ -504,19 +516,17 @@ def _set_capacities_proportionally(topology, capacities, metric,
     # to prevent float rounding errors
     metric_boundaries[-1] = max_metric + 0.1
 
-    for (u, v), metric_value in metric.items():
-        for i, boundary in enumerate(metric_boundaries):
-            if metric_value <= boundary:
-                capacity = capacities[i]
-                topology.adj[u][v]['capacity'] = capacity
-                break
-        # if the loop is not stopped yet, it means that because of float
-        # rounding error, max_capacity <  metric_boundaries[-1], so we set the
-        # greatest capacity value.
-        # Anyway, the code should never reach this point, because before the
-        # for loop we are already adjusting the value of metric_boundaries[-1]
-        # to make it > max_capacity
-        else: topology.adj[u][v]['capacity'] = capacities[-1]
+    # each link is assigned the capacity of the first metric boundary not
+    # lower than its metric value. Values above all boundaries because of
+    # float rounding errors are assigned the greatest capacity, although this
+    # should never happen since the last boundary is adjusted above
+    links = list(metric)
+    index = np.searchsorted(metric_boundaries,
+                            np.fromiter(metric.values(), np.float64,
+                                        len(links)))
+    index = np.minimum(index, len(capacities) - 1)
+    set_edge_array(topology, 'capacity',
+                   [capacities[i] for i in index.tolist()], links)
 
 
 def get_capacities(topology):
@@ -1,6 +1,12 @@
 """Functions to assign and manipulate link delays."""
 import networkx as nx
+import numpy as np
+
 from fnss.units import time_units, distance_units
+from fnss.topologies.routing import get_routing_backend, \
+                                    shortest_path_attribute_matrix
+from fnss.topologies.topology import FrozenTopology, _memoized, \
+                                    get_edge_array, set_edge_array
 
 __all__ = [
     'PROPAGATION_DELAY_VACUUM',
@@ -8,7 +14,9 @@ __all__ = [
     'set_delays_constant',
     'set_delays_geo_distance',
     'get_delays',
-    'clear_delays'
+    'clear_delays',
+    'e2e_delay_matrix',
+    'rtt_matrix',
            ]
 
 # Propagation delay of light in the vacuum
@@ -58,9 +66,8 @@ def set_delays_constant(topology, delay=1.0, delay_unit='ms', links=None):
                                 / time_units[curr_delay_unit]
     else:
         topology.graph['delay_unit'] = delay_unit
-    edges = links or topology.edges()
-    for u, v in edges:
-        topology.adj[u][v]['delay'] = delay * conversion_factor
+    set_edge_array(topology, 'delay', delay * conversion_factor,
+                   links or None)
 
 
 def set_delays_geo_distance(topology, specific_delay, default_delay=None,
@@ -105,10 +112,11 @@ def set_delays_geo_distance(topology, specific_delay, default_delay=None,
     if distance_unit not in distance_units:
         raise ValueError("The distance_unit attribute of the provided "\
                          "topology (%s) is not valid" % distance_unit)
-    edges = links or topology.edges()
-    if default_delay is None:
-        if any(('length' not in topology.adj[u][v] for u, v in edges)):
-            raise ValueError('All links must have a length attribute')
+    edges = list(links) if links else None
+    lengths = get_edge_array(topology, 'length', edges)
+    missing = np.isnan(lengths)
+    if default_delay is None and missing.any():
+        raise ValueError('All links must have a length attribute')
     if 'delay_unit' in topology.graph and links is not None:
         # If a delay_unit is set, that means that some links have already
         # been assigned delays, so set these delays using the same unit
@@ -123,13 +131,10 @@ def set_delays_geo_distance(topology, specific_delay, default_delay=None,
     length_conv_factor = distance_units[distance_unit]
     # factor to convert default delay in target delay unit
     default_conv_factor = time_units[delay_unit] / time_units[curr_delay_unit]
-    for u, v in edges:
-        if 'length' in topology.adj[u][v]:
-            length = topology.adj[u][v]['length'] * length_conv_factor
-            delay = specific_delay * length * conv_factor
-        else:
-            delay = default_delay * default_conv_factor
-        topology.adj[u][v]['delay'] = delay
+    delays = specific_delay * (lengths * length_conv_factor) * conv_factor
+    if missing.any():
+        delays[missing] = default_delay * default_conv_factor
+    set_edge_array(topology, 'delay', delays, edges)
 
 
 def get_delays(topology):
@@ -170,3 +175,102 @@ def clear_delays(topology):
     topology.graph.pop('delay_unit', None)
     for u, v in topology.edges():
         topology.adj[u][v].pop('delay', None)
+
+
+def e2e_delay_matrix(topology, weight='weight', backend=None):
+    """
+    Return the end-to-end delays of the shortest paths between all pairs of
+    nodes.
+
+    Paths are selected according to link weights and their delay is the sum
+    of the delays of the links they traverse, expressed in the delay unit of
+    the topology. All delays are computed with a single all-pairs shortest
+    path pass.
+
+    The matrix is memoized (see :func:`fnss.topologies.topology.set_memo_size`)
+    and it is recomputed only when the topology changes.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology. All links must have a delay
+    weight : str, optional
+        The link attribute used as link weight to select paths. Links without
+        this attribute are assigned unitary weight. If None, all links have
+        unitary weight
+    backend : str, optional
+        The routing backend, either *networkx* or *scipy*. If None, the default
+        routing backend is used
+
+    Returns
+    -------
+    nodes : list
+        The list of nodes of the topology, used to index the delay matrix
+    delays : 2-d numpy array
+        Read-only matrix whose element [i, j] is the delay of the path from the
+        i-th node to the j-th node of the *nodes* list. Unreachable pairs have
+        delay inf
+
+    Examples
+    --------
+    >>> import fnss
+    >>> topology = fnss.line_topology(3)
+    >>> fnss.set_delays_constant(topology, 2, 'ms')
+    >>> nodes, delays = fnss.e2e_delay_matrix(topology)
+    >>> delays[nodes.index(0), nodes.index(2)]
+    4.0
+    """
+    frozen = isinstance(topology, FrozenTopology)
+    if 'delay_unit' not in topology.graph \
+            or (frozen and np.isnan(topology.delay).any()) \
+            or (not frozen and any('delay' not in topology.adj[u][v]
+                                   for u, v in topology.edges())):
+        raise ValueError('All links must have a delay attribute')
+    if backend is None:
+        backend = get_routing_backend()
+    nodes, delays = _memoized(topology, 'e2e_delay_matrix', (weight, backend),
+                              ('delay', weight) if weight else ('delay',),
+                              _e2e_delay_matrix, topology, weight, backend)
+    return list(nodes), delays
+
+
+def _e2e_delay_matrix(topology, weight, backend):
+    """Compute the end-to-end delay matrix of a topology. See
+    :func:`e2e_delay_matrix`"""
+    nodes, delays = shortest_path_attribute_matrix(topology, 'delay', weight,
+                                                   backend)
+    delays.setflags(write=False)
+    return nodes, delays
+
+
+def rtt_matrix(topology, weight='weight', backend=None):
+    """
+    Return the round-trip times between all pairs of nodes.
+
+    The RTT between two nodes is the sum of the end-to-end delays of the
+    shortest paths in the two directions, as computed by
+    :func:`e2e_delay_matrix`.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology. All links must have a delay
+    weight : str, optional
+        The link attribute used as link weight to select paths. Links without
+        this attribute are assigned unitary weight. If None, all links have
+        unitary weight
+    backend : str, optional
+        The routing backend, either *networkx* or *scipy*. If None, the default
+        routing backend is used
+
+    Returns
+    -------
+    nodes : list
+        The list of nodes of the topology, used to index the RTT matrix
+    rtt : 2-d numpy array
+        Matrix whose element [i, j] is the RTT between the i-th node and the
+        j-th node of the *nodes* list, expressed in the delay unit of the
+        topology. Pairs not reachable in both directions have RTT inf
+    """
+    nodes, delays = e2e_delay_matrix(topology, weight, backend)
+    return nodes, delays + delays.T
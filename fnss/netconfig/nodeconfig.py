@@ -113,9 +113,10 @@ def add_application(topology, node, name, properties=None, **attr):
     elif not isinstance(properties, dict):
         raise TypeError('The attr_dict parameter must be a dictionary')
     properties.update(attr)
-    if 'application' not in topology.node[node]:
-        topology.node[node]['application'] = {}
-    topology.node[node]['application'][name] = properties
+    applications = topology.node[node].get('application', {})
+    applications[name] = properties
+    # assign the dictionary again so that the node index is updated
+    topology.node[node]['application'] = applications
 
 
 def get_application_names(topology, node):
@@ -177,7 +178,10 @@ def remove_application(topology, node, name=None):
         if name is None:
             del topology.node[node]['application']
         elif name in topology.node[node]['application']:
-            del topology.node[node]['application'][name]
+            applications = topology.node[node]['application']
+            del applications[name]
+            # assign the dictionary again so that the node index is updated
+            topology.node[node]['application'] = applications
 
 
 def clear_applications(topology):
@@ -1,5 +1,8 @@
 """Functions to assign and manipulate link weights to a network topology."""
 import networkx as nx
+import numpy as np
+
+from fnss.topologies.topology import get_edge_array, set_edge_array
 
 __all__ = [
     'set_weights_inverse_capacity',
@@ -28,15 +31,10 @@ def set_weights_inverse_capacity(topology):
     >>> fnss.set_capacities_constant(topology, 10, 'Mbps')
     >>> fnss.set_weights_inverse_capacity(topology)
     """
-    try:
-        max_capacity = float(max((topology.adj[u][v]['capacity']
-                                  for u, v in topology.edges())))
-    except KeyError:
+    capacities = get_edge_array(topology, 'capacity')
+    if np.isnan(capacities).any():
         raise ValueError('All links must have a capacity attribute')
-    for u, v in topology.edges():
-        capacity = topology.adj[u][v]['capacity']
-        weight = max_capacity / capacity
-        topology.adj[u][v]['weight'] = weight
+    set_edge_array(topology, 'weight', capacities.max() / capacities)
 
 
 def set_weights_delays(topology):
@@ -57,15 +55,10 @@ def set_weights_delays(topology):
     >>> fnss.set_weights_delays(topology)
 
     """
-    try:
-        min_delay = float(min((topology.adj[u][v]['delay']
-                               for u, v in topology.edges())))
-    except KeyError:
+    delays = get_edge_array(topology, 'delay')
+    if np.isnan(delays).any():
         raise ValueError('All links must have a delay attribute')
-    for u, v in topology.edges():
-        delay = topology.adj[u][v]['delay']
-        weight = delay / min_delay
-        topology.adj[u][v]['weight'] = weight
+    set_edge_array(topology, 'weight', delays / delays.min())
 
 
 def set_weights_constant(topology, weight=1.0, links=None):
@@ -89,9 +82,7 @@ def set_weights_constant(topology, weight=1.0, links=None):
     >>> topology.add_edges_from([(1, 2), (5, 8), (4, 5), (1, 7)])
     >>> fnss.set_weights_constant(topology, weight=1.0, links=[(1, 2), (5, 8), (4, 5)])
     """
-    edges = links or topology.edges()
-    for u, v in edges:
-        topology.adj[u][v]['weight'] = weight
+    set_edge_array(topology, 'weight', weight, links or None)
 
 
 def get_weights(topology):
@@ -1,6 +1,57 @@
 """Tools for creating, manipulating, reading and writing network topologies"""
-from fnss.topologies.datacenter import *
-from fnss.topologies.parsers import *
-from fnss.topologies.randmodels import *
-from fnss.topologies.simplemodels import *
-from fnss.topologies.topology import *
+import sys
+
+# Public names of the modules of the package
+_modules = {
+    'datacenter': (
+        'DatacenterTopology', 'two_tier_topology', 'three_tier_topology',
+        'bcube_topology', 'fat_tree_topology'
+        ),
+    'parsers': (
+        'parse_rocketfuel_isp_map', 'parse_rocketfuel_isp_latency',
+        'parse_caida_as_relationships', 'parse_inet', 'parse_abilene',
+        'parse_brite', 'parse_topology_zoo', 'parse_ashiip'
+        ),
+    'randmodels': (
+        'erdos_renyi_topology', 'waxman_1_topology', 'waxman_2_topology',
+        'barabasi_albert_topology', 'extended_barabasi_albert_topology',
+        'glp_topology'
+        ),
+    'routing': (
+        'ROUTING_BACKENDS', 'RoutingStore', 'build_routing_store',
+        'get_routing_backend', 'set_routing_backend',
+        'all_pairs_shortest_paths', 'shortest_path_attribute_matrix',
+        'shortest_path_length_matrix', 'shortest_path_predecessors'
+        ),
+    'simplemodels': (
+        'ring_topology', 'line_topology', 'star_topology',
+        'full_mesh_topology', 'k_ary_tree_topology', 'dumbbell_topology',
+        'chord_topology'
+        ),
+    'topology': (
+        'Topology', 'DirectedTopology', 'FrozenTopology', 'directed_view',
+        'get_edge_array', 'set_edge_array', 'get_node_array', 'set_node_array',
+        'od_pairs_from_topology', 'fan_in_out_capacities',
+        'rename_edge_attribute', 'rename_node_attribute', 'read_topology',
+        'write_topology', 'read_topology_binary', 'write_topology_binary',
+        'clear_memo', 'get_memo_size', 'set_memo_size'
+        ),
+}
+
+__all__ = list(_modules) + list(name for module in _modules
+                                for name in _modules[module])
+
+# On Python 3.7+ modules are imported when one of their names is first
+# accessed (PEP 562), so that importing the package is fast
+if sys.version_info[:2] >= (3, 7):
+    from fnss.util import _lazy_attributes
+    __getattr__, __dir__ = _lazy_attributes(__name__, _modules)
+    del _lazy_attributes
+else:
+    from fnss.topologies.datacenter import *
+    from fnss.topologies.parsers import *
+    from fnss.topologies.randmodels import *
+    from fnss.topologies.routing import *
+    from fnss.topologies.simplemodels import *
+    from fnss.topologies.topology import *
+del sys
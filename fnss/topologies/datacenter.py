@@ -36,13 +36,13 @@ class DatacenterTopology(Topology):
         """
         Return the list of switch nodes in the topology
         """
-        return [v for v in self.nodes() if self.node[v]['type'] == 'switch']
+        return self.nodes_by_type('switch')
 
     def hosts(self):
         """
         Return the list of host nodes in the topology
         """
-        return [v for v in self.nodes() if self.node[v]['type'] == 'host']
+        return self.nodes_by_type('host')
 
 
 def two_tier_topology(n_core, n_edge, n_hosts):
@@ -0,0 +1,839 @@
+"""Functions to compute shortest path routes and distances of a topology.
+
+Two routing backends are available:
+
+* *networkx*: shortest paths are computed with the Dijkstra implementation of
+  NetworkX. This backend is always available.
+* *scipy*: link weights are converted into a sparse CSR matrix and shortest
+  paths are computed with :func:`scipy.sparse.csgraph.dijkstra`. This backend
+  requires SciPy but is considerably faster on large topologies.
+
+The backend used by FNSS functions computing shortest paths internally (e.g.
+traffic matrix generation, link loads and buffer sizing) can be selected with
+:func:`set_routing_backend`.
+
+Notes
+-----
+Both backends return identical distances. The *networkx* backend returns the
+routes computed by the all_pairs_dijkstra_path function of NetworkX, which
+only updates the route towards a node when a strictly shorter path is found,
+hence the first shortest path discovered is retained. The *scipy* backend
+instead routes each node through its neighbor with the lowest position in the
+list of nodes of the topology among those lying on a shortest path,
+irrespective of the order in which Dijkstra's algorithm visits nodes.
+Distances are compared with a relative tolerance of 1e-9, so that ties are not
+broken by rounding errors. This rule requires link weights to be positive: a
+node whose only shortest paths end with a zero-weight link is reached as found
+by Dijkstra's algorithm. Routes stored by :func:`build_routing_store` follow
+the rule of the *scipy* backend. If a topology has a single shortest path
+between each pair of nodes, both backends return identical routes, otherwise
+routes may differ between backends.
+
+For topologies too large for all-pairs routes to fit in memory, shortest path
+trees can be computed in parallel and stored on disk with
+:func:`build_routing_store` and then queried through a :class:`RoutingStore`.
+"""
+import json
+import os
+import multiprocessing as mp
+
+import networkx as nx
+import numpy as np
+
+from fnss.topologies.topology import FrozenTopology, _networkx_graph, \
+                                    _memoized
+from fnss.util import _tag_value, _untag_value
+
+
+__all__ = [
+    'ROUTING_BACKENDS',
+    'RoutingStore',
+    'build_routing_store',
+    'get_routing_backend',
+    'set_routing_backend',
+    'all_pairs_shortest_paths',
+    'shortest_path_attribute_matrix',
+    'shortest_path_length_matrix',
+    'shortest_path_predecessors',
+           ]
+
+
+# Routing backends supported
+ROUTING_BACKENDS = ('networkx', 'scipy')
+
+# Routing backend used if none is explicitly requested
+_routing_backend = 'networkx'
+
+
+def set_routing_backend(backend):
+    """Set the default routing backend.
+
+    Parameters
+    ----------
+    backend : str
+        The routing backend. It can be either *networkx* or *scipy*
+
+    Examples
+    --------
+    >>> import fnss
+    >>> fnss.set_routing_backend('scipy')
+    """
+    global _routing_backend
+    if backend not in ROUTING_BACKENDS:
+        raise ValueError('Invalid routing backend %s. Valid backends are: %s'
+                         % (str(backend), ', '.join(ROUTING_BACKENDS)))
+    _routing_backend = backend
+
+
+def get_routing_backend():
+    """Return the name of the default routing backend.
+
+    Returns
+    -------
+    backend : str
+        The default routing backend
+    """
+    return _routing_backend
+
+
+def _resolve_backend(backend):
+    """Return the backend to use, validating it"""
+    if backend is None:
+        return _routing_backend
+    if backend not in ROUTING_BACKENDS:
+        raise ValueError('Invalid routing backend %s. Valid backends are: %s'
+                         % (str(backend), ', '.join(ROUTING_BACKENDS)))
+    return backend
+
+
+def _weight_matrix(topology, weight='weight'):
+    """Return the list of nodes of a topology and a CSR matrix of its link
+    weights, whose rows and columns follow the order of the list of nodes.
+
+    Links without the weight attribute are assigned unitary weight, as done by
+    NetworkX. If weight is None, all links are assigned unitary weight.
+    """
+    try:
+        from scipy.sparse import csr_matrix
+    except ImportError:
+        raise ImportError('Cannot import scipy.sparse module. '
+                          'Make sure SciPy is installed on this machine.')
+    nodes = list(topology.nodes())
+    if isinstance(topology, FrozenTopology):
+        links = topology.sources != topology.targets
+        rows = topology.sources[links]
+        cols = topology.targets[links]
+        data = np.ones(len(rows)) if weight is None \
+               else topology.edge_array(weight, 1)[links]
+        if not topology.is_directed():
+            rows, cols = np.concatenate((rows, cols)), \
+                         np.concatenate((cols, rows))
+            data = np.concatenate((data, data))
+        n = len(nodes)
+        return nodes, csr_matrix((data, (rows, cols)), shape=(n, n))
+    index = {v: i for i, v in enumerate(nodes)}
+    rows = []
+    cols = []
+    data = []
+    if weight is None:
+        edges = ((u, v, 1) for u, v in topology.edges())
+    else:
+        edges = topology.edges(data=weight, default=1)
+    for u, v, w in edges:
+        if u == v:
+            continue
+        rows.append(index[u])
+        cols.append(index[v])
+        data.append(w)
+    if not topology.is_directed():
+        rows, cols = rows + cols, cols + rows
+        data = data + data
+    n = len(nodes)
+    matrix = csr_matrix((np.asarray(data, dtype=np.float64),
+                         (np.asarray(rows, dtype=np.int32),
+                          np.asarray(cols, dtype=np.int32))), shape=(n, n))
+    return nodes, matrix
+
+
+# Relative tolerance used to compare path lengths when breaking ties
+_TIE_RTOL = 1e-9
+
+# Maximum number of elements of the arrays used to break ties in a chunk of
+# shortest path trees
+_TIE_CHUNK = 10 ** 7
+
+
+def _tie_break(matrix, distances, predecessors):
+    """Select the predecessor of each node of a set of shortest path trees
+    among all the neighbors lying on a shortest path, choosing the neighbor
+    with the lowest index.
+
+    Parameters
+    ----------
+    matrix : CSR matrix
+        The weight matrix of the topology
+    distances : 2-d numpy array
+        The distances from each source to all nodes
+    predecessors : 2-d numpy array
+        The predecessors computed by Dijkstra's algorithm, used for nodes
+        whose shortest paths all end with a zero-weight link
+
+    Returns
+    -------
+    predecessors : 2-d numpy array
+        The predecessors, with the same shape and type of *predecessors*
+    """
+    n = matrix.shape[0]
+    csc = matrix.tocsc()
+    csc.sort_indices()
+    counts = np.diff(csc.indptr)
+    if n == 0 or csc.nnz == 0:
+        return predecessors
+    # endpoints and weights of all links, sorted by head and then by tail
+    tails = csc.indices
+    heads = np.repeat(np.arange(n), counts)
+    weights = csc.data
+    starts = csc.indptr[:-1][counts > 0]
+    predecessors = predecessors.copy()
+    step = max(1, _TIE_CHUNK // csc.nnz)
+    for i in range(0, len(distances), step):
+        dist = distances[i:i + step]
+        dist_tail = dist[:, tails]
+        dist_head = dist[:, heads]
+        # unreachable nodes have infinite distance and are never on a path
+        with np.errstate(invalid='ignore'):
+            on_path = np.isfinite(dist_head) & (dist_tail < dist_head) & \
+                      (np.abs(dist_tail + weights - dist_head)
+                       <= _TIE_RTOL * np.abs(dist_head))
+        tail = np.minimum.reduceat(np.where(on_path, tails, n), starts,
+                                   axis=1)
+        best = np.full(dist.shape, n)
+        best[:, counts > 0] = tail
+        found = best < n
+        predecessors[i:i + step][found] = best[found]
+    return predecessors
+
+
+def shortest_path_predecessors(topology, weight='weight', sources=None):
+    """Compute the shortest path trees rooted at a set of source nodes.
+
+    This function uses the *scipy* backend, irrespective of the default
+    routing backend, and returns the compact array representation of the
+    shortest path trees.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology
+    weight : str, optional
+        The link attribute used as link weight. Links without this attribute
+        are assigned unitary weight. If None, all links have unitary weight
+    sources : list, optional
+        The source nodes. If None, all nodes of the topology are sources
+
+    Returns
+    -------
+    nodes : list
+        The list of nodes of the topology. The position of a node in this list
+        is the index used to refer to that node in the returned arrays
+    distances : 2-d numpy array
+        Array of shape (len(sources), len(nodes)) whose element [i, j] is the
+        distance from the i-th source to the j-th node (inf if unreachable)
+    predecessors : 2-d numpy array
+        Array of shape (len(sources), len(nodes)) whose element [i, j] is the
+        index of the node preceding the j-th node on the shortest path from
+        the i-th source. It is -9999 if the j-th node is the i-th source or it
+        is not reachable from it
+    """
+    try:
+        from scipy.sparse.csgraph import dijkstra
+    except ImportError:
+        raise ImportError('Cannot import scipy.sparse.csgraph module. '
+                          'Make sure SciPy is installed on this machine.')
+    nodes, matrix = _weight_matrix(topology, weight)
+    if sources is None:
+        indices = np.arange(len(nodes))
+    else:
+        index = {v: i for i, v in enumerate(nodes)}
+        indices = np.asarray([index[v] for v in sources], dtype=np.int32)
+    if len(nodes) == 0 or len(indices) == 0:
+        empty = np.empty((len(indices), len(nodes)))
+        return nodes, empty, empty.astype(np.int32)
+    distances, predecessors = dijkstra(matrix, directed=True, indices=indices,
+                                       return_predecessors=True)
+    return nodes, distances, _tie_break(matrix, distances, predecessors)
+
+
+def _predecessors(topology, weight='weight'):
+    """Return the shortest path trees rooted at all nodes computed by
+    :func:`shortest_path_predecessors`, memoizing them. The returned arrays
+    are shared and read-only"""
+    return _memoized(topology, 'shortest_path_predecessors', (weight,),
+                     (weight,) if weight else (), _read_only_predecessors,
+                     topology, weight)
+
+
+def _read_only_predecessors(topology, weight):
+    """Compute the shortest path trees rooted at all nodes and make the
+    returned arrays read-only, see :func:`_predecessors`"""
+    nodes, distances, predecessors = shortest_path_predecessors(topology,
+                                                                weight)
+    distances.setflags(write=False)
+    predecessors.setflags(write=False)
+    return nodes, distances, predecessors
+
+
+def _paths_from_predecessors(nodes, source, predecessors):
+    """Return all paths of a shortest path tree
+
+    Parameters
+    ----------
+    nodes : list
+        The nodes of the topology
+    source : int
+        The index of the source node of the tree
+    predecessors : list
+        The predecessor of each node in the tree, -9999 if there is none
+
+    Returns
+    -------
+    paths : dict
+        Paths from the source to all reachable nodes, keyed by target node
+    """
+    paths = {source: [nodes[source]]}
+    for target, hop in enumerate(predecessors):
+        if hop < 0 or target in paths:
+            continue
+        # walk up the tree until a node whose path is known is found
+        chain = [target]
+        while hop not in paths:
+            chain.append(hop)
+            hop = predecessors[hop]
+        path = paths[hop]
+        for v in reversed(chain):
+            path = path + [nodes[v]]
+            paths[v] = path
+    return {nodes[v]: path for v, path in paths.items()}
+
+
+def all_pairs_shortest_paths(topology, weight='weight', sources=None,
+                             backend=None):
+    """Compute the shortest paths between all pairs of nodes of a topology
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology
+    weight : str, optional
+        The link attribute used as link weight. Links without this attribute
+        are assigned unitary weight. If None, all links have unitary weight
+    sources : list, optional
+        The source nodes. If None, the paths from all nodes are computed
+    backend : str, optional
+        The routing backend, either *networkx* or *scipy*. If None, the default
+        routing backend is used
+
+    Returns
+    -------
+    paths : dict of dicts
+        The shortest paths, keyed by origin and destination node. Each path is
+        a list of nodes, origin and destination included. This is the same
+        format returned by the all_pairs_dijkstra_path function of NetworkX
+        and it can be used as routing matrix by the
+        :func:`fnss.traffic.trafficmatrices.link_loads` function
+
+    Examples
+    --------
+    >>> import fnss
+    >>> topology = fnss.line_topology(3)
+    >>> paths = fnss.all_pairs_shortest_paths(topology, backend='scipy')
+    >>> paths[0][2]
+    [0, 1, 2]
+    """
+    backend = _resolve_backend(backend)
+    if backend == 'networkx':
+        topology = _networkx_graph(topology)
+        if sources is None:
+            return dict(nx.all_pairs_dijkstra_path(topology, weight=weight))
+        return {v: nx.single_source_dijkstra_path(topology, v, weight=weight)
+                for v in sources}
+    if sources is None:
+        # shortest path trees are shared with the computations of delays
+        nodes, _, predecessors = _predecessors(topology, weight)
+        source_indices = range(len(nodes))
+    else:
+        nodes, _, predecessors = shortest_path_predecessors(topology, weight,
+                                                            sources)
+        index = {v: i for i, v in enumerate(nodes)}
+        source_indices = [index[v] for v in sources]
+    return {nodes[s]: _paths_from_predecessors(nodes, s, pred.tolist())
+            for s, pred in zip(source_indices, predecessors)}
+
+
+def _shortest_paths(topology, weight='weight', sources=None, backend=None):
+    """Return the shortest paths computed by :func:`all_pairs_shortest_paths`,
+    memoizing them. The returned paths are shared and must not be modified"""
+    backend = _resolve_backend(backend)
+    return _memoized(topology, 'all_pairs_shortest_paths',
+                     (weight, None if sources is None else tuple(sources),
+                      backend),
+                     (weight,) if weight else (), all_pairs_shortest_paths,
+                     topology, weight, sources, backend)
+
+
+def shortest_path_length_matrix(topology, weight='weight', backend=None):
+    """Compute the matrix of shortest path distances between all pairs of
+    nodes of a topology
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology
+    weight : str, optional
+        The link attribute used as link weight. Links without this attribute
+        are assigned unitary weight. If None, all links have unitary weight
+    backend : str, optional
+        The routing backend, either *networkx* or *scipy*. If None, the default
+        routing backend is used
+
+    Returns
+    -------
+    nodes : list
+        The list of nodes of the topology, used to index the distance matrix
+    distances : 2-d numpy array
+        Matrix whose element [i, j] is the distance from the i-th node to the
+        j-th node of the *nodes* list. Unreachable pairs have distance inf
+    """
+    backend = _resolve_backend(backend)
+    if backend == 'scipy':
+        nodes, distances, _ = shortest_path_predecessors(topology, weight)
+        return nodes, distances
+    topology = _networkx_graph(topology)
+    nodes = list(topology.nodes())
+    index = {v: i for i, v in enumerate(nodes)}
+    distances = np.full((len(nodes), len(nodes)), np.inf)
+    for u, lengths in nx.all_pairs_dijkstra_path_length(topology,
+                                                        weight=weight):
+        i = index[u]
+        for v, length in lengths.items():
+            distances[i, index[v]] = length
+    return nodes, distances
+
+
+def shortest_path_attribute_matrix(topology, attribute, weight='weight',
+                                   backend=None):
+    """Compute the sum of a link attribute along the shortest paths between all
+    pairs of nodes of a topology.
+
+    Paths are selected according to the *weight* attribute, while the values
+    summed along them are those of the *attribute* attribute. For example, the
+    end-to-end delay of paths routed according to link weights can be
+    computed by passing *delay* as attribute.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology. All links must have the *attribute* attribute
+    attribute : str
+        The link attribute summed along paths
+    weight : str, optional
+        The link attribute used as link weight. Links without this attribute
+        are assigned unitary weight. If None, all links have unitary weight
+    backend : str, optional
+        The routing backend, either *networkx* or *scipy*. If None, the default
+        routing backend is used
+
+    Returns
+    -------
+    nodes : list
+        The list of nodes of the topology, used to index the returned matrix
+    values : 2-d numpy array
+        Matrix whose element [i, j] is the sum of the attribute along the path
+        from the i-th node to the j-th node of the *nodes* list. Unreachable
+        pairs have value inf
+    """
+    backend = _resolve_backend(backend)
+    if backend == 'networkx':
+        # paths are memoized, so that they are computed once for both the
+        # values along them and the callers routing over them
+        routes = _shortest_paths(topology, weight, backend=backend)
+        topology = _networkx_graph(topology)
+        nodes = list(topology.nodes())
+        index = {v: i for i, v in enumerate(nodes)}
+        values = np.full((len(nodes), len(nodes)), np.inf)
+        adj = topology.adj
+        for o, paths in routes.items():
+            row = values[index[o]]
+            for d, path in paths.items():
+                row[index[d]] = sum(adj[u][v][attribute]
+                                    for u, v in zip(path[:-1], path[1:]))
+        return nodes, values
+    nodes, distances, predecessors = _predecessors(topology, weight)
+    n = len(nodes)
+    if n == 0:
+        return nodes, distances.copy()
+    _, attr_matrix = _weight_matrix(topology, attribute)
+    # Value of the link entering each node of each shortest path tree
+    has_parent = predecessors >= 0
+    parent = np.where(has_parent, predecessors, 0)
+    cols = np.broadcast_to(np.arange(n), parent.shape)
+    link_values = np.asarray(attr_matrix[parent.ravel(), cols.ravel()])
+    values = np.where(has_parent, link_values.reshape(parent.shape), 0.0)
+    # Sum values up to the root of the trees by pointer jumping, which
+    # requires a number of iterations logarithmic in the depth of the trees
+    ancestor = np.where(has_parent, predecessors, -1)
+    while True:
+        has_ancestor = ancestor >= 0
+        if not has_ancestor.any():
+            break
+        jump = np.where(has_ancestor, ancestor, 0)
+        values = np.where(has_ancestor,
+                          values + np.take_along_axis(values, jump, axis=1),
+                          values)
+        ancestor = np.where(has_ancestor,
+                            np.take_along_axis(ancestor, jump, axis=1), -1)
+    values[np.isinf(distances)] = np.inf
+    return nodes, values
+
+
+# Name of the index file of a routing store
+_STORE_INDEX = 'index.json'
+
+# Name of the file of the node table of a routing store
+_STORE_NODES = 'nodes.npy'
+
+# Weight matrix used by the worker processes building a routing store
+_store_matrix = None
+
+# Bytes of working memory needed per source node and destination node while
+# building a shard: distances (8 bytes), predecessors (4 bytes) and
+# temporaries used to break ties
+_STORE_PAIR_MEMORY = 16
+
+# Memory budget (in bytes) of the working memory of each shard and of all
+# the worker processes, used when shard size or processes are not specified
+_STORE_SHARD_MEMORY = 2 ** 27
+_STORE_MEMORY = 2 ** 30
+
+
+def _shard_file(path, shard, kind='pred'):
+    """Return the path of a shard file of a routing store"""
+    return os.path.join(path, '%s-%05d.npy' % (kind, shard))
+
+
+def _init_store_worker(matrix):
+    """Initialize a worker process building a routing store"""
+    global _store_matrix
+    _store_matrix = matrix
+
+
+def _build_store_shard(args):
+    """Compute the shortest path trees of a shard of source nodes and write
+    them to the shard files"""
+    from scipy.sparse.csgraph import dijkstra
+    path, shard, start, stop, distances = args
+    n = _store_matrix.shape[0]
+    dist, pred = dijkstra(_store_matrix, directed=True,
+                          indices=np.arange(start, stop),
+                          return_predecessors=True)
+    pred = _tie_break(_store_matrix, dist, pred)
+    pred_shard = np.lib.format.open_memmap(_shard_file(path, shard, 'pred'),
+                                           mode='w+', dtype=np.int32,
+                                           shape=(stop - start, n))
+    pred_shard[:] = pred
+    pred_shard.flush()
+    del pred_shard
+    if distances:
+        dist_shard = np.lib.format.open_memmap(
+                                _shard_file(path, shard, 'dist'), mode='w+',
+                                dtype=np.float64, shape=(stop - start, n))
+        dist_shard[:] = dist
+        dist_shard.flush()
+        del dist_shard
+    return shard
+
+
+def build_routing_store(topology, path, weight='weight', shard_size=None,
+                        distances=False, processes=None):
+    """Compute the shortest path trees rooted at all nodes of a topology and
+    store them on disk.
+
+    Shortest path trees are computed by a pool of processes, each of them
+    computing the trees of a shard of source nodes with the *scipy* routing
+    backend. Each shard is stored as an array of predecessors which can be
+    memory-mapped when queried. This allows to route traffic over topologies
+    whose all-pairs routes would not fit in memory, such as AS-level
+    topologies parsed with
+    :func:`fnss.topologies.parsers.parse_caida_as_relationships`.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology
+    path : str
+        The directory where the routing store is written. It is created if it
+        does not exist
+    weight : str, optional
+        The link attribute used as link weight. Links without this attribute
+        are assigned unitary weight. If None, all links have unitary weight
+    shard_size : int, optional
+        The number of source nodes whose trees are stored in each shard. If
+        None, it is derived from the number of nodes so that each worker
+        process needs at most 128 MB of working memory (up to 1024 sources)
+    distances : bool, optional
+        If True, also store the distances from each source to all other nodes
+    processes : int, optional
+        The number of worker processes. If None, as many processes as the
+        number of cores of the machine are spawned, but no more than those
+        whose working memory fits in 1 GB overall
+
+    Returns
+    -------
+    store : RoutingStore
+        The routing store
+
+    Notes
+    -----
+    The disk space required to store the routes is 4 bytes per pair of nodes
+    (plus 8 bytes per pair of nodes if distances are stored). A topology with
+    70,000 nodes requires approximately 20 GB of disk space.
+
+    Each worker process holds the distances and predecessors of a whole shard
+    in memory while computing it, i.e. approximately 16 bytes per node for
+    each source of the shard. For example, a shard of 1024 sources of a
+    topology with 100,000 nodes needs approximately 1.6 GB of memory. If
+    *shard_size* or *processes* are specified, they should be chosen
+    accordingly.
+
+    Examples
+    --------
+    >>> import fnss
+    >>> topology = fnss.erdos_renyi_topology(100, 0.1)
+    >>> store = fnss.build_routing_store(topology, 'routes')
+    >>> store[0][10]
+    [0, 35, 10] # random
+    """
+    if shard_size is not None and shard_size < 1:
+        raise ValueError('shard_size must be a positive integer')
+    nodes, matrix = _weight_matrix(topology, weight)
+    if not os.path.exists(path):
+        os.makedirs(path)
+    n = len(nodes)
+    # working memory of a worker per source node of a shard
+    source_memory = _STORE_PAIR_MEMORY * max(n, 1)
+    if shard_size is None:
+        shard_size = max(1, min(1024, _STORE_SHARD_MEMORY // source_memory))
+    shards = [(path, i, start, min(start + shard_size, n), distances)
+              for i, start in enumerate(range(0, n, shard_size))]
+    if processes is None:
+        try:
+            processes = mp.cpu_count()
+        except NotImplementedError:
+            processes = 1
+        processes = min(processes,
+                        _STORE_MEMORY // (shard_size * source_memory))
+    processes = max(1, min(processes, len(shards)))
+    if processes == 1:
+        _init_store_worker(matrix)
+        try:
+            for shard in shards:
+                _build_store_shard(shard)
+        finally:
+            _init_store_worker(None)
+    else:
+        pool = mp.Pool(processes, initializer=_init_store_worker,
+                       initargs=(matrix,))
+        try:
+            pool.map(_build_store_shard, shards)
+        finally:
+            pool.close()
+            pool.join()
+    index = {'directed': topology.is_directed(),
+             'weight': weight,
+             'shard_size': shard_size,
+             'shards': len(shards),
+             'distances': distances}
+    # nodes are stored in an array if they are all integers or all strings,
+    # otherwise as values tagged with their type in the index
+    node_types = set(type(v) for v in nodes)
+    if node_types == set([int]) or node_types == set([str]):
+        np.save(os.path.join(path, _STORE_NODES), np.asarray(nodes),
+                allow_pickle=False)
+    else:
+        index['nodes'] = [_tag_value(v) for v in nodes]
+    with open(os.path.join(path, _STORE_INDEX), 'w') as f:
+        json.dump(index, f)
+    return RoutingStore(path)
+
+
+class RoutingStore(object):
+    """Class providing access to the shortest path routes of a topology stored
+    on disk by :func:`build_routing_store`.
+
+    Shards are memory-mapped on first access, so only the pages of the shards
+    actually queried are loaded in memory.
+
+    The routes from an origin node can be accessed with the expression
+    ``store[origin]``, which returns a read-only mapping of paths keyed by
+    destination node. Therefore a routing store can be used in place of the
+    routing matrix argument of
+    :func:`fnss.traffic.trafficmatrices.link_loads`.
+
+    Parameters
+    ----------
+    path : str
+        The directory where the routing store is located
+    """
+
+    def __init__(self, path):
+        """Open a routing store
+
+        Parameters
+        ----------
+        path : str
+            The directory where the routing store is located
+        """
+        with open(os.path.join(path, _STORE_INDEX)) as f:
+            index = json.load(f)
+        self.directory = path
+        self.attrib = {'directed': index['directed'],
+                       'weight': index['weight']}
+        if 'nodes' in index:
+            self.nodes = [_untag_value(v) for v in index['nodes']]
+        else:
+            self.nodes = np.load(os.path.join(path, _STORE_NODES),
+                                 allow_pickle=False).tolist()
+        self.node_index = {v: i for i, v in enumerate(self.nodes)}
+        self._shard_size = index['shard_size']
+        self._has_distances = index['distances']
+        self._shards = {}
+
+    def __len__(self):
+        """Return the number of origin nodes of the store"""
+        return len(self.nodes)
+
+    def __iter__(self):
+        """Iterate over the origin nodes of the store"""
+        return iter(self.nodes)
+
+    def __contains__(self, origin):
+        """Test whether the store contains routes from a node"""
+        return origin in self.node_index
+
+    def __getitem__(self, origin):
+        """Return all the routes from an origin node, keyed by destination
+        node. Use the expression 'path = store[origin][destination]'
+        """
+        return _RoutingStoreRow(self, origin, self.predecessors(origin))
+
+    def _shard_row(self, origin, kind):
+        """Return the row of a shard relative to an origin node"""
+        i = self.node_index[origin]
+        shard, row = divmod(i, self._shard_size)
+        if (kind, shard) not in self._shards:
+            shard_file = _shard_file(self.directory, shard, kind)
+            self._shards[(kind, shard)] = np.load(shard_file, mmap_mode='r')
+        return self._shards[(kind, shard)][row]
+
+    def predecessors(self, origin):
+        """Return the shortest path tree rooted at a node
+
+        Parameters
+        ----------
+        origin : any hashable type
+            The root of the tree
+
+        Returns
+        -------
+        predecessors : numpy array
+            The index (in the *nodes* attribute) of the predecessor of each
+            node on the tree, or -9999 if the node is the origin or it is
+            not reachable from it
+        """
+        return self._shard_row(origin, 'pred')
+
+    def distances(self, origin):
+        """Return the distances from an origin node to all nodes
+
+        Parameters
+        ----------
+        origin : any hashable type
+            The origin node
+
+        Returns
+        -------
+        distances : numpy array
+            The distance to each node, following the order of the *nodes*
+            attribute. Unreachable nodes have infinite distance
+        """
+        if not self._has_distances:
+            raise ValueError('This routing store does not contain distances')
+        return self._shard_row(origin, 'dist')
+
+    def path(self, origin, destination):
+        """Return the shortest path between two nodes
+
+        Parameters
+        ----------
+        origin : any hashable type
+            The origin node
+        destination : any hashable type
+            The destination node
+
+        Returns
+        -------
+        path : list
+            The list of nodes on the path, origin and destination included
+
+        Raises
+        ------
+        KeyError
+            If there is no path from origin to destination
+        """
+        return self[origin][destination]
+
+
+class _RoutingStoreRow(object):
+    """Read-only mapping of the shortest paths from an origin node, keyed by
+    destination node"""
+
+    def __init__(self, store, origin, predecessors):
+        self._store = store
+        self._origin = origin
+        self._pred = predecessors
+        self._source = store.node_index[origin]
+
+    def __getitem__(self, destination):
+        target = self._store.node_index[destination]
+        if target == self._source:
+            return [self._origin]
+        nodes = self._store.nodes
+        pred = self._pred
+        hop = int(pred[target])
+        if hop < 0:
+            raise KeyError('There is no path from %s to %s'
+                           % (str(self._origin), str(destination)))
+        path = [destination]
+        while hop != self._source:
+            path.append(nodes[hop])
+            hop = int(pred[hop])
+        path.append(self._origin)
+        path.reverse()
+        return path
+
+    def __contains__(self, destination):
+        target = self._store.node_index.get(destination)
+        return target is not None and \
+               (target == self._source or self._pred[target] >= 0)
+
+    def __iter__(self):
+        nodes = self._store.nodes
+        for target in np.flatnonzero(self._pred >= 0).tolist():
+            yield nodes[target]
+        yield self._origin
+
+    def __len__(self):
+        return int(np.count_nonzero(self._pred >= 0)) + 1
+
+    def keys(self):
+        return list(self)
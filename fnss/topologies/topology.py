@@ -1,18 +1,38 @@
 """Basic functions and classes for operating on network topologies."""
+from collections import OrderedDict
+from copy import deepcopy
+import hashlib
+import json
+import pickle
+import struct
+import threading
+import weakref
 import xml.etree.cElementTree as ET
 import networkx as nx
+import numpy as np
 import fnss.util as util
 
 
 __all__ = [
     'Topology',
     'DirectedTopology',
+    'FrozenTopology',
+    'directed_view',
+    'get_edge_array',
+    'set_edge_array',
+    'get_node_array',
+    'set_node_array',
     'od_pairs_from_topology',
     'fan_in_out_capacities',
     'rename_edge_attribute',
     'rename_node_attribute',
     'read_topology',
     'write_topology',
+    'read_topology_binary',
+    'write_topology_binary',
+    'clear_memo',
+    'get_memo_size',
+    'set_memo_size',
            ]
 
 
@@ -64,6 +84,36 @@ class BaseTopology(object):
         """
         return nx.get_edge_attributes(self, 'buffer')
 
+    def get_edge_array(self, attribute, links=None, default=np.nan,
+                       dtype=np.float64):
+        """Return the values of a link attribute as an array.
+
+        See :func:`get_edge_array`
+        """
+        return get_edge_array(self, attribute, links, default, dtype)
+
+    def set_edge_array(self, attribute, values, links=None):
+        """Set the values of a link attribute from an array.
+
+        See :func:`set_edge_array`
+        """
+        set_edge_array(self, attribute, values, links)
+
+    def get_node_array(self, attribute, nodes=None, default=np.nan,
+                       dtype=np.float64):
+        """Return the values of a node attribute as an array.
+
+        See :func:`get_node_array`
+        """
+        return get_node_array(self, attribute, nodes, default, dtype)
+
+    def set_node_array(self, attribute, values, nodes=None):
+        """Set the values of a node attribute from an array.
+
+        See :func:`set_node_array`
+        """
+        set_node_array(self, attribute, values, nodes)
+
     def stacks(self):
         """Return a dictionary of all node stacks, keyed by node
 
@@ -86,6 +136,138 @@ class BaseTopology(object):
         """
         return nx.get_node_attributes(self, 'application')
 
+    def freeze(self):
+        """Return an immutable snapshot of the topology, storing adjacency in
+        CSR format and link attributes in NumPy arrays
+
+        Returns
+        -------
+        topology : FrozenTopology
+            The snapshot of the topology
+        """
+        return FrozenTopology(self)
+
+    def fingerprint(self, attributes=None):
+        """Return a fingerprint of the structure and attributes of the
+        topology.
+
+        The fingerprint is computed from the current state of the topology,
+        hence it changes whenever nodes, links or the selected attributes
+        change. It is used to key the results of the computations memoized by
+        FNSS, such as shortest paths and centralities.
+
+        Fingerprints are cached and only computed again after the topology
+        changes. Changes are detected by the dictionaries in which the
+        topology stores its properties, nodes, links and their attributes,
+        whichever method modifies them. If any of these dictionaries is
+        replaced by one of another type, fingerprints are computed on every
+        call. Changes to mutable values stored in these dictionaries, e.g.
+        appending to a list stored as topology property or modifying the
+        properties of the stack of a node in place, cannot be detected:
+        after such changes, :func:`clear_memo` must be called to discard
+        cached fingerprints and memoized results.
+
+        Parameters
+        ----------
+        attributes : iterable, optional
+            The link attributes included in the fingerprint. If None, all
+            topology, node and link attributes are included. Otherwise, only
+            nodes, links and the given link attributes are included
+
+        Returns
+        -------
+        fingerprint : str
+            The hexadecimal digest of the fingerprint
+
+        Examples
+        --------
+        >>> import fnss
+        >>> topology = fnss.line_topology(3)
+        >>> fingerprint = topology.fingerprint()
+        >>> structure = topology.fingerprint(attributes=())
+        >>> fnss.set_weights_constant(topology, 2)
+        >>> topology.fingerprint() == fingerprint
+        False
+        >>> topology.fingerprint(attributes=()) == structure
+        True
+        """
+        key = None if attributes is None else tuple(attributes)
+        tracker = _topology_tracker(self)
+        if tracker is None:
+            return _fingerprint(self, key)
+        # cached fingerprints are also discarded by clear_memo
+        version = (tracker.version, _memo_epoch)
+        cached = tracker.fingerprints.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        fingerprint = _fingerprint(self, key)
+        tracker.fingerprints[key] = (version, fingerprint)
+        return fingerprint
+
+    def nodes_by_type(self, node_type):
+        """Return the list of nodes whose *type* attribute is node_type.
+
+        Nodes are looked up in an index of the topology, maintained as node
+        attributes change, rather than scanning all nodes.
+
+        Parameters
+        ----------
+        node_type : any hashable type
+            The type of the nodes
+
+        Returns
+        -------
+        nodes : list
+            The nodes, in node order
+
+        Examples
+        --------
+        >>> import fnss
+        >>> topology = fnss.star_topology(3)
+        >>> topology.nodes_by_type('root')
+        [0]
+        """
+        return _indexed_nodes(self, 'type', node_type)
+
+    def nodes_by_stack(self, name):
+        """Return the list of nodes on which a stack is deployed.
+
+        Nodes are looked up in an index of the topology, maintained as node
+        attributes change, rather than scanning all nodes.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stack
+
+        Returns
+        -------
+        nodes : list
+            The nodes, in node order
+        """
+        return _indexed_nodes(self, 'stack', name)
+
+    def nodes_by_application(self, name):
+        """Return the list of nodes on which an application is deployed.
+
+        Nodes are looked up in an index of the topology, maintained as node
+        attributes change, rather than scanning all nodes. Applications must
+        be added and removed with the functions of the
+        :mod:`fnss.netconfig.nodeconfig` module or by assigning the whole
+        *application* dictionary of a node for the index to be updated.
+
+        Parameters
+        ----------
+        name : str
+            The name of the application
+
+        Returns
+        -------
+        nodes : list
+            The nodes, in node order
+        """
+        return _indexed_nodes(self, 'application', name)
+
     @property
     def node(self):
         # Alias for nodes, since nx.Graph.node was deprecated in 2.3 but is widely
@@ -93,9 +275,524 @@ class BaseTopology(object):
         return self.nodes
 
 
+# Node attributes indexed by topologies
+_INDEXED_NODE_ATTRIBUTES = ('type', 'stack', 'application')
+
+
+def _index_keys(attribute, value):
+    """Return the keys under which a node is indexed for a value of an
+    indexed attribute: the type, the name of the stack or the names of the
+    applications"""
+    if type(value) is str and attribute == 'type':
+        return (value,)
+    try:
+        if attribute == 'stack':
+            keys = (value[0],)
+        elif attribute == 'application':
+            keys = tuple(value)
+        else:
+            keys = (value,)
+        for key in keys:
+            hash(key)
+    except (TypeError, IndexError, KeyError):
+        return ()
+    return keys
+
+
+class _Tracker(object):
+    """Version of the dictionaries of a topology, incremented whenever any
+    of them changes, and cache of the fingerprints of the topology.
+
+    A tracker is invalidated when one of its dictionaries is bound to another
+    tracker, since changes to that dictionary are no longer counted.
+    """
+
+    __slots__ = ('version', 'valid', 'fingerprints')
+
+    def __init__(self):
+        self.version = 0
+        self.valid = True
+        # (version, fingerprint) tuples keyed by fingerprinted attributes
+        self.fingerprints = {}
+
+
+class _TrackedDict(dict):
+    """Dictionary of the topology or link attributes of a topology, which
+    can be bound to a tracker.
+
+    The dictionary behaves as a plain dictionary until it is bound to a
+    tracker by :func:`_bind`, which changes its class to
+    :class:`_BoundDict`, so that topologies are built at the speed of plain
+    dictionaries until they are first fingerprinted.
+    """
+
+    __slots__ = ('_tracker',)
+
+    def __reduce__(self):
+        # pickled unbound, bound again when the topology is fingerprinted
+        return (_TrackedDict, (dict(self),))
+
+
+class _Adjacency(_TrackedDict):
+    """Dictionary of the neighbors of the nodes of a topology, or of the
+    links of a node to its neighbors, which can be bound to a tracker, see
+    :class:`_TrackedDict`"""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (_Adjacency, (dict(self),))
+
+
+class _BoundDict(_TrackedDict):
+    """Dictionary bound to a tracker, incrementing its version whenever it
+    changes"""
+
+    __slots__ = ()
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._tracker.version += 1
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._tracker.version += 1
+
+    def pop(self, key, *default):
+        value = dict.pop(self, key, *default)
+        self._tracker.version += 1
+        return value
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self._tracker.version += 1
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._tracker.version += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        dict.clear(self)
+        self._tracker.version += 1
+
+
+class _BoundAdjacency(_Adjacency, _BoundDict):
+    """Adjacency dictionary bound to a tracker, incrementing its version
+    whenever it changes and binding the dictionaries stored in it to the
+    same tracker"""
+
+    __slots__ = ()
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._tracker.version += 1
+        _bind(value, self._tracker)
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._tracker.version += 1
+        for value in self.values():
+            _bind(value, self._tracker)
+
+
+# Classes of the dictionaries bound to a tracker, keyed by unbound class
+_BOUND_CLASSES = {_TrackedDict: _BoundDict, _Adjacency: _BoundAdjacency}
+
+
+def _bind(tracked, tracker):
+    """Bind a dictionary of a topology, and the dictionaries stored in it if
+    it is an adjacency dictionary, to a tracker. The tracker is invalidated
+    if the dictionary cannot be tracked"""
+    bound_class = _BOUND_CLASSES.get(type(tracked))
+    if bound_class is not None:
+        tracked.__class__ = bound_class
+    elif isinstance(tracked, _BoundDict):
+        if tracked._tracker is not tracker:
+            tracked._tracker.valid = False
+    else:
+        tracker.valid = False
+        return
+    tracked._tracker = tracker
+    if isinstance(tracked, _Adjacency):
+        for value in tracked.values():
+            _bind(value, tracker)
+
+
+def _track(topology):
+    """Bind all the dictionaries of a topology to a new tracker and return
+    it, or return None if any of them cannot be tracked"""
+    tracker = _Tracker()
+    _bind(topology.graph, tracker)
+    _bind(topology._adj, tracker)
+    if topology.is_directed():
+        _bind(topology._pred, tracker)
+    nodes = topology._node
+    if isinstance(nodes, _NodeDict):
+        if nodes._tracker is not None and nodes._tracker is not tracker:
+            nodes._tracker.valid = False
+        nodes._tracker = tracker
+    else:
+        tracker.valid = False
+    return tracker if tracker.valid else None
+
+
+def _topology_tracker(topology):
+    """Return the tracker of a topology, binding its dictionaries to a new
+    one if they are not all bound to the same valid tracker, or None if the
+    topology cannot be tracked"""
+    tracker = getattr(topology._adj, '_tracker', None)
+    if tracker is not None and tracker.valid \
+            and getattr(topology.graph, '_tracker', None) is tracker \
+            and getattr(topology._node, '_tracker', None) is tracker \
+            and (not topology.is_directed()
+                 or getattr(topology._pred, '_tracker', None) is tracker):
+        return tracker
+    return _track(topology)
+
+
+class _NodeAttributes(dict):
+    """Dictionary of the attributes of a node of a topology, updating the
+    node index of the topology when indexed attributes change.
+
+    The dictionary is unbound, and behaves as a plain dictionary, until it
+    is stored in the node dictionary of a topology.
+    """
+
+    __slots__ = ('_nodes', '_node')
+
+    def __reduce__(self):
+        # pickled unbound, indexed again when unpickled
+        return (_NodeAttributes, (dict(self),))
+
+    def _bind(self, nodes, node):
+        """Attach to the node dictionary of a topology and index the node"""
+        self._nodes = nodes
+        self._node = node
+        for attribute in _INDEXED_NODE_ATTRIBUTES:
+            if attribute in self:
+                nodes._index(node, attribute,
+                             dict.__getitem__(self, attribute))
+
+    def _unbind(self):
+        """Remove the node from the index and detach from the topology"""
+        for attribute in _INDEXED_NODE_ATTRIBUTES:
+            self._nodes._unindex(self._node, attribute)
+        del self._nodes
+        del self._node
+
+    def _reindex(self, attribute):
+        """Update the index entries of an attribute of the node"""
+        try:
+            nodes = self._nodes
+        except AttributeError:
+            return
+        nodes._unindex(self._node, attribute)
+        if attribute in self:
+            nodes._index(self._node, attribute,
+                         dict.__getitem__(self, attribute))
+
+    def _changed(self, key):
+        """Update the index if an indexed attribute changed and increment the
+        version of the tracker of the topology, if bound"""
+        try:
+            nodes = self._nodes
+        except AttributeError:
+            return
+        if key in _INDEXED_NODE_ATTRIBUTES:
+            self._reindex(key)
+        nodes._changed()
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._changed(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changed(key)
+
+    def pop(self, key, *default):
+        value = dict.pop(self, key, *default)
+        self._changed(key)
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._changed(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        if hasattr(self, '_nodes'):
+            for attribute in _INDEXED_NODE_ATTRIBUTES:
+                if attribute in self:
+                    self._reindex(attribute)
+            self._nodes._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        dict.clear(self)
+        for attribute in _INDEXED_NODE_ATTRIBUTES:
+            self._reindex(attribute)
+        if hasattr(self, '_nodes'):
+            self._nodes._changed()
+
+
+class _NodeDict(dict):
+    """Dictionary of the nodes of a topology, keyed by node, maintaining an
+    index of the nodes by the values of the indexed node attributes.
+
+    The index maps each indexed attribute to a dictionary of the nodes,
+    keyed by index key, see :func:`_index_keys`. The nodes of each index key
+    are stored in a dictionary mapping each node to its position in the node
+    dictionary, so that they can be returned in node order.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(_NodeDict, self).__init__()
+        self.index = {attribute: {} for attribute in _INDEXED_NODE_ATTRIBUTES}
+        # index keys of each node, by attribute
+        self._keys = {attribute: {} for attribute in _INDEXED_NODE_ATTRIBUTES}
+        # increasing positions of the nodes, in the order of the dictionary
+        self._positions = {}
+        self._next_position = 0
+        self._tracker = None
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return (_NodeDict, (), None, None, iter(self.items()))
+
+    def _index(self, node, attribute, value):
+        """Add a node to the index for a value of an attribute"""
+        keys = _index_keys(attribute, value)
+        if keys:
+            index = self.index[attribute]
+            for key in keys:
+                index.setdefault(key, {})[node] = self._positions[node]
+            self._keys[attribute][node] = keys
+
+    def _changed(self):
+        """Increment the version of the tracker, if bound"""
+        if self._tracker is not None:
+            self._tracker.version += 1
+
+    def _unindex(self, node, attribute):
+        """Remove a node from the index for an attribute"""
+        keys = self._keys[attribute].pop(node, None)
+        if keys is None:
+            return
+        index = self.index[attribute]
+        for key in keys:
+            nodes = index.get(key)
+            if nodes is not None:
+                nodes.pop(node, None)
+                if not nodes:
+                    del index[key]
+
+    def __setitem__(self, node, attributes):
+        if node in self:
+            dict.__getitem__(self, node)._unbind()
+        else:
+            self._positions[node] = self._next_position
+            self._next_position += 1
+        # attribute dictionaries are adopted if new, copied otherwise
+        if type(attributes) is not _NodeAttributes \
+                or hasattr(attributes, '_nodes'):
+            attributes = _NodeAttributes(attributes)
+        dict.__setitem__(self, node, attributes)
+        attributes._bind(self, node)
+        self._changed()
+
+    def __delitem__(self, node):
+        dict.__getitem__(self, node)._unbind()
+        dict.__delitem__(self, node)
+        del self._positions[node]
+        self._changed()
+
+    def pop(self, node, *default):
+        if node in self:
+            dict.__getitem__(self, node)._unbind()
+            del self._positions[node]
+        value = dict.pop(self, node, *default)
+        self._changed()
+        return value
+
+    def popitem(self):
+        node, attributes = dict.popitem(self)
+        attributes._unbind()
+        del self._positions[node]
+        self._changed()
+        return node, attributes
+
+    def setdefault(self, node, default=None):
+        if node not in self:
+            self[node] = {} if default is None else default
+        return dict.__getitem__(self, node)
+
+    def update(self, *args, **kwargs):
+        if len(args) == 1 and not kwargs and isinstance(args[0], dict):
+            items = args[0].items()
+        else:
+            items = dict(*args, **kwargs).items()
+        for node, attributes in items:
+            self[node] = attributes
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        for attributes in self.values():
+            del attributes._nodes
+            del attributes._node
+        dict.clear(self)
+        for attribute in _INDEXED_NODE_ATTRIBUTES:
+            self.index[attribute].clear()
+            self._keys[attribute].clear()
+        self._positions.clear()
+        self._changed()
+
+
+def _node_index(topology, attribute):
+    """Return the index of the nodes of a topology for an indexed attribute,
+    mapping each index key to the nodes indexed under it, or None if the
+    topology has no index"""
+    if isinstance(topology, FrozenTopology):
+        # the index of frozen topologies is built once, when first needed
+        if topology._index is None:
+            topology._index = _NodeDict(zip(topology._nodes,
+                                            topology._node_data)).index
+        return topology._index[attribute]
+    nodes = getattr(topology, '_node', None)
+    return nodes.index[attribute] if isinstance(nodes, _NodeDict) else None
+
+
+def _indexed_nodes(topology, attribute, key):
+    """Return the list of the nodes of a topology indexed under a key for an
+    indexed attribute, in node order, scanning all nodes if the topology has
+    no index"""
+    index = _node_index(topology, attribute)
+    if index is not None:
+        nodes = index.get(key, {})
+        return sorted(nodes, key=nodes.__getitem__)
+    return [v for v, data in topology.nodes(data=True)
+            if attribute in data and key in _index_keys(attribute,
+                                                        data[attribute])]
+
+
+# Types of attribute values shared rather than copied by deep copies of
+# topologies, since they are immutable
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _deepcopy_attributes(attr):
+    """Return a deep copy of a dictionary of attributes, copying only the
+    values that are not of immutable types"""
+    return {k: v if type(v) in _IMMUTABLE_TYPES else deepcopy(v)
+            for k, v in attr.items()}
+
+
+def _copy_graph(source, target, deep=False):
+    """Copy graph, node and link attributes of a graph or graph view into an
+    empty topology in a single pass.
+
+    Nodes and neighbors keep the order of the source graph. Each attribute
+    dictionary is copied once, while networkx copies the attributes of
+    undirected links once per direction, and it is assigned to the internal
+    dictionaries of the target directly. If the source is undirected and the
+    target directed, the attributes of the two directions of a link are
+    copied separately, as done by networkx.
+
+    Parameters
+    ----------
+    source : graph
+        The graph to copy. It can be directed only if the target is directed
+    target : Topology or DirectedTopology
+        The empty topology into which the source is copied
+    deep : bool, optional
+        If True, attributes are deep-copied, otherwise shallow-copied
+    """
+    copy_attributes = _deepcopy_attributes if deep else dict
+    link_attributes = target.edge_attr_dict_factory
+    neighbors = target.adjlist_inner_dict_factory
+    if deep:
+        def copy_link_attributes(d):
+            return link_attributes(_deepcopy_attributes(d))
+    else:
+        copy_link_attributes = link_attributes
+    target.graph.update(copy_attributes(source.graph))
+    target._node.clear()
+    if deep:
+        target._node.update((v, _deepcopy_attributes(d))
+                            for v, d in source._node.items())
+    else:
+        target._node.update((v, _NodeAttributes(d))
+                            for v, d in source._node.items())
+    adj = {}
+    share_reverse = not source.is_directed() and not target.is_directed()
+    for u, nbrs in source._adj.items():
+        row = {}
+        for v, d in nbrs.items():
+            # the reverse of an undirected link already copied is shared
+            row[v] = adj[v][u] if share_reverse and v in adj \
+                     else copy_link_attributes(d)
+        adj[u] = neighbors(row)
+    _set_adjacency(target, adj)
+
+
+def _set_adjacency(target, adj):
+    """Replace the adjacency of a topology, keeping the order of nodes and
+    neighbors of *adj*. Neighbors and link attributes must be stored in
+    dictionaries created by the factories of the topology and the attributes
+    of undirected links must be shared by both their directions"""
+    adj = target.adjlist_outer_dict_factory(adj)
+    target._adj = adj
+    if target.is_directed():
+        pred = target.adjlist_outer_dict_factory(
+                (v, target.adjlist_inner_dict_factory()) for v in adj)
+        for u, row in adj.items():
+            for v, d in row.items():
+                pred[v][u] = d
+        target._succ = adj
+        target._pred = pred
+    # discard views of the internal dictionaries replaced, if cached
+    for view in ('adj', 'succ', 'pred', 'nodes', 'edges', 'in_edges',
+                 'out_edges', 'degree', 'in_degree', 'out_degree'):
+        target.__dict__.pop(view, None)
+
+
 class Topology(nx.Graph, BaseTopology):
     """Base class for undirected topology"""
 
+    # Node dictionaries maintaining an index of node types, stacks and
+    # applications
+    node_dict_factory = _NodeDict
+    node_attr_dict_factory = _NodeAttributes
+
+    # Dictionaries tracking changes, so that fingerprints are only computed
+    # again after the topology changes
+    graph_attr_dict_factory = _TrackedDict
+    adjlist_outer_dict_factory = _Adjacency
+    adjlist_inner_dict_factory = _Adjacency
+    edge_attr_dict_factory = _TrackedDict
+
     def __init__(self, data=None, name="", **kwargs):
         """Initialize the topology
 
@@ -138,7 +835,9 @@ class Topology(nx.Graph, BaseTopology):
         >>> copied_topo = topo.copy()
 
         """
-        return Topology(super(Topology, self).copy())
+        topology = Topology()
+        _copy_graph(self, topology)
+        return topology
 
     def subgraph(self, nbunch):
         """Return the subgraph induced on nodes in nbunch.
@@ -179,7 +878,9 @@ class Topology(nx.Graph, BaseTopology):
         >>> topo2.edges()
         [(0, 1), (1, 2)]
         """
-        return Topology(super(Topology, self).subgraph(nbunch))
+        topology = Topology()
+        _copy_graph(super(Topology, self).subgraph(nbunch), topology)
+        return topology
 
     def to_directed(self):
         """Return a directed representation of the topology.
@@ -219,7 +920,9 @@ class Topology(nx.Graph, BaseTopology):
         >>> topo2.edges()
         [(0, 1)]
         """
-        return DirectedTopology(super(Topology, self).to_directed())
+        topology = DirectedTopology()
+        _copy_graph(self, topology, deep=True)
+        return topology
 
     def to_undirected(self):
         """Return an undirected copy of the topology.
@@ -256,7 +959,9 @@ class Topology(nx.Graph, BaseTopology):
         >>> topo3.edges()
         [(0, 1)]
         """
-        return Topology(super(Topology, self).to_undirected())
+        topology = Topology()
+        _copy_graph(self, topology, deep=True)
+        return topology
 
     def add_path(self, nodes, **attr):
         """Add a path to the topology
@@ -281,6 +986,18 @@ class Topology(nx.Graph, BaseTopology):
 class DirectedTopology(nx.DiGraph, BaseTopology):
     """Base class for directed topology"""
 
+    # Node dictionaries maintaining an index of node types, stacks and
+    # applications
+    node_dict_factory = _NodeDict
+    node_attr_dict_factory = _NodeAttributes
+
+    # Dictionaries tracking changes, so that fingerprints are only computed
+    # again after the topology changes
+    graph_attr_dict_factory = _TrackedDict
+    adjlist_outer_dict_factory = _Adjacency
+    adjlist_inner_dict_factory = _Adjacency
+    edge_attr_dict_factory = _TrackedDict
+
     def __init__(self, data=None, name="", **kwargs):
         """Initialize the topology
 
@@ -322,7 +1039,9 @@ class DirectedTopology(nx.DiGraph, BaseTopology):
         >>> topo.add_path([0,1,2,3])
         >>> copied_topo = topo.copy()
         """
-        return DirectedTopology(super(DirectedTopology, self).copy())
+        topology = DirectedTopology()
+        _copy_graph(self, topology)
+        return topology
 
     def subgraph(self, nbunch):
         """Return the subgraph induced on nodes in nbunch.
@@ -363,7 +1082,9 @@ class DirectedTopology(nx.DiGraph, BaseTopology):
         >>> topo2.edges()
         [(0, 1), (1, 2)]
         """
-        return DirectedTopology(super(DirectedTopology, self).subgraph(nbunch))
+        topology = DirectedTopology()
+        _copy_graph(super(DirectedTopology, self).subgraph(nbunch), topology)
+        return topology
 
     def to_directed(self):
         """Return a directed representation of the topology.
@@ -403,7 +1124,9 @@ class DirectedTopology(nx.DiGraph, BaseTopology):
         >>> topo2.edges()
         [(0, 1)]
         """
-        return DirectedTopology(super(DirectedTopology, self).to_directed())
+        topology = DirectedTopology()
+        _copy_graph(self, topology, deep=True)
+        return topology
 
     def to_undirected(self):
         """Return an undirected copy of the topology.
@@ -440,7 +1163,15 @@ class DirectedTopology(nx.DiGraph, BaseTopology):
         >>> topo3.edges()
         [(0, 1)]
         """
-        return Topology(super(DirectedTopology, self).to_undirected())
+        topology = super(DirectedTopology, self).to_undirected()
+        # networkx versions without the to_undirected_class hook return a
+        # networkx graph, which is converted with an additional copy
+        return topology if isinstance(topology, Topology) \
+                        else Topology(topology)
+
+    def to_undirected_class(self):
+        """Return the class used by networkx for undirected copies"""
+        return Topology
 
     def add_path(self, nodes, **attr):
         """Add a path to the topology
@@ -462,6 +1193,765 @@ class DirectedTopology(nx.DiGraph, BaseTopology):
         nx.add_path(self, nodes, **attr)
 
 
+class FrozenTopology(object):
+    """Class representing an immutable snapshot of a topology.
+
+    Nodes are mapped to contiguous integer indices, following the order of
+    the *nodes* method, and links to contiguous integer ids, following the
+    order of the *edges* method. Adjacency is stored in compressed sparse row
+    (CSR) format: the neighbors of the node with index i are
+    indices[indptr[i]:indptr[i + 1]] and the ids of the links connecting them
+    are edge_ids[indptr[i]:indptr[i + 1]]. For undirected topologies, each
+    link appears in the adjacency of both its endpoints.
+
+    Neighbors keep the order of the adjacency of the frozen topology, which
+    is also the order of the adjacency of the topology returned by
+    *to_topology*, so that algorithms visiting neighbors in order, such as
+    those breaking ties among equal-cost paths, return the same results on
+    frozen and mutable topologies.
+
+    The *capacity*, *delay*, *weight*, *buffer* and *length* link attributes
+    are stored in read-only NumPy arrays indexed by link id, with NaN values
+    for links missing an attribute. Their units are stored in the *graph*
+    dictionary, as for Topology objects.
+
+    Frozen topologies are accepted by the routing functions, the traffic
+    matrix functions and the functions of the netconfig package reading (but
+    not modifying) link attributes. Shortest paths computed by the *scipy*
+    routing backend and link loads are computed directly from the arrays
+    of the frozen topology.
+
+    Parameters
+    ----------
+    topology : Topology or DirectedTopology
+        The topology to freeze
+
+    Examples
+    --------
+    >>> import fnss
+    >>> topology = fnss.line_topology(3)
+    >>> fnss.set_capacities_constant(topology, 10, 'Mbps')
+    >>> frozen = topology.freeze()
+    >>> frozen.capacity
+    array([10., 10.])
+    >>> frozen.indices[frozen.indptr[1]:frozen.indptr[2]]
+    array([0, 2])
+    """
+
+    # Link attributes stored in arrays
+    edge_attributes = ('capacity', 'delay', 'weight', 'buffer', 'length')
+
+    def __init__(self, topology):
+        """Freeze the topology"""
+        nodes = list(topology.nodes())
+        index = {v: i for i, v in enumerate(nodes)}
+        edges = list(topology.edges(data=True))
+        sources = np.fromiter((index[u] for u, _, _ in edges), np.intp,
+                              len(edges))
+        targets = np.fromiter((index[v] for _, v, _ in edges), np.intp,
+                              len(edges))
+        self._freeze(topology.is_directed(), dict(topology.graph), nodes,
+                     [dict(topology.nodes[v]) for v in nodes], sources,
+                     targets, [dict(data) for _, _, data in edges],
+                     adjacency=topology.adj)
+
+    def _freeze(self, directed, graph, nodes, node_data, sources, targets,
+                edge_data, attributes=None, adjacency=None):
+        """Initialize the snapshot from the node and link tables
+
+        Parameters
+        ----------
+        directed : bool
+            Whether the topology is directed
+        graph : dict
+            The topology properties
+        nodes : list
+            The nodes
+        node_data : list
+            The attributes of the nodes
+        sources, targets : numpy arrays
+            The indices of the endpoints of the links
+        edge_data : list or callable
+            The attributes of the links or a function returning them, called
+            only when they are first needed
+        attributes : dict, optional
+            Arrays of values of the link attributes stored in arrays, keyed by
+            attribute. Missing attributes are computed from *edge_data*
+        adjacency : dict, optional
+            The neighbors of each node, in the order to keep. If not given,
+            the neighbors of each node are ordered by link id, as in a
+            topology to which links are added in order
+        """
+        self._directed = directed
+        self.graph = graph
+        self._nodes = nodes
+        self._node_data = node_data
+        self.node_index = {v: i for i, v in enumerate(self._nodes)}
+        self._edges = [(nodes[u], nodes[v]) for u, v
+                       in zip(sources.tolist(), targets.tolist())]
+        self._edge_data = edge_data
+        self.edge_index = {(u, v): i for i, (u, v) in enumerate(self._edges)}
+        if not self._directed:
+            self.edge_index.update(((v, u), i)
+                                   for i, (u, v) in enumerate(self._edges))
+        self.sources = _read_only(sources)
+        self.targets = _read_only(targets)
+        if adjacency is not None:
+            counts = np.fromiter((len(adjacency[u]) for u in nodes), np.intp,
+                                 len(nodes))
+            n_entries = counts.sum()
+            self.indices = _read_only(np.fromiter(
+                    (self.node_index[v] for u in nodes for v in adjacency[u]),
+                    np.intp, n_entries))
+            self.edge_ids = _read_only(np.fromiter(
+                    (self.edge_index[u, v] for u in nodes
+                     for v in adjacency[u]), np.intp, n_entries))
+        else:
+            rows, cols = self.sources, self.targets
+            edge_ids = np.arange(len(self._edges))
+            if not self._directed:
+                loops = rows == cols
+                rows, cols = (np.concatenate((rows, cols[~loops])),
+                              np.concatenate((cols, rows[~loops])))
+                edge_ids = np.concatenate((edge_ids, edge_ids[~loops]))
+            order = np.lexsort((edge_ids, rows))
+            counts = np.bincount(rows, minlength=len(nodes))
+            self.indices = _read_only(cols[order])
+            self.edge_ids = _read_only(edge_ids[order])
+        self.indptr = _read_only(np.concatenate(([0], np.cumsum(counts))))
+        attributes = attributes or {}
+        for attribute in self.edge_attributes:
+            if attribute in attributes:
+                values = attributes[attribute]
+            else:
+                values = self._attribute_array(attribute)
+            setattr(self, attribute, _read_only(values))
+        self._graph = None
+        self._fingerprints = {}
+        self._index = None
+
+    def _link_data(self):
+        """Return the list of the attributes of the links"""
+        if callable(self._edge_data):
+            self._edge_data = self._edge_data()
+        return self._edge_data
+
+    def _attribute_array(self, attribute, default=np.nan):
+        """Return a new array with the values of a link attribute"""
+        edge_data = self._link_data()
+        return np.fromiter((data.get(attribute, default)
+                            for data in edge_data),
+                           np.float64, len(edge_data))
+
+    def __len__(self):
+        """Return the number of nodes"""
+        return len(self._nodes)
+
+    def __iter__(self):
+        """Iterate over the nodes"""
+        return iter(self._nodes)
+
+    def __contains__(self, node):
+        """Return whether a node is in the topology"""
+        return node in self.node_index
+
+    def is_directed(self):
+        """Return True if the topology is directed, False otherwise"""
+        return self._directed
+
+    def is_multigraph(self):
+        """Return False, as topologies cannot have parallel links"""
+        return False
+
+    def number_of_nodes(self):
+        """Return the number of nodes"""
+        return len(self._nodes)
+
+    def number_of_edges(self):
+        """Return the number of links"""
+        return len(self._edges)
+
+    def nodes(self, data=False):
+        """Return the list of nodes
+
+        Parameters
+        ----------
+        data : bool, optional
+            If True, return a list of (node, attributes) tuples. Attributes
+            are returned as copies
+
+        Returns
+        -------
+        nodes : list
+            The nodes
+        """
+        if data:
+            return [(v, dict(d)) for v, d in zip(self._nodes, self._node_data)]
+        return list(self._nodes)
+
+    def edges(self, data=False):
+        """Return the list of links
+
+        Parameters
+        ----------
+        data : bool, optional
+            If True, return a list of (u, v, attributes) tuples. Attributes
+            are returned as copies
+
+        Returns
+        -------
+        edges : list
+            The links
+        """
+        if data:
+            return [(u, v, dict(d))
+                    for (u, v), d in zip(self._edges, self._link_data())]
+        return list(self._edges)
+
+    def has_edge(self, u, v):
+        """Return whether a link from u to v exists"""
+        return (u, v) in self.edge_index
+
+    def edge_array(self, attribute, default=np.nan):
+        """Return the values of a link attribute as an array indexed by link id
+
+        Parameters
+        ----------
+        attribute : str
+            The link attribute
+        default : float, optional
+            The value assigned to links without the attribute
+
+        Returns
+        -------
+        values : numpy array
+            The values of the attribute. It is read-only if it is one of the
+            arrays of the attributes stored by the frozen topology and no
+            link is missing the attribute
+        """
+        if attribute in self.edge_attributes:
+            values = getattr(self, attribute)
+            missing = np.isnan(values)
+            if not missing.any():
+                return values
+            return np.where(missing, default, values)
+        return self._attribute_array(attribute, default)
+
+    def fingerprint(self, attributes=None):
+        """Return a fingerprint of the structure and attributes of the
+        topology. Since the topology cannot change, fingerprints are computed
+        only once, unless discarded by :func:`clear_memo`
+
+        Parameters
+        ----------
+        attributes : iterable, optional
+            The link attributes included in the fingerprint. If None, all
+            topology, node and link attributes are included
+
+        Returns
+        -------
+        fingerprint : str
+            The hexadecimal digest of the fingerprint
+        """
+        key = None if attributes is None else tuple(attributes)
+        cached = self._fingerprints.get(key)
+        if cached is None or cached[0] != _memo_epoch:
+            cached = (_memo_epoch, _fingerprint(self, key))
+            self._fingerprints[key] = cached
+        return cached[1]
+
+    def nodes_by_type(self, node_type):
+        """Return the list of nodes of a given type, see
+        :meth:`Topology.nodes_by_type`
+
+        Parameters
+        ----------
+        node_type : str
+            The type of the nodes
+
+        Returns
+        -------
+        nodes : list
+            The nodes, in node order
+        """
+        return _indexed_nodes(self, 'type', node_type)
+
+    def nodes_by_stack(self, name):
+        """Return the list of nodes on which a stack is deployed, see
+        :meth:`Topology.nodes_by_stack`
+
+        Parameters
+        ----------
+        name : str
+            The name of the stack
+
+        Returns
+        -------
+        nodes : list
+            The nodes, in node order
+        """
+        return _indexed_nodes(self, 'stack', name)
+
+    def nodes_by_application(self, name):
+        """Return the list of nodes on which an application is deployed, see
+        :meth:`Topology.nodes_by_application`
+
+        Parameters
+        ----------
+        name : str
+            The name of the application
+
+        Returns
+        -------
+        nodes : list
+            The nodes, in node order
+        """
+        return _indexed_nodes(self, 'application', name)
+
+    def to_topology(self):
+        """Return a mutable copy of this topology
+
+        Returns
+        -------
+        topology : Topology or DirectedTopology
+            The topology
+        """
+        topology = DirectedTopology() if self._directed else Topology()
+        topology.graph.update(self.graph)
+        topology.add_nodes_from((v, dict(d)) for v, d
+                                in zip(self._nodes, self._node_data))
+        # the adjacency is built from the CSR arrays to keep the order of
+        # neighbors, which adding links in order would not
+        link_data = [topology.edge_attr_dict_factory(d)
+                     for d in self._link_data()]
+        neighbors = topology.adjlist_inner_dict_factory
+        nodes = self._nodes
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        edge_ids = self.edge_ids.tolist()
+        _set_adjacency(topology, dict(
+                (u, neighbors((nodes[v], link_data[e]) for v, e
+                              in zip(indices[indptr[i]:indptr[i + 1]],
+                                     edge_ids[indptr[i]:indptr[i + 1]])))
+                for i, u in enumerate(nodes)))
+        return topology
+
+
+def _read_only(array):
+    """Make an array read-only and return it"""
+    array.setflags(write=False)
+    return array
+
+
+def _fingerprint(topology, attributes=None):
+    """Return the fingerprint of a topology, a graph or a view of a graph.
+    See :meth:`BaseTopology.fingerprint`
+
+    The neighbors of each node are included in the order of the adjacency of
+    the graph, since it determines how ties among equal-cost paths are broken.
+    Frozen topologies, which route on their own graph, never share their
+    fingerprint with mutable ones. Topology properties are only included if
+    *attributes* is None, since results depending on selected link
+    attributes do not depend on them, e.g. on the units stored by setters.
+    """
+    if attributes is None:
+        def values(data):
+            return data
+        nodes = list(topology.nodes(data=True))
+        graph = dict(topology.graph)
+    else:
+        attributes = tuple(attributes)
+        def values(data):
+            return tuple(data.get(attr) for attr in attributes)
+        nodes = list(topology.nodes())
+        graph = None
+    if isinstance(topology, FrozenTopology):
+        links = ('frozen', [(u, v, values(data)) for u, v, data
+                            in topology.edges(data=True)])
+    else:
+        links = [(u, [(v, values(data)) for v, data in nbrs.items()])
+                 for u, nbrs in topology.adj.items()]
+    data = (topology.is_directed(), graph, nodes, links)
+    return hashlib.sha1(pickle.dumps(data, protocol=2)).hexdigest()
+
+
+# Memoized results of each topology, keyed by topology, which is only
+# weakly referenced so that its results are discarded with it. The results
+# of a topology are stored as (fingerprint, result) tuples keyed by
+# computation, parameters and direction, in least recently used order
+_memo = weakref.WeakKeyDictionary()
+
+# Lock serializing accesses to the memoized results
+_memo_lock = threading.Lock()
+
+# Maximum number of memoized results per topology
+_memo_size = 32
+
+# Number of times the memo was cleared, used to discard cached fingerprints
+_memo_epoch = 0
+
+
+def set_memo_size(size):
+    """Set the maximum number of memoized results per topology.
+
+    FNSS memoizes the results of expensive computations repeatedly performed
+    on unchanged topologies, i.e. shortest paths, end-to-end delays,
+    betweenness and other centralities and origin-destination pairs. Results
+    are stored with the topology they are computed on and discarded when the
+    topology is garbage collected. Each result is keyed by the computation and
+    its parameters and is only returned if the fingerprint of the topology
+    (see :meth:`BaseTopology.fingerprint`) has not changed since it was
+    computed, otherwise it is replaced. The least recently used results of a
+    topology are evicted when their number exceeds this size.
+
+    Parameters
+    ----------
+    size : int
+        The maximum number of memoized results per topology. If 0, no result
+        is memoized
+
+    Examples
+    --------
+    >>> import fnss
+    >>> fnss.set_memo_size(64)
+    """
+    global _memo_size
+    if size < 0:
+        raise ValueError('The memo size must be a non-negative integer')
+    with _memo_lock:
+        _memo_size = size
+        for results in _memo.values():
+            while len(results) > _memo_size:
+                results.popitem(last=False)
+
+
+def get_memo_size():
+    """Return the maximum number of memoized results per topology.
+
+    Returns
+    -------
+    size : int
+        The maximum number of memoized results per topology
+    """
+    return _memo_size
+
+
+def clear_memo():
+    """Discard all memoized results and cached topology fingerprints.
+
+    Changes to topologies are detected automatically, except for changes to
+    mutable values stored as topology, node or link attributes, e.g.
+    appending to a list stored as topology property or modifying the
+    properties of the stack of a node in place. This function must be called
+    after such changes, otherwise memoized results computed before them are
+    returned.
+    """
+    global _memo_epoch
+    with _memo_lock:
+        _memo.clear()
+        _memo_epoch += 1
+
+
+def _memo_owner(topology):
+    """Return the topology whose memo stores the results of computations on
+    a topology: the graph of which it is a view, if it shares its nodes and
+    links, as the views returned by :func:`directed_view`, or the topology
+    itself otherwise"""
+    graph = getattr(topology, '_graph', None)
+    if isinstance(topology, nx.Graph) and isinstance(graph, nx.Graph) \
+            and graph._adj is topology._adj and graph._node is topology._node:
+        return graph
+    return topology
+
+
+def _memoized(topology, computation, parameters, attributes, function,
+              *args, **kwargs):
+    """Return the result of a computation on a topology, memoizing it.
+
+    Callers must not modify memoized results, since they are shared.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology, FrozenTopology or graph
+        The topology
+    computation : str
+        The name of the computation
+    parameters : tuple
+        The hashable parameters of the computation
+    attributes : iterable
+        The link attributes the result depends on. If None, it depends on all
+        topology, node and link attributes
+    function : callable
+        The function performing the computation
+    *args, **kwargs
+        The arguments of *function*
+
+    Returns
+    -------
+    result : any type
+        The result of the computation
+    """
+    if _memo_size == 0:
+        return function(*args, **kwargs)
+    owner = _memo_owner(topology)
+    try:
+        # views are fingerprinted through the tracker of their graph
+        if isinstance(owner, (BaseTopology, FrozenTopology)):
+            fingerprint = owner.fingerprint(attributes)
+        else:
+            fingerprint = _fingerprint(topology, attributes)
+        with _memo_lock:
+            results = _memo.get(owner)
+            if results is None:
+                results = _memo[owner] = OrderedDict()
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # attributes that cannot be pickled cannot be fingerprinted and
+        # topologies that cannot be weakly referenced cannot be memoized
+        return function(*args, **kwargs)
+    key = (computation, parameters, topology.is_directed())
+    with _memo_lock:
+        cached = results.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            results.move_to_end(key)
+            return cached[1]
+    result = function(*args, **kwargs)
+    with _memo_lock:
+        results[key] = (fingerprint, result)
+        results.move_to_end(key)
+        while len(results) > _memo_size:
+            results.popitem(last=False)
+    return result
+
+
+def _networkx_graph(topology):
+    """Return a topology as a NetworkX graph, converting it if it is a frozen
+    topology. The returned graph must not be modified"""
+    if isinstance(topology, FrozenTopology):
+        if topology._graph is None:
+            topology._graph = topology.to_topology()
+        return topology._graph
+    return topology
+
+
+def directed_view(topology):
+    """Return a read-only directed view of a topology.
+
+    Differently from the *to_directed* method, which returns a deep copy of
+    the topology, the view is created in constant time and shares nodes,
+    links and their attributes with the topology. Each undirected link (u, v)
+    is represented by the two directed links (u, v) and (v, u), which share
+    the same attribute dictionary. Changes to the topology are reflected in
+    the view, while the view cannot be modified.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology
+
+    Returns
+    -------
+    view : networkx.DiGraph
+        A read-only directed view of the topology
+
+    Examples
+    --------
+    >>> import fnss
+    >>> topology = fnss.line_topology(2)
+    >>> view = fnss.directed_view(topology)
+    >>> sorted(view.edges())
+    [(0, 1), (1, 0)]
+    """
+    topology = _networkx_graph(topology)
+    if topology.is_directed():
+        return nx.DiGraph.copy(topology, as_view=True)
+    return nx.Graph.to_directed(topology, as_view=True)
+
+
+def _edge_data(topology, links=None):
+    """Return the list of the attribute dictionaries of the given links, or
+    of all links in the order of the *edges* method if links is None"""
+    if isinstance(topology, FrozenTopology):
+        edge_data = topology._link_data()
+        if links is None:
+            return edge_data
+        return [edge_data[topology.edge_index[link]] for link in links]
+    if links is None:
+        return [data for _, _, data in topology.edges(data=True)]
+    adj = topology.adj
+    return [adj[u][v] for u, v in links]
+
+
+def _node_data(topology, nodes=None):
+    """Return the list of the attribute dictionaries of the given nodes, or
+    of all nodes in the order of the *nodes* method if nodes is None"""
+    if isinstance(topology, FrozenTopology):
+        if nodes is None:
+            return topology._node_data
+        return [topology._node_data[topology.node_index[v]] for v in nodes]
+    if nodes is None:
+        return [data for _, data in topology.nodes(data=True)]
+    return [topology.nodes[v] for v in nodes]
+
+
+def _set_values(data, attribute, values, kind):
+    """Assign the values of an attribute to a list of attribute
+    dictionaries"""
+    # Store native Python values rather than NumPy scalars
+    if isinstance(values, np.ndarray):
+        values = values.tolist()
+    if isinstance(values, (str, bytes)) or not hasattr(values, '__iter__'):
+        for d in data:
+            d[attribute] = values
+        return
+    values = list(values)
+    if len(values) != len(data):
+        raise ValueError('%d values were provided for %d %s'
+                         % (len(values), len(data), kind))
+    for d, value in zip(data, values):
+        d[attribute] = value
+
+
+def get_edge_array(topology, attribute, links=None, default=np.nan,
+                   dtype=np.float64):
+    """Return the values of a link attribute as an array.
+
+    Links are ordered as returned by the *edges* method of the topology,
+    which is stable as long as links are not removed and matches the
+    link ids of :class:`FrozenTopology`, unless an explicit order is given.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology
+    attribute : str
+        The link attribute
+    links : iterable, optional
+        The links, as (u, v) tuples, in the order of the array. If None, all
+        links are returned
+    default : any type, optional
+        The value assigned to links without the attribute
+    dtype : numpy dtype, optional
+        The data type of the array
+
+    Returns
+    -------
+    values : numpy array
+        The values of the attribute
+
+    Examples
+    --------
+    >>> import fnss
+    >>> topology = fnss.line_topology(3)
+    >>> fnss.set_capacities_constant(topology, 10, 'Mbps', links=[(0, 1)])
+    >>> fnss.get_edge_array(topology, 'capacity')
+    array([10., nan])
+    """
+    return np.array([d.get(attribute, default)
+                     for d in _edge_data(topology, links)], dtype=dtype)
+
+
+def set_edge_array(topology, attribute, values, links=None):
+    """Set the values of a link attribute of all or selected links at once.
+
+    Parameters
+    ----------
+    topology : Topology or DirectedTopology
+        The topology
+    attribute : str
+        The link attribute
+    values : array-like or scalar
+        The values of the attribute, in the order of *links*, or a single
+        value assigned to all links. NumPy arrays are stored as native Python
+        values
+    links : iterable, optional
+        The links, as (u, v) tuples. If None, all links, in the order
+        returned by the *edges* method of the topology
+
+    Examples
+    --------
+    >>> import fnss
+    >>> import numpy as np
+    >>> topology = fnss.line_topology(3)
+    >>> fnss.set_edge_array(topology, 'length', np.array([2.0, 3.0]))
+    >>> fnss.get_edge_array(topology, 'length')
+    array([2., 3.])
+    """
+    if isinstance(topology, FrozenTopology):
+        raise TypeError('Frozen topologies cannot be modified')
+    _set_values(_edge_data(topology, links), attribute, values, 'links')
+
+
+def get_node_array(topology, attribute, nodes=None, default=np.nan,
+                   dtype=np.float64):
+    """Return the values of a node attribute as an array.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology
+    attribute : str
+        The node attribute
+    nodes : iterable, optional
+        The nodes in the order of the array. If None, all nodes, in the
+        order returned by the *nodes* method of the topology
+    default : any type, optional
+        The value assigned to nodes without the attribute
+    dtype : numpy dtype, optional
+        The data type of the array
+
+    Returns
+    -------
+    values : numpy array
+        The values of the attribute
+    """
+    return np.array([d.get(attribute, default)
+                     for d in _node_data(topology, nodes)], dtype=dtype)
+
+
+def set_node_array(topology, attribute, values, nodes=None):
+    """Set the values of a node attribute of all or selected nodes at once.
+
+    Parameters
+    ----------
+    topology : Topology or DirectedTopology
+        The topology
+    attribute : str
+        The node attribute
+    values : array-like or scalar
+        The values of the attribute, in the order of *nodes*, or a single
+        value assigned to all nodes. NumPy arrays are stored as native Python
+        values
+    nodes : iterable, optional
+        The nodes. If None, all nodes, in the order returned by the *nodes*
+        method of the topology
+    """
+    if isinstance(topology, FrozenTopology):
+        raise TypeError('Frozen topologies cannot be modified')
+    _set_values(_node_data(topology, nodes), attribute, values, 'nodes')
+
+
+def _link_capacities(topology):
+    """Return the directed links of a topology, undirected links being split
+    in two directions, and an array with their capacities"""
+    links = list(topology.edges())
+    directed = topology.is_directed()
+    if not directed:
+        links += [(v, u) for u, v in links if u != v]
+    if isinstance(topology, FrozenTopology):
+        capacities = topology.capacity
+        if not directed:
+            duplex = topology.sources != topology.targets
+            capacities = np.concatenate((capacities, capacities[duplex]))
+        if np.isnan(capacities).any():
+            raise ValueError('All links must have a capacity attribute')
+        return links, capacities
+    try:
+        capacities = [topology.adj[u][v]['capacity'] for u, v in links]
+    except KeyError:
+        raise ValueError('All links must have a capacity attribute')
+    return links, np.asarray(capacities, dtype=np.float64)
+
+
 def od_pairs_from_topology(topology):
     """Calculate all possible origin-destination pairs of the topology.
     This function does not simply calculate all possible pairs of the topology
@@ -485,6 +1975,13 @@ def od_pairs_from_topology(topology):
     >>> fnss.od_pairs_from_topology(topology)
     [(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1)]
     """
+    return list(_memoized(topology, 'od_pairs', (), (), _od_pairs, topology))
+
+
+def _od_pairs(topology):
+    """Return the list of origin-destination pairs of a topology. See
+    :func:`od_pairs_from_topology`"""
+    topology = _networkx_graph(topology)
     if topology.is_directed():
         routes = dict(nx.all_pairs_shortest_path_length(topology))
         return [(o, d) for o in routes for d in routes[o] if o != d]
@@ -529,8 +2026,22 @@ def fan_in_out_capacities(topology):
     >>> out_cap
     {0: 30, 1: 10, 2: 10, 3: 10}
     """
-    if not topology.is_directed():
-        topology = topology.to_directed()
+    if isinstance(topology, FrozenTopology):
+        capacity = topology.capacity
+        if np.isnan(capacity).any():
+            raise ValueError('All links must have a capacity attribute')
+        n = topology.number_of_nodes()
+        sources, targets = topology.sources, topology.targets
+        fan_in = np.bincount(targets, capacity, n)
+        fan_out = np.bincount(sources, capacity, n)
+        if not topology.is_directed():
+            # self-loops are counted once, as in the directed topology
+            links = sources != targets
+            fan_in = fan_out = fan_in + np.bincount(sources[links],
+                                                    capacity[links], n)
+        return (dict(zip(topology.nodes(), fan_in.tolist())),
+                dict(zip(topology.nodes(), fan_out.tolist())))
+    topology = directed_view(topology)
     fan_in = {}
     fan_out = {}
     for node in topology.nodes():
@@ -605,10 +2116,63 @@ def rename_node_attribute(topology, old_attr, new_attr):
             del topology.node[v][old_attr]
 
 
+# Number of parsed nodes or links added to a topology at once
+_READ_BATCH_SIZE = 4096
+
+
+def _parse_properties(element, cast):
+    """Return the properties of an XML element as a dictionary"""
+    props = {}
+    for prop in element.findall('property'):
+        props[prop.attrib['name']] = cast(prop.attrib['type'])(prop.text)
+    return props
+
+
+def _parse_node(element, cast):
+    """Return the id and the attributes of a node XML element"""
+    v = cast(element.attrib['id.type'])(element.attrib['id'])
+    attr = {}
+    for child in element:
+        if child.tag == 'property':
+            attr[child.attrib['name']] = \
+                    cast(child.attrib['type'])(child.text)
+        elif child.tag == 'stack':
+            if 'stack' in attr:
+                raise ET.ParseError('Invalid topology. '
+                                    'A node has more than one stack.')
+            stack_name = cast(child.attrib['name.type'])(child.attrib['name'])
+            attr['stack'] = (stack_name, _parse_properties(child, cast))
+        elif child.tag == 'application':
+            app_name = cast(child.attrib['name.type'])(child.attrib['name'])
+            attr.setdefault('application', {})[app_name] = \
+                    _parse_properties(child, cast)
+    return v, attr
+
+
+def _parse_link(element, cast):
+    """Return the endpoints and the attributes of a link XML element"""
+    u = v = None
+    attr = {}
+    for child in element:
+        if child.tag == 'from':
+            u = cast(child.attrib['type'])(child.text)
+        elif child.tag == 'to':
+            v = cast(child.attrib['type'])(child.text)
+        elif child.tag == 'property':
+            attr[child.attrib['name']] = \
+                    cast(child.attrib['type'])(child.text)
+    return u, v, attr
+
+
 def read_topology(path, encoding='utf-8'):
     """Read a topology from an XML file and returns either a Topology or a
     DirectedTopology object
 
+    The file is parsed incrementally and parsed elements are discarded as soon
+    as the nodes and links they describe are added to the topology, in
+    batches, so that the memory required to parse the file does not depend
+    on its size.
+
     Parameters
     ----------
     path : str
@@ -621,58 +2185,47 @@ def read_topology(path, encoding='utf-8'):
     topology: Topology or DirectedTopology
         The parsed topology
     """
-    tree = ET.parse(path)
-    head = tree.getroot()
+    cast = util.xml_cast_function
+    context = ET.iterparse(path, events=('start', 'end'))
+    _, head = next(context)
     topology = Topology() if head.attrib['linkdefault'] == 'undirected' \
                    else DirectedTopology()
-    for prop in head.findall('property'):
-        name = prop.attrib['name']
-        value = util.xml_cast_type(prop.attrib['type'], prop.text)
-        topology.graph[name] = value
-    for node in head.findall('node'):
-        v = util.xml_cast_type(node.attrib['id.type'], node.attrib['id'])
-        topology.add_node(v)
-        for prop in node.findall('property'):
-            name = prop.attrib['name']
-            value = util.xml_cast_type(prop.attrib['type'], prop.text)
-            topology.node[v][name] = value
-        if len(node.findall('stack')) > 0:
-            if len(node.findall('stack')) > 1:
-                raise ET.ParseError('Invalid topology. ' \
-                                    'A node has more than one stack.')
-            stack = node.findall('stack')[0]
-            stack_name = util.xml_cast_type(stack.attrib['name.type'],
-                                        stack.attrib['name'])
-            stack_props = {}
-            for prop in stack.findall('property'):
-                name = prop.attrib['name']
-                value = util.xml_cast_type(prop.attrib['type'], prop.text)
-                stack_props[name] = value
-            topology.node[v]['stack'] = (stack_name, stack_props)
-        if len(node.findall('application')) > 0:
-            topology.node[v]['application'] = {}
-            for application in node.findall('application'):
-                app_name = util.xml_cast_type(application.attrib['name.type'],
-                                          application.attrib['name'])
-                app_props = {}
-                for prop in application.findall('property'):
-                    name = prop.attrib['name']
-                    value = util.xml_cast_type(prop.attrib['type'], prop.text)
-                    app_props[name] = value
-                topology.node[v]['application'][app_name] = app_props
-    for edge in head.findall('link'):
-        u = util.xml_cast_type(edge.find('from').attrib['type'],
-                           edge.find('from').text)
-        v = util.xml_cast_type(edge.find('to').attrib['type'],
-                           edge.find('to').text)
-        topology.add_edge(u, v)
-        for prop in edge.findall('property'):
-            name = prop.attrib['name']
-            value = util.xml_cast_type(prop.attrib['type'], prop.text)
-            topology.adj[u][v][name] = value
+    # Nodes and links are added in batches, keeping the order of the file
+    batch = []
+    batch_tag = None
+    depth = 0
+    for action, element in context:
+        if action == 'start':
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 0:
+            continue
+        tag = element.tag
+        if tag == 'property':
+            topology.graph[element.attrib['name']] = \
+                    cast(element.attrib['type'])(element.text)
+        elif tag in ('node', 'link'):
+            if tag != batch_tag or len(batch) >= _READ_BATCH_SIZE:
+                _add_batch(topology, batch_tag, batch)
+                batch = []
+                batch_tag = tag
+            batch.append(_parse_node(element, cast) if tag == 'node'
+                         else _parse_link(element, cast))
+        # discard parsed elements to keep memory usage constant
+        head.clear()
+    _add_batch(topology, batch_tag, batch)
     return topology
 
 
+def _add_batch(topology, tag, batch):
+    """Add a batch of parsed nodes or links to a topology"""
+    if tag == 'node':
+        topology.add_nodes_from(batch)
+    elif tag == 'link':
+        topology.add_edges_from(batch)
+
+
 def write_topology(topology, path, encoding='utf-8', prettyprint=True):
     """Write a topology object on an XML file
 
@@ -743,3 +2296,223 @@ def write_topology(topology, path, encoding='utf-8', prettyprint=True):
     if prettyprint:
         util.xml_indent(head)
     ET.ElementTree(head).write(path, encoding=encoding)
+
+
+# Magic bytes and version of the topology binary format
+_BINARY_MAGIC = b'FNSSTP'
+_BINARY_VERSION = 2
+
+# Structure of the length of the header
+_BINARY_LENGTH = struct.Struct('<Q')
+
+# Alignment, in bytes, of the arrays of the topology binary format
+_BINARY_ALIGNMENT = 64
+
+# Data type of the arrays of the indices of the endpoints of the links
+_BINARY_INDEX_DTYPE = '<i8'
+
+# Data types of the link attribute columns, keyed by type of the values
+_BINARY_COLUMN_DTYPES = {bool: '|b1', int: '<i8', float: '<f8'}
+
+
+def _binary_offset(offset):
+    """Return the first offset aligned for an array of the binary format"""
+    return -(-offset // _BINARY_ALIGNMENT) * _BINARY_ALIGNMENT
+
+
+def _binary_column(values):
+    """Return the values of a link attribute as an array if they all have the
+    same bool, int or float type and none is missing, None otherwise"""
+    types = set(map(type, values))
+    if len(types) != 1:
+        return None
+    dtype = _BINARY_COLUMN_DTYPES.get(types.pop())
+    if dtype is None:
+        return None
+    try:
+        return np.array(values, dtype=dtype)
+    except OverflowError:
+        return None
+
+
+def write_topology_binary(topology, path):
+    """Write a topology on a binary file.
+
+    This format is much more compact and faster to read and write than XML
+    and preserves the types of attributes whose values are strings, numbers,
+    booleans, None or tuples, lists and dictionaries of them. The file starts
+    with the magic bytes *FNSSTP*, the version of the format and a JSON
+    header, with values of types not supported by JSON stored as [type,
+    value] pairs, using the type names of XML files. The header stores the
+    topology properties, the table of node identifiers, the node attributes,
+    with stacks and applications stored in separate side tables, and the
+    names and data types of the link attribute columns. It is followed by
+    two arrays with the indices of the endpoints of the links and by an
+    array for each link attribute whose values are all bool, int or float.
+    Other link attributes are stored in a side table of the header. Arrays
+    are aligned to 64 bytes so that they can be memory-mapped by
+    :func:`read_topology_binary`.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology to write
+    path : str
+        The path of the output file
+    """
+    nodes = list(topology.nodes())
+    index = {v: i for i, v in enumerate(nodes)}
+    node_data = []
+    stacks = {}
+    applications = {}
+    for i, (_, data) in enumerate(topology.nodes(data=True)):
+        data = dict(data)
+        if 'stack' in data:
+            stacks[i] = data.pop('stack')
+        if 'application' in data:
+            applications[i] = data.pop('application')
+        node_data.append(data)
+    edges = list(topology.edges(data=True))
+    names = []
+    for _, _, data in edges:
+        names.extend(name for name in data if name not in names)
+    arrays = [np.fromiter((index[u] for u, _, _ in edges),
+                          _BINARY_INDEX_DTYPE, len(edges)),
+              np.fromiter((index[v] for _, v, _ in edges),
+                          _BINARY_INDEX_DTYPE, len(edges))]
+    columns = []
+    edge_data = {}
+    missing = object()
+    for name in names:
+        values = [data.get(name, missing) for _, _, data in edges]
+        column = _binary_column(values)
+        if column is not None:
+            columns.append((name, column.dtype.str))
+            arrays.append(column)
+            continue
+        for i, value in enumerate(values):
+            if value is not missing:
+                edge_data.setdefault(i, {})[name] = value
+    header = {'directed': topology.is_directed(),
+              'graph': dict(topology.graph),
+              'nodes': nodes,
+              'node_data': node_data,
+              'stacks': stacks,
+              'applications': applications,
+              'n_edges': len(edges),
+              'columns': columns,
+              'edge_data': edge_data}
+    data = json.dumps(dict((name, util._to_json(value))
+                           for name, value in header.items()),
+                      separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(_BINARY_MAGIC + struct.pack('<H', _BINARY_VERSION))
+        f.write(_BINARY_LENGTH.pack(len(data)) + data)
+        offset = f.tell()
+        for array in arrays:
+            f.write(b'\0' * (_binary_offset(offset) - offset))
+            f.write(array.tobytes())
+            offset = f.tell()
+
+
+def _read_binary_header(f):
+    """Read the header of a topology binary file and return it together with
+    the offset of its end"""
+    magic = f.read(len(_BINARY_MAGIC) + 2)
+    if magic[:len(_BINARY_MAGIC)] != _BINARY_MAGIC:
+        raise ValueError('The file is not a topology binary file')
+    version, = struct.unpack('<H', magic[len(_BINARY_MAGIC):])
+    if version != _BINARY_VERSION:
+        raise ValueError('Unsupported topology binary file version %d'
+                         % version)
+    length, = _BINARY_LENGTH.unpack(f.read(_BINARY_LENGTH.size))
+    header = json.loads(f.read(length).decode('utf-8'))
+    return dict((name, util._from_json(value))
+                for name, value in header.items()), f.tell()
+
+
+def _binary_edge_data(header, columns):
+    """Return the list of the attributes of the links of a topology binary
+    file"""
+    names = [name for name, _ in header['columns']]
+    if names:
+        edge_data = [dict(zip(names, values)) for values
+                     in zip(*[column.tolist() for column in columns])]
+    else:
+        edge_data = [{} for _ in range(header['n_edges'])]
+    for i, data in header['edge_data'].items():
+        edge_data[i].update(data)
+    return edge_data
+
+
+def read_topology_binary(path, mmap=False, frozen=False):
+    """Read a topology from a binary file written by
+    :func:`write_topology_binary`
+
+    Parameters
+    ----------
+    path : str
+        The path of the topology binary file
+    mmap : bool, optional
+        If True, the arrays of the link endpoints and attributes are
+        memory-mapped rather than read in memory. This is mostly useful with
+        *frozen*, since frozen topologies use these arrays directly
+    frozen : bool, optional
+        If True, return a FrozenTopology built directly from the arrays of the
+        file, without building a mutable topology first. The attributes of
+        the links are only built when first requested
+
+    Returns
+    -------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology
+    """
+    with open(path, 'rb') as f:
+        header, offset = _read_binary_header(f)
+    n_edges = header['n_edges']
+    arrays = []
+    for dtype in [_BINARY_INDEX_DTYPE] * 2 + \
+                 [dtype for _, dtype in header['columns']]:
+        offset = _binary_offset(offset)
+        if mmap and n_edges > 0:
+            array = np.memmap(path, dtype=dtype, mode='r', offset=offset,
+                              shape=(n_edges,))
+        else:
+            array = np.fromfile(path, dtype=dtype, count=n_edges,
+                                offset=offset)
+        arrays.append(array)
+        offset += n_edges * np.dtype(dtype).itemsize
+    sources, targets = arrays[:2]
+    columns = arrays[2:]
+    nodes = header['nodes']
+    node_data = header['node_data']
+    for i, stack in header['stacks'].items():
+        node_data[i]['stack'] = stack
+    for i, application in header['applications'].items():
+        node_data[i]['application'] = application
+    if frozen:
+        # Attributes stored in the side table are read from the attributes
+        # of the links, all others from the columns
+        side_names = set(name for data in header['edge_data'].values()
+                         for name in data)
+        attributes = {name: np.full(n_edges, np.nan)
+                      for name in FrozenTopology.edge_attributes
+                      if name not in side_names}
+        for (name, _), column in zip(header['columns'], columns):
+            if name in attributes:
+                attributes[name] = column if column.dtype == np.float64 \
+                                   else column.astype(np.float64)
+        topology = FrozenTopology.__new__(FrozenTopology)
+        topology._freeze(header['directed'], header['graph'], nodes,
+                         node_data, sources.astype(np.intp, copy=False),
+                         targets.astype(np.intp, copy=False),
+                         lambda: _binary_edge_data(header, columns),
+                         attributes)
+        return topology
+    topology = DirectedTopology() if header['directed'] else Topology()
+    topology.graph.update(header['graph'])
+    topology.add_nodes_from(zip(nodes, node_data))
+    topology.add_edges_from((nodes[u], nodes[v], data) for u, v, data
+                            in zip(sources.tolist(), targets.tolist(),
+                                   _binary_edge_data(header, columns)))
+    return topology
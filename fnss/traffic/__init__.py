@@ -1,3 +1,43 @@
 """Tools for creating and manipulating event schedules and traffic matrices"""
-from fnss.traffic.eventscheduling import *
-from fnss.traffic.trafficmatrices import *
+import sys
+
+# Public names of the modules of the package
+_modules = {
+    'eventscheduling': (
+        'EventSchedule', 'ColumnarEventSchedule', 'EventTickIndex',
+        'deterministic_process_event_schedule',
+        'poisson_process_event_schedule',
+        'nonhomogeneous_poisson_process_event_schedule',
+        'markov_modulated_poisson_process_event_schedule',
+        'parallel_event_schedule', 'deterministic_process_event_stream',
+        'poisson_process_event_stream', 'merge_event_streams',
+        'write_event_schedule', 'read_event_schedule', 'iter_event_schedule',
+        'EventScheduleWriter', 'write_event_schedule_binary',
+        'read_event_schedule_binary', 'iter_event_schedule_binary',
+        'shard_event_schedule', 'EventReplayer', 'TopologyChangeSet'
+        ),
+    'trafficmatrices': (
+        'TrafficMatrix', 'TrafficMatrixSequence', 'static_traffic_matrix',
+        'stationary_traffic_matrix', 'sin_cyclostationary_traffic_matrix',
+        'sin_cyclostationary_traffic_matrix_generator', 'read_traffic_matrix',
+        'write_traffic_matrix', 'validate_traffic_matrix', 'link_loads'
+        ),
+    'linkstats': (
+        'LinkLoadStatistics', 'link_load_statistics'
+        ),
+}
+
+__all__ = list(_modules) + list(name for module in _modules
+                                for name in _modules[module])
+
+# On Python 3.7+ modules are imported when one of their names is first
+# accessed (PEP 562), so that importing the package is fast
+if sys.version_info[:2] >= (3, 7):
+    from fnss.util import _lazy_attributes
+    __getattr__, __dir__ = _lazy_attributes(__name__, _modules)
+    del _lazy_attributes
+else:
+    from fnss.traffic.eventscheduling import *
+    from fnss.traffic.trafficmatrices import *
+    from fnss.traffic.linkstats import *
+del sys
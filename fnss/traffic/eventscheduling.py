@@ -6,20 +6,45 @@ number of properties.
 An event schedule can be read and written from/to an XML files with provided
 functions.
 """
-import random
 import bisect
 import copy
+import functools
+import heapq
+import multiprocessing as mp
+import json
+import os
+import random
+import struct
 import xml.etree.cElementTree as ET
+from math import ceil, sqrt
+
+import numpy as np
 
 import fnss.util as util
-from fnss.units import time_units
+from fnss.units import capacity_units, time_units
 
 __all__ = [
     'EventSchedule',
+    'ColumnarEventSchedule',
+    'EventTickIndex',
     'deterministic_process_event_schedule',
     'poisson_process_event_schedule',
+    'nonhomogeneous_poisson_process_event_schedule',
+    'markov_modulated_poisson_process_event_schedule',
+    'parallel_event_schedule',
+    'deterministic_process_event_stream',
+    'poisson_process_event_stream',
+    'merge_event_streams',
     'write_event_schedule',
-    'read_event_schedule'
+    'read_event_schedule',
+    'iter_event_schedule',
+    'EventScheduleWriter',
+    'write_event_schedule_binary',
+    'read_event_schedule_binary',
+    'iter_event_schedule_binary',
+    'shard_event_schedule',
+    'EventReplayer',
+    'TopologyChangeSet',
            ]
 
 class EventSchedule(object):
@@ -90,7 +115,10 @@ class EventSchedule(object):
             The event schedule whose events are added to this one.
         """
         es = copy.copy(self)
-        es.add_schedule(other)  # merge with shallow copy
+        # attributes are copied because merging updates t_end, while events
+        # are not because merging replaces the event list with a new one
+        es.attrib = self.attrib.copy()
+        es.merge(other)
         return es
 
     def __radd__(self, other):
@@ -180,11 +208,82 @@ class EventSchedule(object):
         -----
         All the events are sorted
         """
+        self.merge(event_schedule)
+
+    def add_many(self, times, events, absolute_time=True):
+        """Adds several events to the schedule.
+
+        Events are sorted and merged with the events already in the schedule
+        in a single pass, which is much faster than adding them one by one if
+        they are not all scheduled after the latest event of the schedule.
+        Events with the same time are kept in the order in which they are
+        provided, after the events already in the schedule.
+
+        Parameters
+        ----------
+        times : list or array
+            The times at which the events take place
+        events : list
+            The properties of the events
+        absolute_time : bool, optional
+            Specifies whether the times are expressed as absolute times or as
+            intervals each from the previous event, the first interval being
+            from the latest event of the schedule
+        """
+        times = np.asarray(times, dtype=np.float64)
+        events = list(events)
+        if times.ndim != 1 or len(times) != len(events):
+            raise ValueError('times and events must have the same length')
+        if len(events) == 0:
+            return
+        if absolute_time:
+            if (times < 0).any():
+                raise ValueError('Time must be a positive value')
+            if (np.diff(times) < 0).any():
+                order = np.argsort(times, kind='mergesort')
+                times = times[order]
+                events = [events[i] for i in order]
+        else:
+            times = self.attrib['t_end'] + np.cumsum(times)
+        new_events = list(zip(times.tolist(), events))
+        if new_events[0][0] >= self.attrib['t_end']:
+            self.event.extend(new_events)
+        else:
+            self.event = _merge_events([self.event, new_events])
+        self.attrib['t_end'] = max(self.attrib['t_end'], new_events[-1][0])
+
+    def merge(self, *schedules):
+        """Merge with other event schedules.
+
+        All events of the schedules passed as arguments are added to this
+        schedule with a single k-way merge pass, after converting their times
+        to the time unit of this schedule. Events with the same time are kept
+        in the order of the schedules passed as arguments, after the events
+        already in this schedule.
+
+        Parameters
+        ----------
+        *schedules : EventSchedule
+            The event schedules whose events are added to this one.
+        """
+        event_lists = [self.event]
+        t_end = self.attrib['t_end']
         this_t_unit = time_units[self.attrib['t_unit']]
-        other_t_unit = time_units[event_schedule.attrib['t_unit']]
-        conv_factor = float(other_t_unit) / float(this_t_unit)
-        for time, event_props in event_schedule:
-            self.add(time * conv_factor, event_props, absolute_time=True)
+        for event_schedule in schedules:
+            if len(event_schedule) == 0:
+                continue
+            other_t_unit = time_units[event_schedule.attrib['t_unit']]
+            conv_factor = float(other_t_unit) / float(this_t_unit)
+            events = list(event_schedule)
+            if conv_factor != 1:
+                times = np.asarray([time for time, _ in events]) * conv_factor
+                events = list(zip(times.tolist(),
+                                  (event for _, event in events)))
+            event_lists.append(events)
+            t_end = max(t_end, events[-1][0])
+        if len(event_lists) > 1:
+            self.event = _merge_events(event_lists)
+            self.attrib['t_end'] = t_end
 
     def events_between(self, t_start, t_end):
         """Return an event schedule comprising all events scheduled between a
@@ -212,6 +311,623 @@ class EventSchedule(object):
                                 if time >= t_start and time < t_end]
         return event_schedule
 
+    def tick_index(self, tick=1, t_unit=None):
+        """Return an index grouping the events of the schedule by tick, i.e.
+        by time quantized to a fixed resolution.
+
+        The index is a snapshot: it is not updated if events are later added
+        to or removed from the schedule.
+
+        Parameters
+        ----------
+        tick : float, optional
+            The duration of a tick
+        t_unit : str, optional
+            The unit of time of the tick. If None, the unit of time of the
+            schedule is used
+
+        Returns
+        -------
+        index : EventTickIndex
+            The index
+
+        Examples
+        --------
+        >>> import fnss
+        >>> es = fnss.EventSchedule(t_unit='s')
+        >>> es.add_many([0.0012, 0.0017, 0.0031], [{'id': 1}, {'id': 2},
+        ...                                        {'id': 3}])
+        >>> index = es.tick_index(1, 'ms')
+        >>> index[1]
+        [(0.0012, {'id': 1}), (0.0017, {'id': 2})]
+        >>> index[2]
+        []
+        """
+        return EventTickIndex(self, tick, t_unit)
+
+
+class ColumnarEventSchedule(object):
+    """Class representing an event schedule stored in columnar format.
+
+    Event times are stored in a sorted NumPy array and event properties in
+    per-property columns, i.e. NumPy arrays with one element per event.
+    Properties that are not present in all events are stored in dictionaries,
+    one per event, in the *extra* array.
+
+    Compared to :class:`EventSchedule`, this class uses considerably less
+    memory and selects the events of a time window with a binary search,
+    returning a schedule whose arrays are views (not copies) of the arrays of
+    the original schedule. Events cannot be added to a columnar schedule.
+
+    Parameters
+    ----------
+    data : EventSchedule, optional
+        The event schedule whose events and attributes are copied. If None,
+        the schedule is empty
+    t_start : float, optional
+        Time at which the event schedule starts. Ignored if data is not None
+    t_unit : str, optional
+        The unit of time. Ignored if data is not None
+
+    Examples
+    --------
+    >>> import fnss
+    >>> es = fnss.EventSchedule(t_unit='s')
+    >>> es.add_many([1, 2, 3], [{'link': (1, 2), 'action': 'down'},
+    ...                         {'link': (1, 2), 'action': 'up'},
+    ...                         {'link': (2, 3), 'action': 'down'}])
+    >>> ces = fnss.ColumnarEventSchedule(es)
+    >>> ces.columns['action']
+    array(['down', 'up', 'down'], dtype=object)
+    >>> len(ces.events_between(1.5, 3))
+    1
+    """
+
+    def __init__(self, data=None, t_start=0, t_unit='ms'):
+        """Initialize the event schedule"""
+        if data is not None:
+            t_unit = data.attrib['t_unit']
+        if t_unit not in time_units:
+            raise ValueError("The t_unit argument is not valid")
+        self.attrib = {'t_start': t_start, 't_end': t_start, 't_unit': t_unit}
+        self.time = np.empty(0, dtype=np.float64)
+        self.columns = {}
+        self.extra = None
+        if data is None:
+            return
+        self.attrib.update(data.attrib)
+        events = list(data)
+        self.time = np.asarray([time for time, _ in events], dtype=np.float64)
+        if not events:
+            return
+        common = set(events[0][1])
+        for _, event in events:
+            common.intersection_update(event)
+        keys = [key for key in events[0][1] if key in common]
+        for key in keys:
+            self.columns[key] = _column([event[key] for _, event in events])
+        if any(len(event) > len(keys) for _, event in events):
+            self.extra = _column([{k: v for k, v in event.items()
+                                   if k not in keys}
+                                  for _, event in events], dtype=object)
+
+    def __len__(self):
+        """Return the number of events in the schedule. Use the expression
+        'len(schedule)'
+        """
+        return len(self.time)
+
+    def __iter__(self):
+        """Iterates over the events of the schedule as (time, event) tuples.
+        Use the expression 'for event in event_schedule'
+        """
+        columns = [(key, column.tolist())
+                   for key, column in self.columns.items()]
+        extra = self.extra.tolist() if self.extra is not None else None
+        for i, time in enumerate(self.time.tolist()):
+            event = {key: column[i] for key, column in columns}
+            if extra is not None:
+                event.update(extra[i])
+            yield time, event
+
+    def __getitem__(self, key):
+        """Return the event in a specific position of the schedule as a
+        (time, event) tuple or, if a slice is given, a schedule whose arrays
+        are views of the arrays of this schedule. Use the expression
+        'event_schedule[i]'
+        """
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(len(self))
+            if key.step not in (None, 1):
+                raise ValueError('Slices of a columnar event schedule must '
+                                 'have unitary step')
+            return self._view(start, max(start, stop))
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('Event index out of range')
+        return next(iter(self._view(key, key + 1)))
+
+    def _view(self, start, stop):
+        """Return a schedule whose arrays are views of the arrays of this
+        schedule from index start (included) to index stop (excluded)"""
+        event_schedule = ColumnarEventSchedule(t_unit=self.attrib['t_unit'])
+        event_schedule.attrib.update(self.attrib)
+        event_schedule.time = self.time[start:stop]
+        event_schedule.columns = {key: column[start:stop]
+                                  for key, column in self.columns.items()}
+        if self.extra is not None:
+            event_schedule.extra = self.extra[start:stop]
+        return event_schedule
+
+    def number_of_events(self):
+        """Return the number of events in the schedule
+
+        Returns
+        -------
+        number_of_events : int
+            The number of events of the schedule
+        """
+        return len(self.time)
+
+    def events_between(self, t_start, t_end):
+        """Return an event schedule comprising all events scheduled between a
+        start time (included) and an end time (excluded).
+
+        Events are selected by binary search and the arrays of the returned
+        schedule are views of the arrays of this schedule.
+
+        Parameters
+        ----------
+        t_start : float
+            The start time
+        t_end : float
+            The end time
+
+        Returns
+        -------
+        event_schedule : ColumnarEventSchedule
+            A ColumnarEventSchedule object
+        """
+        if t_end <= t_start:
+            raise ValueError('end_time must be greater than start_time')
+        start, stop = np.searchsorted(self.time, [t_start, t_end], 'left')
+        event_schedule = self._view(start, stop)
+        event_schedule.attrib['t_start'] = t_start
+        event_schedule.attrib['t_end'] = t_end
+        return event_schedule
+
+    def to_event_schedule(self):
+        """Convert this schedule to an :class:`EventSchedule` object
+
+        Returns
+        -------
+        event_schedule : EventSchedule
+            An EventSchedule with the same events and attributes
+        """
+        event_schedule = EventSchedule(t_start=self.attrib['t_start'],
+                                       t_unit=self.attrib['t_unit'])
+        event_schedule.attrib.update(self.attrib)
+        event_schedule.event = list(self)
+        return event_schedule
+
+
+class EventTickIndex(object):
+    """Class indexing the events of a schedule by tick, i.e. by time quantized
+    to a fixed resolution, so that all events of a tick can be retrieved in
+    constant time.
+
+    Tick *k* comprises all events scheduled at times *t* such that
+    k * tick <= t < (k + 1) * tick, after converting *t* to the unit of time
+    of the tick. Only the ticks with at least one event are stored: the index
+    consists of a sorted array of tick numbers, an array with the position of
+    the first event of each tick in the schedule and a dictionary mapping
+    tick numbers to their position in these arrays.
+
+    The index does not copy events, which are retrieved by slicing the
+    schedule. Therefore it must not be used after the schedule is modified.
+
+    Parameters
+    ----------
+    event_schedule : EventSchedule or ColumnarEventSchedule
+        The event schedule to index
+    tick : float, optional
+        The duration of a tick
+    t_unit : str, optional
+        The unit of time of the tick. If None, the unit of time of the
+        schedule is used
+    """
+
+    def __init__(self, event_schedule, tick=1, t_unit=None):
+        """Build the index"""
+        if t_unit is None:
+            t_unit = event_schedule.attrib['t_unit']
+        if t_unit not in time_units:
+            raise ValueError("The t_unit argument is not valid")
+        if tick <= 0:
+            raise ValueError('tick must be positive')
+        self.attrib = {'tick': tick, 't_unit': t_unit}
+        self._schedule = event_schedule
+        if isinstance(event_schedule, ColumnarEventSchedule):
+            times = event_schedule.time
+        else:
+            times = np.fromiter((time for time, _ in event_schedule),
+                                dtype=np.float64, count=len(event_schedule))
+        conv_factor = float(time_units[event_schedule.attrib['t_unit']]) \
+                      / time_units[t_unit]
+        # Rounding prevents times falling on tick boundaries from being
+        # assigned to the previous tick because of unit conversion errors
+        ticks = np.floor(np.around(times * conv_factor / tick, 9))
+        ticks = ticks.astype(np.int64)
+        starts = np.flatnonzero(np.diff(ticks)) + 1
+        self.ticks = ticks[np.concatenate(([0], starts))] if len(ticks) \
+                     else ticks
+        self.offsets = np.concatenate(([0], starts, [len(ticks)]))
+        self._position = {k: i for i, k in enumerate(self.ticks.tolist())}
+
+    def __len__(self):
+        """Return the number of ticks with at least one event"""
+        return len(self.ticks)
+
+    def __contains__(self, tick):
+        """Return whether a tick has at least one event. Use the expression
+        'k in index'
+        """
+        return tick in self._position
+
+    def __getitem__(self, tick):
+        """Return the events of a tick. Use the expression 'index[k]'
+
+        Events are returned in the format of a slice of the indexed schedule,
+        i.e. a list of (time, event) tuples for an EventSchedule and a
+        ColumnarEventSchedule for a ColumnarEventSchedule.
+        """
+        start, stop = self.slice(tick)
+        return self._schedule[start:stop]
+
+    def __iter__(self):
+        """Iterate over the ticks with at least one event, returning (tick,
+        events) tuples in chronological order
+        """
+        offsets = self.offsets.tolist()
+        for i, tick in enumerate(self.ticks.tolist()):
+            yield tick, self._schedule[offsets[i]:offsets[i + 1]]
+
+    def slice(self, tick):
+        """Return the positions in the schedule of the first event of a tick
+        (included) and of the last one (excluded)
+
+        Parameters
+        ----------
+        tick : int
+            The tick number
+
+        Returns
+        -------
+        start, stop : tuple
+            The positions of the events of the tick. If the tick has no event,
+            both are 0
+        """
+        i = self._position.get(tick)
+        if i is None:
+            return 0, 0
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def count(self, tick):
+        """Return the number of events of a tick
+
+        Parameters
+        ----------
+        tick : int
+            The tick number
+
+        Returns
+        -------
+        count : int
+            The number of events
+        """
+        start, stop = self.slice(tick)
+        return stop - start
+
+
+def _column(values, dtype=None):
+    """Return a NumPy array storing a list of event property values
+
+    Booleans, integers and floats are stored in arrays of the corresponding
+    type if all values have the same type. All other values are stored in
+    object arrays, so that tuples or other sequences are not converted into
+    array dimensions.
+    """
+    if dtype is None:
+        value_types = set(type(v) for v in values)
+        if value_types == {bool}:
+            dtype = np.bool_
+        elif value_types == {float}:
+            dtype = np.float64
+        elif value_types == {int} and \
+                all(-2 ** 63 <= v < 2 ** 63 for v in values):
+            dtype = np.int64
+        else:
+            dtype = object
+    if dtype is not object:
+        return np.asarray(values, dtype=dtype)
+    column = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        column[i] = value
+    return column
+
+
+def _decorate_events(i, events):
+    """Decorate events so that they can be merged without comparing event
+    properties, preserving the order of events with the same time"""
+    for j, (time, event) in enumerate(events):
+        yield time, i, j, event
+
+
+def _merge_events(event_lists):
+    """Merge chronologically sorted lists of (time, event) tuples
+
+    Parameters
+    ----------
+    event_lists : list of lists
+        The lists of events to merge
+
+    Returns
+    -------
+    events : list
+        The merged list of events. Events with the same time are sorted by the
+        position of the list they come from
+    """
+    return [(time, event) for time, _, _, event in
+            heapq.merge(*[_decorate_events(i, events)
+                          for i, events in enumerate(event_lists)])]
+
+
+# Number of arrival times generated at once by arrival process generators
+_ARRIVAL_CHUNK_SIZE = 2 ** 16
+
+
+def _random_generator(seed=None):
+    """Return the random generator of an arrival process
+
+    If no seed is given, the generator is seeded with a value drawn from the
+    random module, so that schedules can be reproduced by calling
+    random.seed as with versions of FNSS based on the random module.
+
+    Parameters
+    ----------
+    seed : int, optional
+        The seed of the generator
+
+    Returns
+    -------
+    rng : numpy.random.Generator
+        The random generator
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    return np.random.default_rng(seed)
+
+
+def _first_chunk_size(expected, chunk_size):
+    """Return the number of arrival times to generate in the first chunk of a
+    process expected to generate a given number of events before t_end
+
+    The first chunk is sized so that short schedules are generated with a
+    single small chunk, while the following chunks, if any, have the fixed
+    size *chunk_size*.
+
+    Parameters
+    ----------
+    expected : float
+        The expected number of events
+    chunk_size : int
+        The maximum size of a chunk
+
+    Returns
+    -------
+    size : int
+        The size of the first chunk
+    """
+    if expected >= chunk_size:
+        return chunk_size
+    expected = max(expected, 0)
+    # margin of four standard deviations of a Poisson-distributed number of
+    # events, plus a few events so that the last time exceeds t_end
+    return min(chunk_size, int(ceil(expected + 4 * sqrt(expected))) + 16)
+
+
+def _deterministic_arrival_times(interval, t_start, t_end,
+                                 chunk_size=_ARRIVAL_CHUNK_SIZE):
+    """Generate, in chunks, the times of events separated by a fixed interval
+    between t_start (excluded) and t_end (excluded)
+
+    Yields
+    ------
+    times : numpy array
+        Sorted array of event times
+    """
+    if interval <= 0:
+        raise ValueError('interval must be positive')
+    k = 1
+    size = _first_chunk_size((t_end - t_start) / interval, chunk_size)
+    while True:
+        times = t_start + interval * np.arange(k, k + size)
+        if times[-1] >= t_end:
+            yield times[:np.searchsorted(times, t_end, 'left')]
+            return
+        yield times
+        k += size
+        size = chunk_size
+
+
+def _poisson_arrival_times(avg_interval, t_start, t_end, rng,
+                           chunk_size=_ARRIVAL_CHUNK_SIZE):
+    """Generate, in chunks, the times of Poisson-distributed events between
+    t_start (excluded) and t_end (excluded)
+
+    Yields
+    ------
+    times : numpy array
+        Sorted array of event times
+    """
+    if avg_interval <= 0:
+        raise ValueError('avg_interval must be positive')
+    t_last = t_start
+    size = _first_chunk_size((t_end - t_start) / avg_interval, chunk_size)
+    while True:
+        times = t_last + np.cumsum(rng.exponential(avg_interval, size))
+        if times[-1] >= t_end:
+            yield times[:np.searchsorted(times, t_end, 'left')]
+            return
+        yield times
+        t_last = times[-1]
+        size = chunk_size
+
+
+def _nonhomogeneous_poisson_arrival_times(rate, max_rate, t_start, t_end,
+                                          rng):
+    """Generate, in chunks, the times of the events of a non-homogeneous
+    Poisson process with the given rate function between t_start (excluded)
+    and t_end (excluded), by thinning a homogeneous process of rate max_rate
+
+    Yields
+    ------
+    times : numpy array
+        Sorted array of event times
+    """
+    if max_rate <= 0:
+        yield np.empty(0)
+        return
+    for times in _poisson_arrival_times(1.0 / max_rate, t_start, t_end, rng):
+        rates = np.broadcast_to(np.asarray(rate(times), dtype=np.float64),
+                                times.shape)
+        if (rates > max_rate).any():
+            raise ValueError('The rate function exceeds max_rate. Provide a '
+                             'greater max_rate argument')
+        yield times[rng.random(len(times)) * max_rate < rates]
+
+
+def _mmpp_arrival_times(rates, transitions, state, t_start, t_end, rng,
+                        chunk_size=1024):
+    """Generate, in chunks, the times of the events of a Markov-modulated
+    Poisson process between t_start (excluded) and t_end (excluded)
+
+    The sojourns in the states of the modulating Markov chain are simulated
+    in chunks and the events of all sojourns of a chunk are drawn at once.
+
+    Yields
+    ------
+    times : numpy array
+        Sorted array of event times
+    """
+    exit_rates = transitions.sum(axis=1)
+    cum_probs = np.cumsum(transitions / np.where(exit_rates > 0, exit_rates,
+                                                 1)[:, None], axis=1)
+    t = t_start
+    while t < t_end:
+        starts = []
+        durations = []
+        states = []
+        for _ in range(chunk_size):
+            if exit_rates[state] > 0:
+                duration = rng.exponential(1.0 / exit_rates[state])
+            else:
+                duration = t_end - t
+            starts.append(t)
+            durations.append(min(duration, t_end - t))
+            states.append(state)
+            t += duration
+            if t >= t_end:
+                break
+            state = min(int(np.searchsorted(cum_probs[state], rng.random(),
+                                            'right')),
+                        len(rates) - 1)
+        durations = np.asarray(durations)
+        counts = rng.poisson(rates[states] * durations)
+        times = np.repeat(starts, counts) + \
+                rng.random(counts.sum()) * np.repeat(durations, counts)
+        times.sort()
+        yield times
+
+
+def _generate_events(n, batch, event_generator, args, kwargs):
+    """Return a list of n events generated by an event generator, called
+    either once per event or, if batch is True, once for all events"""
+    if not batch:
+        return [event_generator(*args, **kwargs) for _ in range(n)]
+    events = list(event_generator(n, *args, **kwargs))
+    if len(events) != n:
+        raise ValueError('The event generator returned %d events instead '
+                         'of %d' % (len(events), n))
+    return events
+
+
+def _event_chunks(times, event_generator, args, kwargs):
+    """Generate chunks of events, each one a tuple of an array of times and a
+    list of events, for the given chunks of event times
+
+    The keyworded argument *batch*, if present, is removed from kwargs before
+    calling the event generator.
+    """
+    batch = kwargs.pop('batch', False)
+    for chunk_times in times:
+        yield chunk_times, _generate_events(len(chunk_times), batch,
+                                            event_generator, args, kwargs)
+
+
+def _process_event_schedule(times, t_start, t_unit, event_generator, args,
+                            kwargs):
+    """Return an event schedule with events generated at the given chunks of
+    times
+
+    The keyworded argument *batch*, if present, is removed from kwargs before
+    calling the event generator.
+    """
+    chunks = _event_chunks([np.concatenate(list(times))], event_generator,
+                           args, kwargs)
+    event_schedule = EventSchedule(t_start=t_start, t_unit=t_unit)
+    for times, events in chunks:
+        event_schedule.add_many(times, events)
+    return event_schedule
+
+
+def _process_event_stream(chunks, t_start, t_end, t_unit, window):
+    """Lazily yield all events of the given chunks either one by one or, if
+    window is not None, grouped in event schedules each spanning a time window
+    of the given duration"""
+    if window is None:
+        for times, events in chunks:
+            for event in zip(times.tolist(), events):
+                yield event
+        return
+    if window <= 0:
+        raise ValueError('window must be positive')
+    k = 0
+    w_start, w_end = t_start, t_start + window
+    event_schedule = EventSchedule(t_start=w_start, t_unit=t_unit)
+    for times, events in chunks:
+        i = 0
+        while True:
+            j = i + np.searchsorted(times[i:], w_end, 'left')
+            event_schedule.add_many(times[i:j], events[i:j])
+            if j == len(times):
+                break
+            # all events of the current window have been generated
+            event_schedule.attrib['t_end'] = w_end
+            yield event_schedule
+            k += 1
+            w_start, w_end = t_start + k * window, t_start + (k + 1) * window
+            event_schedule = EventSchedule(t_start=w_start, t_unit=t_unit)
+            i = j
+    # yield the last window with events and all following empty windows
+    while w_start < t_end:
+        event_schedule.attrib['t_end'] = min(w_end, t_end)
+        yield event_schedule
+        k += 1
+        w_start, w_end = t_start + k * window, t_start + (k + 1) * window
+        event_schedule = EventSchedule(t_start=w_start, t_unit=t_unit)
+
 
 def deterministic_process_event_schedule(interval, t_start, duration, t_unit,
                                          event_generator, *args, **kwargs):
@@ -230,7 +946,11 @@ def deterministic_process_event_schedule(interval, t_start, duration, t_unit,
         The unit in which time values are expressed (e.g. 'ms', 's')
     event_generator : function
         A function that when called returns an event, i.e. a dictionary of
-        event properties
+        event properties. If *batch* is True, it is called only once with the
+        number of events as first argument and it must return a list of events
+    batch : bool, optional
+        Keyworded argument specifying whether event_generator returns a single
+        event or a batch of events. It is not passed to event_generator
     *args : argument list
         List of non-keyworded arguments for event_generator function
     **kwargs : keyworded argument list
@@ -241,23 +961,19 @@ def deterministic_process_event_schedule(interval, t_start, duration, t_unit,
     event_schedule : EventSchedule
         An EventSchedule object
     """
-    t_end = t_start + duration
-    t_last_event = t_start
-    event_schedule = EventSchedule(t_start=t_start, t_unit=t_unit)
-    while True:
-        t_last_event += interval
-        if t_last_event < t_end:
-            event = event_generator(*args, **kwargs)
-            event_schedule.add(t_last_event, event, absolute_time=True)
-        else:
-            break
-    return event_schedule
+    times = _deterministic_arrival_times(interval, t_start,
+                                         t_start + duration)
+    return _process_event_schedule(times, t_start, t_unit, event_generator,
+                                   args, kwargs)
 
 
 def poisson_process_event_schedule(avg_interval, t_start, duration, t_unit,
                                    event_generator, *args, **kwargs):
     """Return a schedule of Poisson-distributed events
 
+    Inter-arrival times are drawn in vectorized chunks from a NumPy random
+    generator.
+
     Parameters
     ----------
     avg_interval : float
@@ -269,11 +985,18 @@ def poisson_process_event_schedule(avg_interval, t_start, duration, t_unit,
         The duration of the event schedule
     t_unit : string
         The unit in which time values are expressed (e.g. 'ms', 's')
-    seed : int, long or hashable type, optional
-        The seed to be used by the random generator.
     event_generator : callable
         A function that when called returns an event, i.e. a dictionary of
-        event properties
+        event properties. If *batch* is True, it is called only once with the
+        number of events as first argument and it must return a list of events
+    seed : int, optional
+        Keyworded argument specifying the seed of the random generator of
+        inter-arrival times. If not given, the seed is drawn from the random
+        module, so that schedules can be reproduced with random.seed. It is
+        not passed to event_generator
+    batch : bool, optional
+        Keyworded argument specifying whether event_generator returns a single
+        event or a batch of events. It is not passed to event_generator
     *args : argument list
         List of non-keyworded arguments for event_generator function
     **kwargs : keyworded argument list
@@ -284,6 +1007,15 @@ def poisson_process_event_schedule(avg_interval, t_start, duration, t_unit,
     event_schedule : EventSchedule
         An EventSchedule object
 
+    Notes
+    -----
+    Up to FNSS 0.9.1, inter-arrival times were drawn from the random module
+    and a *seed* keyworded argument was passed to event_generator like any
+    other keyworded argument. The *seed* argument now seeds the generator of
+    inter-arrival times and is not passed to event_generator. Schedules
+    generated without a seed can still be reproduced by calling random.seed
+    beforehand, although they differ from those of previous versions.
+
     Examples
     --------
     >>> import random, fnss
@@ -296,67 +1028,554 @@ def poisson_process_event_schedule(avg_interval, t_start, duration, t_unit,
     ...         event_props['action']='watch_video'
     ...     return event_props
     ...
-    >>> schedule = fnss.schedule_dynamic_poisson_events(15, 0, 8000, 'ms',
-    ... my_event_gen, p=0.5)
+    >>> schedule = fnss.poisson_process_event_schedule(15, 0, 8000, 'ms',
+    ... my_event_gen, p=0.5, seed=1)
+
+    Events can be generated in batch, which is much faster for long schedules
+
+    >>> import numpy as np
+    >>> def my_batch_event_gen(n, p):
+    ...     actions = np.where(np.random.random(n) > p, 'send_email',
+    ...                        'watch_video')
+    ...     return [{'action': action} for action in actions.tolist()]
+    ...
+    >>> schedule = fnss.poisson_process_event_schedule(15, 0, 8000, 'ms',
+    ... my_batch_event_gen, p=0.5, seed=1, batch=True)
     """
-    t_end = t_start + duration
-    t_last_event = t_start
-    event_schedule = EventSchedule(t_start=t_start, t_unit=t_unit)
-    while True:
-        t_last_event += (random.expovariate(1.0 / avg_interval))
-        if t_last_event < t_end:
-            event = event_generator(*args, **kwargs)
-            event_schedule.add(t_last_event, event, absolute_time=True)
-        else:
-            break
-    return event_schedule
+    rng = _random_generator(kwargs.pop('seed', None))
+    times = _poisson_arrival_times(avg_interval, t_start, t_start + duration,
+                                   rng)
+    return _process_event_schedule(times, t_start, t_unit, event_generator,
+                                   args, kwargs)
 
 
-def read_event_schedule(path):
-    """Read event schedule from an XML file
+def nonhomogeneous_poisson_process_event_schedule(rate, t_start, duration,
+                                                  t_unit, event_generator,
+                                                  *args, **kwargs):
+    """Return a schedule of events generated by a non-homogeneous Poisson
+    process, i.e. a Poisson process with time-varying rate.
+
+    Events are generated by thinning [1]_: candidate events are drawn from a
+    homogeneous Poisson process with rate equal to the maximum rate and each
+    of them is retained with probability equal to the ratio between the rate
+    at its time and the maximum rate. All operations are vectorized.
 
     Parameters
     ----------
-    path : str
-        The path to the event schedule XML file
+    rate : callable or array
+        The rate of the process, i.e. the mean number of events per unit of
+        time. It can be either a function that receives a NumPy array of
+        absolute times and returns an array with the rate at those times or
+        an array of rates of a piecewise-constant rate function, in which case
+        the *interval* keyworded argument must be provided
+    t_start : float
+        The time at which the schedule starts
+    duration : float
+        The duration of the event schedule
+    t_unit : string
+        The unit in which time values are expressed (e.g. 'ms', 's')
+    event_generator : callable
+        A function that when called returns an event, i.e. a dictionary of
+        event properties. If *batch* is True, it is called only once with the
+        number of events as first argument and it must return a list of events
+    interval : float, optional
+        Keyworded argument specifying the duration of each piece of a
+        piecewise-constant rate. The i-th rate applies to the interval
+        [t_start + i*interval, t_start + (i+1)*interval). If the duration of
+        the schedule exceeds the duration of all pieces, rates are repeated
+        cyclically. It is not passed to event_generator
+    max_rate : float, optional
+        Keyworded argument specifying an upper bound of the rate function. If
+        not given, it is estimated by sampling the rate function. It is not
+        passed to event_generator
+    seed : int, optional
+        Keyworded argument specifying the seed of the random generator. If
+        not given, the seed is drawn from the random module, so that
+        schedules can be reproduced with random.seed. It is not passed to
+        event_generator
+    batch : bool, optional
+        Keyworded argument specifying whether event_generator returns a single
+        event or a batch of events. It is not passed to event_generator
+    *args : argument list
+        List of non-keyworded arguments for event_generator function
+    **kwargs : keyworded argument list
+        List of keyworded arguments for event_generator function
 
     Returns
     -------
     event_schedule : EventSchedule
-        The parsed event schedule
+        An EventSchedule object
+
+    References
+    ----------
+    .. [1] P. A. W. Lewis and G. S. Shedler, Simulation of nonhomogeneous
+       Poisson processes by thinning, Naval Research Logistics Quarterly,
+       26(3), 1979
+
+    Examples
+    --------
+    Flow arrivals over a week with a diurnal pattern, with times expressed
+    in minutes and a rate of flows per minute for each hour of the day
+
+    >>> import fnss
+    >>> rates = [2, 1, 1, 1, 1, 2, 4, 8, 12, 14, 15, 15,
+    ...          14, 14, 15, 15, 14, 13, 12, 11, 9, 7, 5, 3]
+    >>> schedule = fnss.nonhomogeneous_poisson_process_event_schedule(
+    ...                 rates, 0, 7 * 24 * 60, 'min', dict, interval=60,
+    ...                 seed=1)
     """
-    event_schedule = EventSchedule()
-    tree = ET.parse(path)
-    head = tree.getroot()
-    for prop in head.findall('property'):
-        name = prop.attrib['name']
-        value = util.xml_cast_type(prop.attrib['type'], prop.text)
-        event_schedule.attrib[name] = value
-    # this is needed for not messing up the automatic sorting of the event list
-    event_schedule.attrib['t_end'] = 0
-    for event in head.findall('event'):
-        time = float(event.attrib['time'])
-        event_prop = {}
-        for prop in event.findall('property'):
-            name = prop.attrib['name']
-            value = util.xml_cast_type(prop.attrib['type'], prop.text)
-            event_prop[name] = value
-        event_schedule.add(time, event_prop, absolute_time=True)
-    return event_schedule
+    interval = kwargs.pop('interval', None)
+    max_rate = kwargs.pop('max_rate', None)
+    rng = _random_generator(kwargs.pop('seed', None))
+    t_end = t_start + duration
+    if not callable(rate):
+        if interval is None or interval <= 0:
+            raise ValueError('A positive interval must be provided with a '
+                             'piecewise-constant rate')
+        rates = np.asarray(rate, dtype=np.float64)
+        if rates.ndim != 1 or len(rates) == 0 or (rates < 0).any():
+            raise ValueError('rate must be a non-empty array of non-negative '
+                             'values')
+        if max_rate is None:
+            max_rate = rates.max()
 
+        def rate(times):
+            pieces = np.floor((times - t_start) / interval).astype(np.int64)
+            return rates[pieces % len(rates)]
+    elif max_rate is None:
+        max_rate = np.max(rate(np.linspace(t_start, t_end, 10001)))
+    times = _nonhomogeneous_poisson_arrival_times(rate, max_rate, t_start,
+                                                  t_end, rng)
+    return _process_event_schedule(times, t_start, t_unit, event_generator,
+                                   args, kwargs)
 
-def write_event_schedule(event_schedule, path,
-                         encoding='utf-8', prettyprint=True):
-    """Write an event schedule object to an XML file.
+
+def markov_modulated_poisson_process_event_schedule(rates, transitions,
+                                                    t_start, duration, t_unit,
+                                                    event_generator, *args,
+                                                    **kwargs):
+    """Return a schedule of events generated by a Markov-modulated Poisson
+    process (MMPP).
+
+    An MMPP is a Poisson process whose rate is determined by the state of a
+    continuous-time Markov chain. It is suitable for modelling bursty
+    arrivals, such as failures occurring in bursts.
 
     Parameters
     ----------
-    event_schedule : EventSchedule
-        The event schedule to write
-    path : str
-        The path of the output XML file
-    encoding : str, optional
-        The desired encoding of the output file
+    rates : array
+        The rate of the Poisson process, i.e. the mean number of events per
+        unit of time, in each state of the Markov chain
+    transitions : 2-d array
+        The matrix of transition rates of the Markov chain: element [i, j] is
+        the rate of transition from state i to state j. Diagonal elements are
+        ignored
+    t_start : float
+        The time at which the schedule starts
+    duration : float
+        The duration of the event schedule
+    t_unit : string
+        The unit in which time values are expressed (e.g. 'ms', 's')
+    event_generator : callable
+        A function that when called returns an event, i.e. a dictionary of
+        event properties. If *batch* is True, it is called only once with the
+        number of events as first argument and it must return a list of events
+    initial_state : int, optional
+        Keyworded argument specifying the state of the Markov chain at
+        t_start. Default is 0. It is not passed to event_generator
+    seed : int, optional
+        Keyworded argument specifying the seed of the random generator. If
+        not given, the seed is drawn from the random module, so that
+        schedules can be reproduced with random.seed. It is not passed to
+        event_generator
+    batch : bool, optional
+        Keyworded argument specifying whether event_generator returns a single
+        event or a batch of events. It is not passed to event_generator
+    *args : argument list
+        List of non-keyworded arguments for event_generator function
+    **kwargs : keyworded argument list
+        List of keyworded arguments for event_generator function
+
+    Returns
+    -------
+    event_schedule : EventSchedule
+        An EventSchedule object
+
+    Examples
+    --------
+    Failures occurring over a month on average every 10 hours in a normal
+    state and every 10 minutes in a burst state, which lasts on average 1
+    hour and occurs on average once a week. Times are expressed in minutes,
+    hence rates are per minute
+
+    >>> import fnss
+    >>> schedule = fnss.markov_modulated_poisson_process_event_schedule(
+    ...                 rates=[1.0 / 600, 0.1],
+    ...                 transitions=[[0, 1.0 / (7 * 24 * 60)], [1.0 / 60, 0]],
+    ...                 t_start=0, duration=30 * 24 * 60, t_unit='min',
+    ...                 event_generator=dict, seed=1)
+    """
+    initial_state = kwargs.pop('initial_state', 0)
+    rng = _random_generator(kwargs.pop('seed', None))
+    rates = np.asarray(rates, dtype=np.float64)
+    transitions = np.array(transitions, dtype=np.float64)
+    n = len(rates)
+    if rates.ndim != 1 or n == 0 or (rates < 0).any():
+        raise ValueError('rates must be a non-empty array of non-negative '
+                         'values')
+    if transitions.shape != (n, n):
+        raise ValueError('transitions must be a square matrix with as many '
+                         'rows as rates')
+    np.fill_diagonal(transitions, 0)
+    if (transitions < 0).any():
+        raise ValueError('Transition rates must be non-negative')
+    if not 0 <= initial_state < n:
+        raise ValueError('Invalid initial state')
+    times = _mmpp_arrival_times(rates, transitions, initial_state, t_start,
+                                t_start + duration, rng)
+    return _process_event_schedule(times, t_start, t_unit, event_generator,
+                                   args, kwargs)
+
+
+def _entity_event_schedule(task):
+    """Generate the event schedule of a single entity"""
+    process, process_args, event_generator, entity, args, kwargs, seed = task
+    if seed is not None:
+        kwargs = dict(kwargs, seed=seed)
+    return process(*(tuple(process_args) +
+                     (functools.partial(event_generator, entity),) +
+                     tuple(args)),
+                   **kwargs)
+
+
+def parallel_event_schedule(entities, process, process_args, event_generator,
+                            args=(), kwargs=None, seed=None, processes=None):
+    """Return a schedule merging the events of independent processes, one per
+    entity (e.g. one per node or per link), generated in parallel.
+
+    The event schedule of each entity is generated by a pool of worker
+    processes with an independent random seed spawned from *seed*. Schedules
+    are then merged with a single k-way merge, without sorting all events.
+
+    Parameters
+    ----------
+    entities : list
+        The entities, e.g. nodes or links
+    process : callable
+        The function generating the schedule of each entity, e.g.
+        :func:`poisson_process_event_schedule`. It must accept a *seed*
+        keyworded argument, except for
+        :func:`deterministic_process_event_schedule`, which does not receive
+        any seed, so that a *seed* in *kwargs* is passed to event_generator
+    process_args : tuple
+        The arguments of *process* preceding the event generator, e.g.
+        (avg_interval, t_start, duration, t_unit) for
+        :func:`poisson_process_event_schedule`
+    event_generator : callable
+        A function that when called returns an event, i.e. a dictionary of
+        event properties. It is called with the entity as first argument,
+        followed by *args* and *kwargs*. It must be defined at the top level
+        of a module, so that it can be sent to worker processes
+    args : tuple, optional
+        Non-keyworded arguments for event_generator function
+    kwargs : dict, optional
+        Keyworded arguments for *process* and event_generator function, such
+        as *batch*
+    seed : int, optional
+        The seed from which the seeds of the processes of all entities are
+        spawned. If not given, it is drawn from the random module
+    processes : int, optional
+        The number of worker processes. If None, as many processes as the
+        number of CPUs are used. If 1, schedules are generated in the calling
+        process
+
+    Returns
+    -------
+    event_schedule : EventSchedule
+        An EventSchedule object with the events of all entities. Events with
+        the same time are sorted in the order of the entities
+
+    Examples
+    --------
+    >>> import fnss
+    >>> def link_failure(link):
+    ...     return {'link': link, 'action': 'down'}
+    ...
+    >>> topology = fnss.ring_topology(100)
+    >>> links = list(topology.edges())
+    >>> schedule = fnss.parallel_event_schedule(
+    ...                 links, fnss.poisson_process_event_schedule,
+    ...                 (3600, 0, 7 * 24 * 3600, 's'), link_failure, seed=1)
+    """
+    entities = list(entities)
+    if not entities:
+        raise ValueError('At least one entity must be provided')
+    if kwargs is None:
+        kwargs = {}
+    if seed is None:
+        seed = random.getrandbits(64)
+    if process is deterministic_process_event_schedule:
+        seeds = [None] * len(entities)
+    else:
+        seeds = np.random.SeedSequence(seed).spawn(len(entities))
+    tasks = [(process, process_args, event_generator, entity, args, kwargs,
+              entity_seed) for entity, entity_seed in zip(entities, seeds)]
+    if processes is None:
+        try:
+            processes = mp.cpu_count()
+        except NotImplementedError:
+            processes = 1
+    processes = max(1, min(processes, len(tasks)))
+    if processes == 1:
+        schedules = [_entity_event_schedule(task) for task in tasks]
+    else:
+        pool = mp.Pool(processes)
+        try:
+            schedules = pool.map(_entity_event_schedule, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    event_schedule = EventSchedule(t_start=schedules[0].attrib['t_start'],
+                                   t_unit=schedules[0].attrib['t_unit'])
+    event_schedule.merge(*schedules)
+    return event_schedule
+
+
+def deterministic_process_event_stream(interval, t_start, duration, t_unit,
+                                       event_generator, *args, **kwargs):
+    """Return a generator of events separated by a fixed time interval
+
+    This function generates the same events as
+    :func:`deterministic_process_event_schedule` but lazily, in chunks of
+    limited size, so that memory usage does not depend on the duration of the
+    schedule.
+
+    Parameters
+    ----------
+    interval : float
+        The fixed time interval between subsequent events
+    t_start : float
+        The time at which the schedule starts
+    duration : float
+        The duration of the event schedule
+    t_unit: string
+        The unit in which time values are expressed (e.g. 'ms', 's')
+    event_generator : function
+        A function that when called returns an event, i.e. a dictionary of
+        event properties. If *batch* is True, it is called once per chunk with
+        the number of events of the chunk as first argument and it must
+        return a list of events
+    window : float, optional
+        Keyworded argument specifying the duration of the time windows in
+        which events are grouped. It is not passed to event_generator
+    batch : bool, optional
+        Keyworded argument specifying whether event_generator returns a single
+        event or a batch of events. It is not passed to event_generator
+    *args : argument list
+        List of non-keyworded arguments for event_generator function
+    **kwargs : keyworded argument list
+        List of keyworded arguments for event_generator function
+
+    Returns
+    -------
+    stream : generator
+        If *window* is None, a generator of (time, event) tuples, otherwise a
+        generator of EventSchedule objects, one for each consecutive time
+        window of the given duration, including windows without events
+    """
+    window = kwargs.pop('window', None)
+    t_end = t_start + duration
+    times = _deterministic_arrival_times(interval, t_start, t_end)
+    chunks = _event_chunks(times, event_generator, args, kwargs)
+    return _process_event_stream(chunks, t_start, t_end, t_unit, window)
+
+
+def poisson_process_event_stream(avg_interval, t_start, duration, t_unit,
+                                 event_generator, *args, **kwargs):
+    """Return a generator of Poisson-distributed events
+
+    This function generates the same events as
+    :func:`poisson_process_event_schedule` but lazily, in chunks of limited
+    size, so that memory usage does not depend on the duration of the
+    schedule.
+
+    Parameters
+    ----------
+    avg_interval : float
+        The average time interval between subsequent events
+    t_start : float
+        The time at which the schedule starts
+    duration : float
+        The duration of the event schedule
+    t_unit : string
+        The unit in which time values are expressed (e.g. 'ms', 's')
+    event_generator : callable
+        A function that when called returns an event, i.e. a dictionary of
+        event properties. If *batch* is True, it is called once per chunk with
+        the number of events of the chunk as first argument and it must
+        return a list of events
+    window : float, optional
+        Keyworded argument specifying the duration of the time windows in
+        which events are grouped. It is not passed to event_generator
+    seed : int, optional
+        Keyworded argument specifying the seed of the random generator of
+        inter-arrival times. If not given, the seed is drawn from the random
+        module, so that schedules can be reproduced with random.seed. It is
+        not passed to event_generator
+    batch : bool, optional
+        Keyworded argument specifying whether event_generator returns a single
+        event or a batch of events. It is not passed to event_generator
+    *args : argument list
+        List of non-keyworded arguments for event_generator function
+    **kwargs : keyworded argument list
+        List of keyworded arguments for event_generator function
+
+    Returns
+    -------
+    stream : generator
+        If *window* is None, a generator of (time, event) tuples, otherwise a
+        generator of EventSchedule objects, one for each consecutive time
+        window of the given duration, including windows without events
+
+    Examples
+    --------
+    >>> import fnss
+    >>> def failure(links):
+    ...     return {'link': links[0], 'action': 'down'}
+    ...
+    >>> stream = fnss.poisson_process_event_stream(10, 0, 7 * 24 * 3600, 's',
+    ...                                            failure, [(1, 2)],
+    ...                                            window=3600, seed=1)
+    >>> for window in stream:
+    ...     pass  # feed events of each hour to the simulator
+    """
+    window = kwargs.pop('window', None)
+    rng = _random_generator(kwargs.pop('seed', None))
+    t_end = t_start + duration
+    times = _poisson_arrival_times(avg_interval, t_start, t_end, rng)
+    chunks = _event_chunks(times, event_generator, args, kwargs)
+    return _process_event_stream(chunks, t_start, t_end, t_unit, window)
+
+
+def merge_event_streams(*streams):
+    """Lazily merge several streams of events, preserving chronological order
+
+    Parameters
+    ----------
+    *streams : iterables
+        Streams of chronologically sorted (time, event) tuples, such as those
+        returned by :func:`poisson_process_event_stream` or
+        :func:`deterministic_process_event_stream` or EventSchedule objects.
+        All times must be expressed in the same unit
+
+    Returns
+    -------
+    stream : generator
+        A generator of (time, event) tuples. Events with the same time are
+        yielded in the order of the streams passed as arguments
+
+    Examples
+    --------
+    >>> import fnss
+    >>> failures = fnss.poisson_process_event_stream(
+    ...                 60, 0, 3600, 's', lambda: {'action': 'down'}, seed=1)
+    >>> restores = fnss.poisson_process_event_stream(
+    ...                 60, 0, 3600, 's', lambda: {'action': 'up'}, seed=2)
+    >>> for time, event in fnss.merge_event_streams(failures, restores):
+    ...     pass
+    """
+    for time, _, _, event in heapq.merge(*[_decorate_events(i, stream)
+                                           for i, stream
+                                           in enumerate(streams)]):
+        yield time, event
+
+
+def _iterparse_event_schedule(path, attrib):
+    """Iterate over the events of an XML event schedule file parsing it
+    incrementally. The properties of the schedule are stored in the attrib
+    dictionary as they are parsed."""
+    context = ET.iterparse(path, events=('start', 'end'))
+    _, head = next(context)
+    depth = 0
+    for action, element in context:
+        if action == 'start':
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 0:
+            continue
+        if element.tag == 'property':
+            name = element.attrib['name']
+            attrib[name] = util.xml_cast_type(element.attrib['type'],
+                                              element.text)
+        elif element.tag == 'event':
+            event_prop = {}
+            for prop in element.findall('property'):
+                name = prop.attrib['name']
+                value = util.xml_cast_type(prop.attrib['type'], prop.text)
+                event_prop[name] = value
+            yield float(element.attrib['time']), event_prop
+        # discard parsed elements to keep memory usage constant
+        head.clear()
+
+
+def iter_event_schedule(path):
+    """Iterate over the events of an event schedule XML file without loading
+    the whole file in memory
+
+    Parameters
+    ----------
+    path : str
+        The path to the event schedule XML file
+
+    Returns
+    -------
+    events : generator
+        A generator of (time, event) tuples, in the order in which they appear
+        in the file
+    """
+    return _iterparse_event_schedule(path, {})
+
+
+def read_event_schedule(path):
+    """Read event schedule from an XML file
+
+    Parameters
+    ----------
+    path : str
+        The path to the event schedule XML file
+
+    Returns
+    -------
+    event_schedule : EventSchedule
+        The parsed event schedule
+    """
+    event_schedule = EventSchedule()
+    attrib = {}
+    times = []
+    events = []
+    for time, event in _iterparse_event_schedule(path, attrib):
+        times.append(time)
+        events.append(event)
+    event_schedule.attrib.update(attrib)
+    # t_end is set to the time of the latest event
+    event_schedule.attrib['t_end'] = 0
+    event_schedule.add_many(times, events)
+    return event_schedule
+
+
+def write_event_schedule(event_schedule, path,
+                         encoding='utf-8', prettyprint=True):
+    """Write an event schedule object to an XML file.
+
+    Parameters
+    ----------
+    event_schedule : EventSchedule
+        The event schedule to write
+    path : str
+        The path of the output XML file
+    encoding : str, optional
+        The desired encoding of the output file
     prettyprint : bool, optional
         Specify whether the XML file should be written with indentation for
         improved human readability
@@ -378,3 +1597,647 @@ def write_event_schedule(event_schedule, path,
     if prettyprint:
         util.xml_indent(head)
     ET.ElementTree(head).write(path, encoding=encoding)
+
+
+# Header of event schedule binary files, followed by the format version
+_BINARY_MAGIC = b'FNSSES'
+_BINARY_VERSION = 2
+
+# Structure of the header of an event record: time and length of properties
+_BINARY_RECORD = struct.Struct('<dI')
+
+# Structure of the length of the schedule attributes
+_BINARY_LENGTH = struct.Struct('<I')
+
+# Encoder of the JSON documents of binary files
+_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+
+def _encode_properties(props):
+    """Encode a dictionary of event or schedule properties as a JSON object,
+    so that it can be decoded without unpickling or evaluating any code"""
+    return _JSON_ENCODER.encode(
+        {str(name): util._to_json(value) for name, value in props.items()}
+    ).encode('utf-8')
+
+
+def _decode_properties(data):
+    """Decode a dictionary of properties encoded by
+    :func:`_encode_properties`"""
+    return _properties_from_json(json.loads(data.decode('utf-8')))
+
+
+def _properties_from_json(props):
+    """Convert in place the values of a decoded JSON object of properties
+    back to the values encoded by :func:`_encode_properties`"""
+    for name, value in props.items():
+        if type(value) is list:
+            props[name] = util._from_json(value)
+    return props
+
+
+class EventScheduleWriter(object):
+    """Class writing an event schedule to a binary file one event at a time.
+
+    Events must be written in chronological order, so that files can be read
+    without sorting events and schedules of any length can be written without
+    holding them in memory.
+
+    Files are composed of a header with the attributes of the schedule
+    followed by one record per event. Each record is made of the time of the
+    event (a little-endian double), the length of the event properties (a
+    little-endian unsigned int) and the event properties encoded as a JSON
+    object. Strings, numbers, booleans and None are stored as JSON values,
+    while values of any other type are stored as [type, value] pairs, using
+    the type names of XML files. Tuples, lists and dictionaries, e.g. the
+    tuples identifying links, are stored with their items converted
+    recursively and other values with their text representation. Property
+    names are stored as strings and files are read without unpickling or
+    evaluating any code.
+
+    Parameters
+    ----------
+    path : str
+        The path of the output file
+    t_start : float, optional
+        Time at which the event schedule starts
+    t_unit : str, optional
+        The unit of time
+    attrib : dict, optional
+        Further attributes of the event schedule
+
+    Examples
+    --------
+    >>> import fnss
+    >>> stream = fnss.poisson_process_event_stream(10, 0, 10 ** 6, 's',
+    ...                                            dict, seed=1)
+    >>> with fnss.EventScheduleWriter('events.bin', t_unit='s') as writer:
+    ...     writer.write_many(stream)
+    """
+
+    def __init__(self, path, t_start=0, t_unit='ms', attrib=None):
+        """Open the file and write the header"""
+        if t_unit not in time_units:
+            raise ValueError("The t_unit argument is not valid")
+        header = dict(attrib) if attrib is not None else {}
+        header['t_start'] = t_start
+        header['t_unit'] = t_unit
+        header.pop('t_end', None)
+        self._last_time = float('-inf')
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(_BINARY_MAGIC + struct.pack('<H', _BINARY_VERSION))
+        data = _encode_properties(header)
+        self._file.write(_BINARY_LENGTH.pack(len(data)) + data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, time, event):
+        """Write an event
+
+        Parameters
+        ----------
+        time : float
+            The time at which the event takes place. It must not be lower than
+            the time of the previous event
+        event : dict
+            The properties of the event
+        """
+        if time < self._last_time:
+            raise ValueError('Events must be written in chronological order')
+        self._last_time = time
+        data = _encode_properties(event)
+        self._file.write(_BINARY_RECORD.pack(time, len(data)) + data)
+
+    def write_many(self, events):
+        """Write several events
+
+        Parameters
+        ----------
+        events : iterable
+            An iterable of chronologically sorted (time, event) tuples, such
+            as an EventSchedule or an event stream
+        """
+        for time, event in events:
+            self.write(time, event)
+
+    def close(self):
+        """Close the file"""
+        self._file.close()
+
+
+def write_event_schedule_binary(event_schedule, path):
+    """Write an event schedule to a binary file.
+
+    This format is much more compact and faster to read and write than XML.
+    See :class:`EventScheduleWriter` for a description of the format.
+
+    Parameters
+    ----------
+    event_schedule : EventSchedule or ColumnarEventSchedule
+        The event schedule to write
+    path : str
+        The path of the output file
+    """
+    attrib = event_schedule.attrib
+    with EventScheduleWriter(path, attrib['t_start'], attrib['t_unit'],
+                             attrib) as writer:
+        writer.write_many(event_schedule)
+
+
+def _read_binary_header(f):
+    """Read the header of an event schedule binary file and return the
+    attributes of the schedule"""
+    magic = f.read(len(_BINARY_MAGIC) + 2)
+    if magic[:len(_BINARY_MAGIC)] != _BINARY_MAGIC:
+        raise ValueError('The file is not an event schedule binary file')
+    version, = struct.unpack('<H', magic[len(_BINARY_MAGIC):])
+    if version != _BINARY_VERSION:
+        raise ValueError('Unsupported event schedule file version %d'
+                         % version)
+    length, = _BINARY_LENGTH.unpack(f.read(_BINARY_LENGTH.size))
+    return _decode_properties(f.read(length))
+
+
+def iter_event_schedule_binary(path):
+    """Iterate over the events of an event schedule binary file without
+    loading the whole file in memory
+
+    Parameters
+    ----------
+    path : str
+        The path to the event schedule binary file
+
+    Returns
+    -------
+    events : generator
+        A generator of chronologically sorted (time, event) tuples
+    """
+    with open(path, 'rb') as f:
+        _read_binary_header(f)
+        while True:
+            record = f.read(_BINARY_RECORD.size)
+            if not record:
+                return
+            time, length = _BINARY_RECORD.unpack(record)
+            yield time, _decode_properties(f.read(length))
+
+
+def read_event_schedule_binary(path):
+    """Read an event schedule from a binary file.
+
+    Since events are stored in chronological order, they are loaded without
+    sorting them.
+
+    Parameters
+    ----------
+    path : str
+        The path to the event schedule binary file
+
+    Returns
+    -------
+    event_schedule : EventSchedule
+        The event schedule
+    """
+    with open(path, 'rb') as f:
+        attrib = _read_binary_header(f)
+        data = f.read()
+    times = []
+    records = []
+    offset = 0
+    record_size = _BINARY_RECORD.size
+    unpack_from = _BINARY_RECORD.unpack_from
+    while offset < len(data):
+        time, length = unpack_from(data, offset)
+        offset += record_size
+        times.append(time)
+        records.append(data[offset:offset + length])
+        offset += length
+    # Decoding all events as a single JSON array is much faster than
+    # decoding them one at a time
+    props = json.loads((b'[' + b','.join(records) + b']').decode('utf-8'))
+    events = [(time, _properties_from_json(event))
+              for time, event in zip(times, props)]
+    event_schedule = EventSchedule(t_start=attrib['t_start'],
+                                   t_unit=attrib['t_unit'])
+    event_schedule.attrib.update(attrib)
+    event_schedule.event = events
+    event_schedule.attrib['t_end'] = events[-1][0] if events \
+                                     else attrib['t_start']
+    return event_schedule
+
+
+def _event_nodes(event):
+    """Return the nodes involved in an event, from its node or link property.
+    Return None if the event does not involve specific nodes"""
+    if 'node' in event:
+        return (event['node'],)
+    if 'link' in event:
+        return event['link']
+    return None
+
+
+def shard_event_schedule(event_schedule, partition, window=None, lookahead=0,
+                         event_nodes=None, path=None):
+    """Split an event schedule into shards, one per partition of nodes and
+    time window, for use by parallel discrete-event simulators, where each
+    process (e.g. MPI rank) simulates a partition of nodes.
+
+    Events are assigned to the partitions of the nodes they involve (e.g. an
+    event of a link whose endpoints belong to two partitions is assigned to
+    both) and to the time window they fall into. Events involving no specific
+    node are assigned to all partitions. All shards are built in a single
+    pass over the schedule.
+
+    Parameters
+    ----------
+    event_schedule : EventSchedule
+        The event schedule to split
+    partition : dict
+        The partition of each node, keyed by node
+    window : float, optional
+        The duration of time windows. If None, the schedule is only split by
+        partition
+    lookahead : float, optional
+        If positive, each shard also includes the events scheduled within
+        this time after the end of its window, which also belong to the
+        following window(s). Simulators should execute only the events of a
+        shard scheduled before its *window_end* attribute and use the others
+        for look-ahead
+    event_nodes : callable, optional
+        A function returning the nodes involved in an event given its
+        properties, or None if the event involves no specific node. If None,
+        the nodes are the *node* property or the endpoints of the *link*
+        property of the event
+    path : str, optional
+        If given, shards are written as binary files (see
+        :class:`EventScheduleWriter`) in this directory, which is created if
+        it does not exist, instead of being returned as EventSchedule
+        objects. Each file is written as soon as the window it refers to has
+        ended, so that only few files are open at any time
+
+    Returns
+    -------
+    shards : dict
+        The shards, keyed by (partition, window index) tuple. Each value is an
+        EventSchedule or, if *path* is given, the path of the binary file.
+        Empty shards are included
+
+    Examples
+    --------
+    >>> import fnss
+    >>> schedule = fnss.EventSchedule(t_unit='s')
+    >>> schedule.add_many([1, 15, 25], [{'action': 'down', 'link': (1, 2)},
+    ...                                 {'action': 'up', 'link': (1, 2)},
+    ...                                 {'action': 'down', 'link': (2, 3)}])
+    >>> shards = fnss.shard_event_schedule(schedule, {1: 0, 2: 0, 3: 1},
+    ...                                    window=10)
+    >>> len(shards[(1, 2)])
+    1
+    """
+    if window is not None and window <= 0:
+        raise ValueError('window must be positive')
+    if lookahead < 0:
+        raise ValueError('lookahead must not be negative')
+    if event_nodes is None:
+        event_nodes = _event_nodes
+    t_start = event_schedule.attrib['t_start']
+    t_unit = event_schedule.attrib['t_unit']
+    partitions = sorted(set(partition.values()), key=str)
+    if path is not None and not os.path.exists(path):
+        os.makedirs(path)
+
+    def window_bounds(k):
+        if window is None:
+            return t_start, event_schedule.attrib['t_end']
+        return t_start + k * window, t_start + (k + 1) * window
+
+    def new_shard(p, k):
+        w_start, w_end = window_bounds(k)
+        attrib = dict(event_schedule.attrib, t_start=w_start, t_end=w_end,
+                      partition=p, window=k, window_end=w_end)
+        if path is None:
+            shard = EventSchedule(t_start=w_start, t_unit=t_unit)
+            shard.attrib.update(attrib)
+            return shard
+        shard_path = os.path.join(path, 'events-%s-%05d.bin' % (str(p), k))
+        return EventScheduleWriter(shard_path, w_start, t_unit, attrib)
+
+    shards = {}
+    open_shards = {}
+    n_windows = 1
+    for time, event in event_schedule:
+        if window is None:
+            k_min = k_max = 0
+        else:
+            k_max = max(0, int(np.floor((time - t_start) / window)))
+            k_min = max(0, int(np.floor((time - t_start - lookahead)
+                                        / window)))
+            n_windows = max(n_windows, k_max + 1)
+            if path is not None:
+                # close the files of the windows whose look-ahead has ended
+                for key in [key for key in open_shards if key[1] < k_min]:
+                    open_shards.pop(key).close()
+        nodes = event_nodes(event)
+        if nodes is None:
+            event_partitions = partitions
+        else:
+            event_partitions = set(partition[v] for v in nodes)
+        for p in event_partitions:
+            for k in range(k_min, k_max + 1):
+                if (p, k) not in open_shards:
+                    if (p, k) in shards:
+                        raise ValueError('The event schedule is not sorted')
+                    open_shards[(p, k)] = new_shard(p, k)
+                    shards[(p, k)] = open_shards[(p, k)] if path is None \
+                                     else open_shards[(p, k)].path
+                shard = open_shards[(p, k)]
+                if path is None:
+                    shard.event.append((time, event))
+                else:
+                    shard.write(time, event)
+    if window is not None:
+        n_windows = max(n_windows, int(np.ceil(
+                            (event_schedule.attrib['t_end'] - t_start)
+                            / float(window))))
+    for p in partitions:
+        for k in range(n_windows):
+            if (p, k) not in shards:
+                shard = new_shard(p, k)
+                if path is None:
+                    shards[(p, k)] = shard
+                else:
+                    shard.close()
+                    shards[(p, k)] = shard.path
+    if path is not None:
+        for shard in open_shards.values():
+            shard.close()
+    return shards
+
+
+class TopologyChangeSet(object):
+    """Class representing the net changes applied to a topology by a batch of
+    simultaneous events replayed by an :class:`EventReplayer`.
+
+    Links removed and then restored within the same batch (or vice versa) are
+    not reported as removed or added but as updated if their attributes
+    changed.
+
+    Attributes
+    ----------
+    time : float
+        The time of the events
+    events : list
+        The properties of the events of the batch
+    removed_links : set
+        The links removed from the topology
+    added_links : set
+        The links added to the topology
+    updated_links : dict
+        The names of the attributes updated on links, keyed by link
+    """
+
+    def __init__(self, time):
+        """Initialize the change set"""
+        self.time = time
+        self.events = []
+        self.removed_links = set()
+        self.added_links = set()
+        self.updated_links = {}
+
+    def __len__(self):
+        """Return the number of links changed"""
+        return len(self.removed_links) + len(self.added_links) + \
+               len(self.updated_links)
+
+    def remove_link(self, u, v):
+        """Record the removal of a link
+
+        Parameters
+        ----------
+        u : any hashable type
+            Link endpoint
+        v : any hashable type
+            Link endpoint
+        """
+        if (u, v) in self.added_links:
+            self.added_links.remove((u, v))
+        else:
+            self.removed_links.add((u, v))
+        self.updated_links.pop((u, v), None)
+
+    def add_link(self, u, v):
+        """Record the addition of a link
+
+        Parameters
+        ----------
+        u : any hashable type
+            Link endpoint
+        v : any hashable type
+            Link endpoint
+        """
+        if (u, v) in self.removed_links:
+            # the link was restored, its attributes may have changed
+            self.removed_links.remove((u, v))
+            self.updated_links.setdefault((u, v), set())
+        else:
+            self.added_links.add((u, v))
+
+    def update_link(self, u, v, attr):
+        """Record the update of a link attribute
+
+        Parameters
+        ----------
+        u : any hashable type
+            Link endpoint
+        v : any hashable type
+            Link endpoint
+        attr : str
+            The name of the attribute
+        """
+        if (u, v) not in self.added_links and (u, v) not in self.removed_links:
+            self.updated_links.setdefault((u, v), set()).add(attr)
+
+
+class EventReplayer(object):
+    """Class replaying an event schedule on a topology.
+
+    Events are applied in chronological order to the topology, which is
+    modified in place, by handlers selected according to the value of the
+    *action* property of each event. Simultaneous events are applied in a
+    single batch, after which all registered callbacks are invoked with the
+    net changes applied to the topology, so that consumers can update their
+    state (e.g. routing) incrementally.
+
+    The following actions are handled by default:
+
+    * *down*: the link *link* is removed from the topology. Its attributes
+      are stored so that they are restored when the link goes up
+    * *up*: the link *link* is restored
+    * *capacity*: the capacity of link *link* is set to *capacity*, expressed
+      in *capacity_unit* if provided or in the capacity unit of the topology
+      otherwise
+
+    Links are reported in change sets as oriented in events, except links of
+    undirected topologies restored or updated while down, which are reported
+    as oriented when they were removed.
+
+    Parameters
+    ----------
+    topology : Topology or DirectedTopology
+        The topology on which events are applied
+    event_schedule : iterable
+        The events to replay, as chronologically sorted (time, event) tuples,
+        e.g. an EventSchedule, a ColumnarEventSchedule or an event stream
+    action_key : str, optional
+        The name of the event property used to select handlers
+
+    Examples
+    --------
+    >>> import fnss
+    >>> topology = fnss.ring_topology(10)
+    >>> schedule = fnss.EventSchedule(t_unit='s')
+    >>> schedule.add_many([1, 2, 2], [{'action': 'down', 'link': (0, 1)},
+    ...                               {'action': 'down', 'link': (5, 6)},
+    ...                               {'action': 'up', 'link': (0, 1)}])
+    >>> replayer = fnss.EventReplayer(topology, schedule)
+    >>> removed = []
+    >>> replayer.add_callback(lambda topology, changes:
+    ...                       removed.append(sorted(changes.removed_links)))
+    >>> replayer.run()
+    2
+    >>> removed
+    [[(0, 1)], [(5, 6)]]
+    """
+
+    def __init__(self, topology, event_schedule, action_key='action'):
+        """Initialize the replayer"""
+        self.topology = topology
+        self.action_key = action_key
+        self.handlers = {'down': self._link_down,
+                         'up': self._link_up,
+                         'capacity': self._link_capacity}
+        self.callbacks = []
+        # attributes of links currently down, keyed by link
+        self.failed_links = {}
+        self._events = iter(event_schedule)
+
+    def register_handler(self, action, handler):
+        """Register the handler of an action, replacing any handler already
+        registered for the same action
+
+        Parameters
+        ----------
+        action : any hashable type
+            The value of the action property of the events handled
+        handler : callable
+            A function called as handler(topology, event, changes) that
+            applies the event to the topology and records the changes applied
+            in the TopologyChangeSet changes
+        """
+        self.handlers[action] = handler
+
+    def add_callback(self, callback):
+        """Add a callback invoked after applying each batch of simultaneous
+        events
+
+        Parameters
+        ----------
+        callback : callable
+            A function called as callback(topology, changes), where changes
+            is a TopologyChangeSet
+        """
+        self.callbacks.append(callback)
+
+    def _link(self, event):
+        """Return the link of an event. If the topology is undirected and the
+        link is down, it is oriented as when it was removed"""
+        u, v = event['link']
+        if not self.topology.is_directed() and \
+                (u, v) not in self.failed_links and (v, u) in self.failed_links:
+            return v, u
+        return u, v
+
+    def _link_down(self, topology, event, changes):
+        u, v = self._link(event)
+        if not topology.has_edge(u, v):
+            return
+        self.failed_links[(u, v)] = topology.adj[u][v].copy()
+        topology.remove_edge(u, v)
+        changes.remove_link(u, v)
+
+    def _link_up(self, topology, event, changes):
+        u, v = self._link(event)
+        if topology.has_edge(u, v):
+            return
+        topology.add_edge(u, v, **self.failed_links.pop((u, v), {}))
+        changes.add_link(u, v)
+
+    def _link_capacity(self, topology, event, changes):
+        u, v = self._link(event)
+        capacity = event['capacity']
+        if 'capacity_unit' in event:
+            capacity *= float(capacity_units[event['capacity_unit']]) \
+                        / capacity_units[topology.graph['capacity_unit']]
+        if topology.has_edge(u, v):
+            topology.adj[u][v]['capacity'] = capacity
+            changes.update_link(u, v, 'capacity')
+        elif (u, v) in self.failed_links:
+            self.failed_links[(u, v)]['capacity'] = capacity
+        else:
+            raise ValueError('Link (%s, %s) does not exist'
+                             % (str(u), str(v)))
+
+    def _apply(self, changes, event):
+        """Apply an event to the topology"""
+        action = event.get(self.action_key)
+        try:
+            handler = self.handlers[action]
+        except KeyError:
+            raise ValueError('No handler registered for action %s'
+                             % str(action))
+        handler(self.topology, event, changes)
+        changes.events.append(event)
+
+    def replay(self):
+        """Replay the events, one batch of simultaneous events at a time
+
+        Returns
+        -------
+        changes : generator
+            A generator yielding, after applying each batch of events and
+            invoking callbacks, the TopologyChangeSet of the batch
+        """
+        changes = None
+        for time, event in self._events:
+            if changes is not None and time != changes.time:
+                self._notify(changes)
+                yield changes
+                changes = None
+            if changes is None:
+                changes = TopologyChangeSet(time)
+            self._apply(changes, event)
+        if changes is not None:
+            self._notify(changes)
+            yield changes
+
+    def _notify(self, changes):
+        for callback in self.callbacks:
+            callback(self.topology, changes)
+
+    def run(self):
+        """Replay all events
+
+        Returns
+        -------
+        batches : int
+            The number of batches of simultaneous events replayed
+        """
+        batches = 0
+        for _ in self.replay():
+            batches += 1
+        return batches
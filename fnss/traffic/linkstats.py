@@ -0,0 +1,361 @@
+"""Functions and classes for computing link utilization statistics over
+sequences of traffic matrices.
+
+Statistics are computed in a streaming fashion: traffic matrices are consumed
+one at a time, so that statistics can be computed over very long sequences
+(e.g. lazily generated) without storing all matrices or all link loads in
+memory. Percentiles are estimated with a logarithmic histogram sketch with
+bounded relative error (see [1]_), which can be merged with other sketches, for
+example computed by other worker processes.
+
+References
+----------
+.. [1] C. Masson, J. E. Rim and H. K. Lee, DDSketch: a fast and fully-mergeable
+   quantile sketch with relative-error guarantees, Proceedings of the VLDB
+   Endowment, 12(12), 2019
+"""
+from math import ceil, log
+
+import numpy as np
+
+from fnss.units import capacity_units
+from fnss.topologies.routing import _shortest_paths
+from fnss.topologies.topology import _link_capacities
+
+
+__all__ = [
+    'LinkLoadStatistics',
+    'link_load_statistics',
+           ]
+
+
+class LinkLoadStatistics(object):
+    """
+    Class accumulating per-link utilization statistics over a sequence of
+    traffic matrices.
+
+    For each link, it keeps track of the mean, standard deviation, minimum and
+    maximum utilization and of a sketch of the distribution of utilization
+    values from which percentiles can be estimated.
+
+    All statistics are stored in NumPy arrays indexed by link. The order of
+    links is given by the *links* attribute.
+
+    Parameters
+    ----------
+    topology : Topology, DirectedTopology or FrozenTopology
+        The topology. It must be annotated with link capacities. If it is
+        undirected, all links are assumed to be full-duplex
+    routing_matrix : dict of dicts, optional
+        The routing matrix used by the traffic, in the same format accepted by
+        :func:`fnss.traffic.trafficmatrices.link_loads`. If None, shortest
+        paths are used
+    relative_accuracy : float, optional
+        The relative accuracy of the estimated percentiles
+    min_utilization : float, optional
+        The minimum utilization value tracked by the sketch. Percentiles below
+        this value are estimated as 0
+    max_utilization : float, optional
+        The maximum utilization value tracked by the sketch. Percentiles above
+        this value are estimated as the maximum utilization observed
+    """
+
+    def __init__(self, topology, routing_matrix=None, relative_accuracy=0.01,
+                 min_utilization=1e-6, max_utilization=100.0):
+        """Initialize the statistics"""
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('relative_accuracy must be in (0, 1)')
+        if not 0 < min_utilization < max_utilization:
+            raise ValueError('min_utilization must be positive and lower '
+                             'than max_utilization')
+        if 'capacity_unit' not in topology.graph:
+            raise ValueError('The topology must be annotated with capacities')
+        links, capacities = _link_capacities(topology)
+        self.links = links
+        self.link_index = {link: i for i, link in enumerate(links)}
+        self.count = 0
+        self.attrib = {'capacity_unit': topology.graph['capacity_unit'],
+                       'relative_accuracy': relative_accuracy,
+                       'min_utilization': min_utilization,
+                       'max_utilization': max_utilization}
+        self._capacity = capacities
+        self._topology = topology
+        self._routing_matrix = routing_matrix
+        # Map of OD pairs to the indices of the links they traverse, stored
+        # as an incidence list of (link, od) index pairs
+        self._od_index = {}
+        self._incidence_links = np.empty(0, dtype=np.intp)
+        self._incidence_ods = np.empty(0, dtype=np.intp)
+        n = len(links)
+        self._sum = np.zeros(n)
+        self._sum_squares = np.zeros(n)
+        self._min = np.full(n, np.inf)
+        self._max = np.full(n, -np.inf)
+        # Logarithmic sketch: bucket 0 collects values below min_utilization,
+        # bucket i > 0 collects values in (gamma^(i + k - 2), gamma^(i + k - 1)]
+        # where k = ceil(log_gamma(min_utilization))
+        self._log_gamma = log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self._bucket_offset = int(ceil(log(min_utilization) / self._log_gamma))
+        n_buckets = int(ceil(log(max_utilization) / self._log_gamma)) \
+                    - self._bucket_offset + 2
+        self._sketch = np.zeros((n, n_buckets), dtype=np.uint32)
+
+    def __len__(self):
+        """Return the number of traffic matrices accumulated"""
+        return self.count
+
+    def __getstate__(self):
+        # The topology and routing matrix are not pickled to make it cheap to
+        # send statistics computed by worker processes back to the parent
+        # process. Unpickled statistics can be merged and queried but cannot
+        # be updated with traffic matrices containing new OD pairs
+        state = self.__dict__.copy()
+        state['_topology'] = None
+        state['_routing_matrix'] = None
+        return state
+
+    def _register_od_pairs(self, od_pairs):
+        """Add OD pairs to the incidence list"""
+        if self._topology is None:
+            raise ValueError('Cannot add new OD pairs to unpickled statistics')
+        if self._routing_matrix is None:
+            self._routing_matrix = _shortest_paths(self._topology)
+        links = []
+        ods = []
+        for o, d in od_pairs:
+            od = len(self._od_index)
+            self._od_index[(o, d)] = od
+            try:
+                path = self._routing_matrix[o][d]
+            except KeyError:
+                raise ValueError('Cannot calculate link loads. There is no '
+                                 'route from node %s to node %s'
+                                 % (str(o), str(d)))
+            for u, v in zip(path[:-1], path[1:]):
+                links.append(self.link_index[(u, v)])
+                ods.append(od)
+        self._incidence_links = np.concatenate((self._incidence_links,
+                                                np.asarray(links, np.intp)))
+        self._incidence_ods = np.concatenate((self._incidence_ods,
+                                              np.asarray(ods, np.intp)))
+
+    def utilization(self, traffic_matrix):
+        """Return the utilization of all links given a traffic matrix
+
+        Parameters
+        ----------
+        traffic_matrix : TrafficMatrix
+            The traffic matrix
+
+        Returns
+        -------
+        utilization : numpy array
+            The utilization of each link, following the order of the *links*
+            attribute
+        """
+        flows = traffic_matrix.flows()
+        new_od_pairs = [od for od in flows if od not in self._od_index]
+        if new_od_pairs:
+            self._register_od_pairs(new_od_pairs)
+        volumes = np.zeros(len(self._od_index))
+        od_index = self._od_index
+        for od, volume in flows.items():
+            volumes[od_index[od]] = volume
+        loads = np.bincount(self._incidence_links,
+                            weights=volumes[self._incidence_ods],
+                            minlength=len(self.links))
+        norm_factor = float(capacity_units[
+                                traffic_matrix.attrib['volume_unit']]) \
+                      / capacity_units[self.attrib['capacity_unit']]
+        return norm_factor * loads / self._capacity
+
+    def update(self, traffic_matrix):
+        """Update the statistics with the link utilization caused by a traffic
+        matrix
+
+        Parameters
+        ----------
+        traffic_matrix : TrafficMatrix
+            The traffic matrix
+        """
+        self.update_utilization(self.utilization(traffic_matrix))
+
+    def update_from(self, traffic_matrices):
+        """Update the statistics with the link utilization caused by all
+        traffic matrices of a sequence
+
+        Parameters
+        ----------
+        traffic_matrices : iterable
+            A TrafficMatrixSequence or any iterable of TrafficMatrix objects,
+            such as a generator. Matrices are consumed one at a time
+        """
+        for traffic_matrix in traffic_matrices:
+            self.update(traffic_matrix)
+
+    def update_utilization(self, utilization):
+        """Update the statistics with an array of link utilizations
+
+        Parameters
+        ----------
+        utilization : numpy array
+            The utilization of each link, following the order of the *links*
+            attribute
+        """
+        utilization = np.asarray(utilization, dtype=np.float64)
+        if utilization.shape != self._sum.shape:
+            raise ValueError('The utilization array must have one value '
+                             'per link')
+        self.count += 1
+        self._sum += utilization
+        self._sum_squares += utilization ** 2
+        np.minimum(self._min, utilization, out=self._min)
+        np.maximum(self._max, utilization, out=self._max)
+        self._sketch[np.arange(len(utilization)),
+                     self._bucket(utilization)] += 1
+
+    def _bucket(self, values):
+        """Return the sketch buckets of an array of values"""
+        buckets = np.zeros(len(values), dtype=np.intp)
+        tracked = values >= self.attrib['min_utilization']
+        buckets[tracked] = np.ceil(np.log(values[tracked]) / self._log_gamma) \
+                           - self._bucket_offset + 1
+        return np.clip(buckets, 0, self._sketch.shape[1] - 1)
+
+    def merge(self, other):
+        """Merge the statistics accumulated by another object into this one
+
+        Parameters
+        ----------
+        other : LinkLoadStatistics
+            The statistics to merge. They must refer to the same links and
+            have the same sketch parameters
+        """
+        if other.links != self.links or other.attrib != self.attrib:
+            raise ValueError('Cannot merge statistics of different links or '
+                             'with different parameters')
+        self.count += other.count
+        self._sum += other._sum
+        self._sum_squares += other._sum_squares
+        np.minimum(self._min, other._min, out=self._min)
+        np.maximum(self._max, other._max, out=self._max)
+        self._sketch += other._sketch
+
+    def _check_not_empty(self):
+        if self.count == 0:
+            raise ValueError('No traffic matrix has been accumulated')
+
+    def _as_dict(self, values):
+        return dict(zip(self.links, values.tolist()))
+
+    def mean(self):
+        """Return the mean utilization of each link
+
+        Returns
+        -------
+        mean : dict
+            The mean utilization keyed by link
+        """
+        self._check_not_empty()
+        return self._as_dict(self._sum / self.count)
+
+    def std(self):
+        """Return the standard deviation of the utilization of each link
+
+        Returns
+        -------
+        std : dict
+            The standard deviation of utilization keyed by link
+        """
+        self._check_not_empty()
+        mean = self._sum / self.count
+        var = np.maximum(self._sum_squares / self.count - mean ** 2, 0)
+        return self._as_dict(np.sqrt(var))
+
+    def min(self):
+        """Return the minimum utilization of each link
+
+        Returns
+        -------
+        min : dict
+            The minimum utilization keyed by link
+        """
+        self._check_not_empty()
+        return self._as_dict(self._min)
+
+    def max(self):
+        """Return the maximum utilization of each link
+
+        Returns
+        -------
+        max : dict
+            The maximum utilization keyed by link
+        """
+        self._check_not_empty()
+        return self._as_dict(self._max)
+
+    def quantile(self, q):
+        """Return the estimated quantile of the utilization of each link
+
+        Parameters
+        ----------
+        q : float
+            The quantile, between 0 and 1 (e.g. 0.99 for the 99th percentile)
+
+        Returns
+        -------
+        quantile : dict
+            The estimated quantile keyed by link
+        """
+        if not 0 <= q <= 1:
+            raise ValueError('q must be between 0 and 1')
+        self._check_not_empty()
+        # Extreme quantiles are tracked exactly
+        if q == 0:
+            return self.min()
+        if q == 1:
+            return self.max()
+        rank = q * (self.count - 1)
+        buckets = (np.cumsum(self._sketch, axis=1) > rank).argmax(axis=1)
+        gamma = np.exp(self._log_gamma)
+        exponent = buckets + self._bucket_offset - 1
+        values = 2 * gamma ** exponent / (gamma + 1)
+        values[buckets == 0] = 0
+        return self._as_dict(np.clip(values, self._min, self._max))
+
+
+def link_load_statistics(topology, traffic_matrices, routing_matrix=None,
+                         **kwargs):
+    """Compute link utilization statistics over a sequence of traffic matrices
+
+    Parameters
+    ----------
+    topology : Topology or DirectedTopology
+        The topology. It must be annotated with link capacities
+    traffic_matrices : iterable
+        A TrafficMatrixSequence or any iterable of TrafficMatrix objects, such
+        as a generator. Matrices are consumed one at a time
+    routing_matrix : dict of dicts, optional
+        The routing matrix used by the traffic. If None, shortest paths are
+        used
+    **kwargs : keyworded arguments
+        Further arguments passed to the LinkLoadStatistics constructor
+
+    Returns
+    -------
+    stats : LinkLoadStatistics
+        The link utilization statistics
+
+    Examples
+    --------
+    >>> import fnss
+    >>> topology = fnss.ring_topology(5)
+    >>> fnss.set_capacities_constant(topology, 10, 'Mbps')
+    >>> tms = fnss.sin_cyclostationary_traffic_matrix(topology, 1, 0.2, 0.8,
+    ...                                               -0.33, n=24, periods=7)
+    >>> stats = fnss.link_load_statistics(topology, tms)
+    >>> p99 = stats.quantile(0.99)
+    """
+    stats = LinkLoadStatistics(topology, routing_matrix, **kwargs)
+    stats.update_from(traffic_matrices)
+    return stats
@@ -16,14 +16,20 @@ from math import exp, sin, pi, log, sqrt
 from collections import Counter
 import xml.etree.cElementTree as ET
 
+import numpy as np
 from numpy import isinf
-from numpy.random import lognormal, normal
+from numpy.random import normal
 import networkx as nx
 
 from fnss.units import capacity_units, time_units
 import fnss.util as util
-from fnss.topologies.topology import fan_in_out_capacities, \
+from fnss.topologies.topology import FrozenTopology, _link_capacities, \
+                                     _memoized, directed_view, \
+                                     fan_in_out_capacities, \
                                      od_pairs_from_topology
+from fnss.topologies.routing import _shortest_paths
+from fnss.traffic.eventscheduling import _random_generator
+from fnss.traffic.linkstats import LinkLoadStatistics
 
 
 __all__ = [
@@ -32,6 +38,7 @@ __all__ = [
     'static_traffic_matrix',
     'stationary_traffic_matrix',
     'sin_cyclostationary_traffic_matrix',
+    'sin_cyclostationary_traffic_matrix_generator',
     'read_traffic_matrix',
     'write_traffic_matrix',
     'validate_traffic_matrix',
@@ -380,6 +387,15 @@ def static_traffic_matrix(topology, mean, stddev, max_u=0.9,
        matrices: initial recommendations, ACM SIGCOMM Computer Communication
        Review, 35(3), 2005
     """
+    return _static_traffic_matrix(topology, mean, stddev, max_u, origin_nodes,
+                                  destination_nodes)
+
+
+def _static_traffic_matrix(topology, mean, stddev, max_u, origin_nodes,
+                           destination_nodes, rng=np.random):
+    """Return a static traffic matrix whose volumes are drawn from the given
+    random generator, by default the global NumPy random generator. See
+    :func:`static_traffic_matrix`"""
     try:
         mean = float(mean)
         stddev = float(stddev)
@@ -387,8 +403,7 @@ def static_traffic_matrix(topology, mean, stddev, max_u=0.9,
         raise ValueError('mean and stddev must be of type float')
     if mean < 0 or stddev < 0:
         raise ValueError('mean and stddev must be not negative')
-    topology = topology.copy() if topology.is_directed() \
-               else topology.to_directed()
+    topology = directed_view(topology)
     volume_unit = topology.graph['capacity_unit']
     mu = log(mean ** 2 / sqrt(stddev ** 2 + mean ** 2))
     sigma = sqrt(log((stddev ** 2 / mean ** 2) + 1))
@@ -400,7 +415,7 @@ def static_traffic_matrix(topology, mean, stddev, max_u=0.9,
         destinations = destination_nodes or all_nodes
         od_pairs = [(o, d) for o in origins for d in destinations if o != d]
     nr_pairs = len(od_pairs)
-    volumes = sorted(lognormal(mu, sigma, size=nr_pairs))
+    volumes = sorted(rng.lognormal(mu, sigma, size=nr_pairs))
     # volumes = sorted([lognormvariate(mu, sigma) for _ in range(nr_pairs)])
     if any(isinf(vol) for vol in volumes):
         raise ValueError('Some volumes are too large to be handled by a '\
@@ -410,30 +425,21 @@ def static_traffic_matrix(topology, mean, stddev, max_u=0.9,
     assignments = dict(zip(sorted_od_pairs, volumes))
     if max_u is not None:
         if origin_nodes is not None:
-            shortest_path = dict(
-                    (node, nx.single_source_dijkstra_path(topology,
-                                                          node,
-                                                          weight='weight'))
-                    for node in origin_nodes)
+            shortest_path = _shortest_paths(topology, sources=origin_nodes)
             # remove OD pairs not connected
             for o, d in itertools.product(shortest_path, destinations):
                 if o != d and d not in shortest_path[o]:
                     od_pairs.remove((o, d))
         else:
-            shortest_path = dict(nx.all_pairs_dijkstra_path(topology,
-                                                            weight='weight'))
-        for u, v in topology.edges():
-            topology.adj[u][v]['load'] = 0.0
+            shortest_path = _shortest_paths(topology)
         # Find max u
-        for o, d in od_pairs:
-            path = shortest_path[o][d]
-            if len(path) > 1:
-                for u, v in zip(path[:-1], path[1:]):
-                    topology.adj[u][v]['load'] += assignments[(o, d)]
+        links, capacities = _link_capacities(topology)
+        link_index = {link: i for i, link in enumerate(links)}
+        loads = __link_load_array(link_index,
+                                  ((o, d, assignments[(o, d)])
+                                   for o, d in od_pairs), shortest_path)
         # Calculate scaling
-        current_max_u = max((float(topology.adj[u][v]['load']) \
-                             / float(topology.adj[u][v]['capacity'])
-                             for u, v in topology.edges()))
+        current_max_u = (loads / capacities).max()
         norm_factor = max_u / current_max_u
         for od_pair in assignments:
             assignments[od_pair] *= norm_factor
@@ -517,19 +523,7 @@ def stationary_traffic_matrix(topology, mean, stddev, gamma, log_psi, n,
                                       destination_nodes=destination_nodes)
     volume_unit = static_tm.attrib['volume_unit']
     mean_dict = static_tm.flows()
-    psi = exp(log_psi)
-    if psi == 0.0:
-        raise ValueError("The value of log_psi provided is too small and "
-                         "causes psi=0.0, which makes the standard deviation "
-                         "of random fluctuation to become infinite. Try with "
-                         "a greater value of log_psi")
-    std_dict = {(o, d): (m / psi) ** (1.0 / gamma)
-                for (o, d), m in mean_dict.items()}
-    if any(isinf(std) for std in std_dict.values()):
-        raise ValueError("The value of log_psi or gamma provided are too "
-                         "small and causes the standard deviation of random "
-                         "fluctuations to become infinite. Try with a greater "
-                         "value of log_psi and/or gamma")
+    std_dict = __fluctuation_stddev(mean_dict, gamma, log_psi)
     flows = {}
     for o, d in mean_dict:
         # Implementation without Numpy:
@@ -545,14 +539,9 @@ def stationary_traffic_matrix(topology, mean, stddev, gamma, log_psi, n,
         tm_sequence.append(traffic_marix)
     if max_u is not None:
         if origin_nodes is not None:
-            shortest_path = dict(
-                    (node, nx.single_source_dijkstra_path(topology,
-                                                          node,
-                                                          weight='weight'))
-                    for node in origin_nodes)
+            shortest_path = _shortest_paths(topology, sources=origin_nodes)
         else:
-            shortest_path = dict(nx.all_pairs_dijkstra_path(topology,
-                                                            weight='weight'))
+            shortest_path = _shortest_paths(topology)
         current_max_u = max((max(link_loads(topology,
                                             tm_sequence.get(i),
                                             shortest_path
@@ -657,20 +646,7 @@ def sin_cyclostationary_traffic_matrix(topology, mean, stddev, gamma, log_psi,
                                       destination_nodes=destination_nodes)
     volume_unit = static_tm.attrib['volume_unit']
     mean_dict = static_tm.flows()
-    psi = exp(log_psi)
-    if psi == 0.0:
-        raise ValueError("The value of log_psi provided is too small and "
-                         "causes psi=0.0, which makes the standard deviation "
-                         "of random fluctuation to become infinite. Try with "
-                         "a greater value of log_psi")
-    std_dict = {(o, d): (m / psi) ** (1.0 / gamma)
-                for (o, d), m in mean_dict.items()}
-    print(std_dict.values())
-    if any(isinf(std) for std in std_dict.values()):
-        raise ValueError("The value of log_psi or gamma provided are too "
-                         "small and causes the standard deviation of random "
-                         "fluctuations to become infinite. Try with a greater "
-                         "value of log_psi and/or gamma")
+    std_dict = __fluctuation_stddev(mean_dict, gamma, log_psi)
     od_pairs = static_tm.od_pairs()
     for _ in range(periods):
         for i in range(n):
@@ -685,14 +661,9 @@ def sin_cyclostationary_traffic_matrix(topology, mean, stddev, gamma, log_psi,
 
     if max_u is not None:
         if origin_nodes is not None:
-            shortest_path = dict(
-                    (node, nx.single_source_dijkstra_path(topology,
-                                                          node,
-                                                          weight='weight'))
-                    for node in origin_nodes)
+            shortest_path = _shortest_paths(topology, sources=origin_nodes)
         else:
-            shortest_path = dict(nx.all_pairs_dijkstra_path(topology,
-                                                            weight='weight'))
+            shortest_path = _shortest_paths(topology)
         current_max_u = max((max(link_loads(topology,
                                             tm_sequence.get(i),
                                             shortest_path
@@ -705,6 +676,168 @@ def sin_cyclostationary_traffic_matrix(topology, mean, stddev, gamma, log_psi,
     return tm_sequence
 
 
+def sin_cyclostationary_traffic_matrix_generator(topology, mean, stddev, gamma,
+                                                 log_psi, delta=0.2, n=24,
+                                                 periods=1, max_u=0.9,
+                                                 origin_nodes=None,
+                                                 destination_nodes=None,
+                                                 seed=None):
+    """
+    Return a generator of a cyclostationary sequence of traffic matrices,
+    where traffic volumes evolve over time as sin waves.
+
+    Traffic matrices are generated with the same process as
+    :func:`sin_cyclostationary_traffic_matrix` but they are yielded one at a
+    time, so that very long sequences can be written to a file or fed to a
+    simulator without storing all of them in memory.
+
+    If *max_u* is not None, the sequence is generated twice. In a first pass,
+    only the maximum utilization of each link is recorded in order to compute
+    the normalization factor. In the second pass, the same random fluctuations
+    are generated again by reseeding the random generator and the scaled
+    matrices are yielded.
+
+    Parameters
+    ----------
+    topology : topology
+        The topology for which the traffic matrix is calculated. This topology
+        can either be directed or undirected. If it is undirected, this
+        function assumes that all links are full-duplex.
+
+    mean : float
+        The mean volume of traffic among all origin-destination pairs
+
+    stddev : float
+        The standard deviation of volumes among all origin-destination pairs.
+
+    gamma : float
+        Parameter expressing relation between mean and standard deviation of
+        traffic volumes of a specific flow over the time
+
+    log_psi : float
+        Parameter expressing relation between mean and standard deviation of
+        traffic volumes of a specific flow over the time
+
+    delta : float [0, 1]
+        A parameter indicating the intensity of variation of traffic volumes
+        over a period
+
+    n : int
+        Number of traffic matrices per period
+
+    periods : int
+        Number of periods. In total the sequence is composed of
+        :math:`n * periods` traffic matrices.
+
+    max_u : float, optional
+        Represent the max link utilization. If specified, traffic volumes are
+        scaled so that the most utilized link of the network has an utilization
+        equal to max_u. If None, volumes are not scaled and matrices are
+        generated in a single pass
+
+    origin_nodes : list, optional
+        A list of all nodes which can be traffic sources. If not specified
+        all nodes of the topology are traffic sources
+
+    destination_nodes : list, optional
+        A list of all nodes which can be traffic destinations. If not specified
+        all nodes of the topology are traffic destinations
+
+    seed : int, optional
+        The seed of the random generator of both the mean traffic volumes and
+        their fluctuations, so that the same seed always yields the same
+        sequence. If None, it is drawn from the random module, so that
+        sequences can be reproduced with random.seed
+
+    Returns
+    -------
+    tms : generator
+        A generator of TrafficMatrix objects
+
+    Examples
+    --------
+    >>> import fnss
+    >>> topology = fnss.ring_topology(5)
+    >>> fnss.set_capacities_constant(topology, 10, 'Mbps')
+    >>> tms = fnss.sin_cyclostationary_traffic_matrix_generator(
+    ...             topology, 1, 0.2, 0.8, -0.33, n=24, periods=30)
+    >>> for tm in tms:
+    ...     pass
+    """
+    rng = _random_generator(seed)
+    static_tm = _static_traffic_matrix(topology, mean, stddev, None,
+                                       origin_nodes, destination_nodes, rng)
+    volume_unit = static_tm.attrib['volume_unit']
+    od_pairs = static_tm.od_pairs()
+    std_dict = __fluctuation_stddev(static_tm.flows(), gamma, log_psi)
+    base = np.asarray([static_tm[od] for od in od_pairs])
+    std = np.asarray([std_dict[od] for od in od_pairs])
+    fluctuation_seed = int(rng.integers(2 ** 63))
+
+    def volume_generator():
+        # All passes draw the same fluctuations from a freshly seeded stream
+        rng = _random_generator(fluctuation_seed)
+        for _ in range(periods):
+            for i in range(n):
+                loc = base * (1 + delta * sin((2 * pi * i) / n))
+                yield np.maximum(0, rng.normal(loc, std))
+
+    def to_traffic_matrix(volumes):
+        tm = TrafficMatrix(volume_unit=volume_unit)
+        for (o, d), volume in zip(od_pairs, volumes.tolist()):
+            tm.add_flow(o, d, volume)
+        return tm
+
+    norm_factor = 1.0
+    if max_u is not None:
+        shortest_path = _shortest_paths(topology, sources=origin_nodes)
+        stats = LinkLoadStatistics(topology, shortest_path)
+        link_max_u = np.zeros(len(stats.links))
+        for volumes in volume_generator():
+            utilization = stats.utilization(to_traffic_matrix(volumes))
+            np.maximum(link_max_u, utilization, out=link_max_u)
+        norm_factor = max_u / link_max_u.max()
+    return (to_traffic_matrix(volumes * norm_factor)
+            for volumes in volume_generator())
+
+
+def __fluctuation_stddev(mean_dict, gamma, log_psi):
+    """
+    Return the standard deviation of the random fluctuations of the traffic
+    volume of each OD pair over time
+
+    Parameters
+    ----------
+    mean_dict : dict
+        The mean traffic volume, keyed by OD pair
+    gamma : float
+        Parameter expressing relation between mean and standard deviation of
+        traffic volumes of a specific flow over the time
+    log_psi : float
+        Parameter expressing relation between mean and standard deviation of
+        traffic volumes of a specific flow over the time
+
+    Returns
+    -------
+    std_dict : dict
+        The standard deviation of traffic fluctuations, keyed by OD pair
+    """
+    psi = exp(log_psi)
+    if psi == 0.0:
+        raise ValueError("The value of log_psi provided is too small and "
+                         "causes psi=0.0, which makes the standard deviation "
+                         "of random fluctuation to become infinite. Try with "
+                         "a greater value of log_psi")
+    std_dict = {(o, d): (m / psi) ** (1.0 / gamma)
+                for (o, d), m in mean_dict.items()}
+    if any(isinf(std) for std in std_dict.values()):
+        raise ValueError("The value of log_psi or gamma provided are too "
+                         "small and causes the standard deviation of random "
+                         "fluctuations to become infinite. Try with a greater "
+                         "value of log_psi and/or gamma")
+    return std_dict
+
+
 def __ranking_metrics_heuristic(topology, od_pairs=None):
     """
     Sort OD pairs of a topology according to the Ranking Metrics Heuristics
@@ -751,7 +884,8 @@ def __ranking_metrics_heuristic(topology, od_pairs=None):
     # on most machines.
     parallelize = (topology.number_of_edges() > 100)
     fast = (topology.number_of_edges() > 300)
-    nfur = __calc_nfur(topology, fast, parallelize)
+    nfur = _memoized(topology, 'nfur', (fast,), ('weight',), __calc_nfur,
+                     topology, fast, parallelize)
     # Note: here we use the opposite of max rather than the inverse of max
     # (which is the formulation of the paper) because we only need to rank
     # in reverse order the max of NFURs. Since all NFURs are >=0,
@@ -798,8 +932,9 @@ def __calc_nfur(topology, fast, parallelize=True):
     # Note: The NFUR calculation doesn't scale because I need to calc betw for
     # each edge removed. With many nodes and edges, takes very long. The
     # parallelization reduced the time but it can still be very long
-    betw = nx.betweenness_centrality(topology, normalized=False,
-                                     weight='weight')
+    betw = _memoized(topology, 'betweenness_centrality', ('weight',),
+                     ('weight',), nx.betweenness_centrality, topology,
+                     normalized=False, weight='weight')
     if fast:
         return betw
     edges = list(topology.edges())
@@ -893,34 +1028,28 @@ def validate_traffic_matrix(topology, traffic_matrix, validate_load=False):
         raise ValueError('tm must be either a TrafficMatrix or a '\
                          ' TrafficMatrixSequence object')
 
-    topology = topology.copy() if topology.is_directed() \
-                               else topology.to_directed()
+    topology = directed_view(topology)
 
-    od_pairs_topology = od_pairs_from_topology(topology)
+    od_pairs_topology = set(od_pairs_from_topology(topology))
     if validate_load:
-        shortest_path = dict(nx.all_pairs_dijkstra_path(topology,
-                                                        weight='weight'))
+        shortest_path = _shortest_paths(topology)
+        links, capacities = _link_capacities(topology)
+        link_index = {link: i for i, link in enumerate(links)}
+        capacity_unit = capacity_units[topology.graph['capacity_unit']]
     for matrix in matrices:
         od_pairs_tm = matrix.od_pairs()
         # verify that OD pairs in TM are equal or subset of topology
         if not all(((o, d) in od_pairs_topology for o, d in od_pairs_tm)):
             return False
         if validate_load:
-            for u, v in topology.edges():
-                topology.adj[u][v]['load'] = 0
-            capacity_unit = capacity_units[topology.graph['capacity_unit']]
             volume_unit = capacity_units[matrix.attrib['volume_unit']]
             norm_factor = float(volume_unit) / float(capacity_unit)
-            for o, d in od_pairs_tm:
-                path = shortest_path[o][d]
-                if len(path) <= 1:
-                    continue
-                for u, v in zip(path[:-1], path[1:]):
-                    topology.adj[u][v]['load'] += matrix.flow[o][d]
-            max_u = max((norm_factor * float(topology.adj[u][v]['load']) \
-                         / float(topology.adj[u][v]['capacity'])
-                         for u, v in topology.edges()))
-            if max_u > 1.0: return False
+            loads = __link_load_array(link_index,
+                                      ((o, d, matrix.flow[o][d])
+                                       for o, d in od_pairs_tm),
+                                      shortest_path)
+            if (norm_factor * loads / capacities > 1.0).any():
+                return False
     return True
 
 
@@ -939,6 +1068,8 @@ def link_loads(topology, traffic_matrix, routing_matrix=None, ecmp=False):
     following the shortest path from origin to destination, calculated with the
     Dijkstra algorithm. If the topology is annotated with link weights, they
     are used for the shortest path calculation. Otherwise hop count is used.
+    Shortest paths are computed with the default routing backend (see
+    :func:`fnss.topologies.routing.set_routing_backend`).
 
     Parameters
     ----------
@@ -971,43 +1102,60 @@ def link_loads(topology, traffic_matrix, routing_matrix=None, ecmp=False):
         A dictionary of link loads keyed by link
 
     """
-    topology = topology.copy() if topology.is_directed() \
-                               else topology.to_directed()
+    if not isinstance(topology, FrozenTopology):
+        topology = directed_view(topology)
+    links, capacities = _link_capacities(topology)
     capacity_unit = capacity_units[topology.graph['capacity_unit']]
     volume_unit = capacity_units[traffic_matrix.attrib['volume_unit']]
     norm_factor = float(volume_unit) / float(capacity_unit)
     if routing_matrix == None:
-        routing_matrix = dict(nx.all_pairs_dijkstra_path(topology,
-                                                         weight='weight'))
-    for u, v in topology.edges():
-        topology.adj[u][v]['load'] = 0
-    od_pairs = traffic_matrix.od_pairs()
-
-    def process_path(path, number_of_paths=1):
-        if len(path) <= 1:
-            return
-        for u, v in zip(path[:-1], path[1:]):
-            if not ecmp:
-                topology.adj[u][v]['load'] += traffic_matrix.flow[o][d]
-            else:
-                topology.adj[u][v]['load'] += \
-                            traffic_matrix.flow[o][d] / float(number_of_paths)
-
-    for o, d in od_pairs:
+        routing_matrix = _shortest_paths(topology)
+    link_index = {link: i for i, link in enumerate(links)}
+    loads = __link_load_array(link_index,
+                              ((o, d, traffic_matrix.flow[o][d])
+                               for o, d in traffic_matrix.od_pairs()),
+                              routing_matrix, ecmp)
+    return dict(zip(links, (norm_factor * loads / capacities).tolist()))
+
+
+def __link_load_array(link_index, flows, routing_matrix, ecmp=False):
+    """Return the traffic volume routed over each link, accumulated in an
+    array rather than in link attributes, so that topologies need not be
+    copied
+
+    Parameters
+    ----------
+    link_index : dict
+        The position of each link in the returned array, keyed by link
+    flows : iterable
+        The flows to route, as (origin, destination, volume) tuples
+    routing_matrix : dict of dicts
+        The routing matrix, in the format accepted by :func:`link_loads`
+    ecmp : bool, optional
+        If True, the routing matrix has lists of paths among which volumes
+        are equally divided
+
+    Returns
+    -------
+    loads : numpy array
+        The volume routed over each link, ordered as in *link_index*
+    """
+    hops = []
+    volumes = []
+    for o, d, volume in flows:
         try:
             path = routing_matrix[o][d]
         except KeyError:
             raise ValueError('Cannot calculate link loads. There is no route' \
                              'from node %s to node %s' % (str(o), str(d)))
-        if not ecmp:
-            process_path(path)
-        else:
-            for p in path:
-                process_path(p, len(path))
-
-    return {(u, v): norm_factor * float(topology.adj[u][v]['load']) \
-            / float(topology.adj[u][v]['capacity'])
-            for u, v in topology.edges()}
+        paths = path if ecmp else (path,)
+        volume = volume / float(len(paths))
+        for p in paths:
+            path_hops = [link_index[(u, v)] for u, v in zip(p[:-1], p[1:])]
+            hops.extend(path_hops)
+            volumes.extend([volume] * len(path_hops))
+    return np.bincount(np.asarray(hops, dtype=np.intp), volumes,
+                       len(link_index))
 
 
 def read_traffic_matrix(path, encoding='utf-8'):
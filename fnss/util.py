@@ -2,6 +2,8 @@
 from __future__ import division
 import ast
 import random
+import sys
+from importlib import import_module
 from math import pi, sqrt, sin, cos, asin
 
 from fnss.units import EARTH_RADIUS
@@ -11,6 +13,7 @@ __all__ = [
     'random_from_pdf',
     'map_func',
     'xml_cast_type',
+    'xml_cast_function',
     'xml_type',
     'xml_indent',
     'geographical_distance',
@@ -94,6 +97,53 @@ def map_func(x):
     return func(*args)
 
 
+def _xml_cast_boolean(val):
+    return val == 'True'
+
+
+def _xml_cast_string(val):
+    return val
+
+
+# Functions casting XML values to Python types, keyed by XML type
+_XML_CAST_FUNCTIONS = {
+    'int':     int,
+    'float':   float,
+    'boolean': _xml_cast_boolean,
+    'tuple':   ast.literal_eval,
+    'list':    ast.literal_eval,
+    'dict':    ast.literal_eval,
+                       }
+
+
+def xml_cast_function(type_attrib):
+    """Return the function casting values read from an XML file with a given
+    type to an appropriate Python type.
+
+    Parsers casting many values can look up the function of each type once
+    rather than selecting it for every value as done by
+    :func:`xml_cast_type`.
+
+    Parameters
+    ----------
+    type_attrib : str
+        The type of the values as specified in the XML file
+
+    Returns
+    -------
+    cast_func : callable
+        A function taking a value read from the XML file as a str and
+        returning it cast to the appropriate type
+
+    Examples
+    --------
+    >>> from fnss.util import xml_cast_function
+    >>> xml_cast_function('int')('12')
+    12
+    """
+    return _XML_CAST_FUNCTIONS.get(type_attrib, _xml_cast_string)
+
+
 def xml_cast_type(type_attrib, val):
     """Cast a value read to an XML to an appropriate Python type
 
@@ -109,19 +159,7 @@ def xml_cast_type(type_attrib, val):
     cast_val : any type
         The val argument cast to a given type
     """
-    if type_attrib == 'int':
-        return int(val)
-    elif type_attrib == 'float':
-        return float(val)
-    elif type_attrib == 'boolean':
-        if val == 'True':
-            return True
-        else:
-            return False
-    elif type_attrib in ('tuple', 'list', 'dict'):
-        return ast.literal_eval(val)
-    else:
-        return val
+    return xml_cast_function(type_attrib)(val)
 
 
 def xml_type(val):
@@ -150,6 +188,59 @@ def xml_type(val):
         return 'string'
 
 
+def _tag_value(val):
+    """Return a value as a [type, text] pair, where the type is the one
+    returned by :func:`xml_type` and the text is the value as written in XML
+    files, so that it can be stored in a JSON document and cast back by
+    :func:`_untag_value` without evaluating arbitrary code"""
+    if type(val).__module__ == 'numpy' and hasattr(val, 'item'):
+        # NumPy scalars are stored as the equivalent Python values
+        val = val.item()
+    val_type = xml_type(val)
+    if val_type in ('float', 'tuple', 'list', 'dict'):
+        return [val_type, repr(val)]
+    return [val_type, str(val)]
+
+
+def _untag_value(tagged):
+    """Return a value stored as a [type, text] pair by :func:`_tag_value`"""
+    val_type, text = tagged
+    return xml_cast_function(val_type)(text)
+
+
+# Types of values stored as they are in JSON documents
+_JSON_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _to_json(val):
+    """Return a value as a JSON value. Strings, numbers, booleans and None
+    are returned as they are, tuples, lists and dictionaries as [type, items]
+    pairs, with items converted recursively, and values of any other type as
+    [type, text] pairs as returned by :func:`_tag_value`"""
+    val_type = type(val)
+    if val_type in _JSON_TYPES:
+        return val
+    if val_type is tuple or val_type is list:
+        return [xml_type(val), [_to_json(v) for v in val]]
+    if val_type is dict:
+        return ['dict', [[_to_json(k), _to_json(v)] for k, v in val.items()]]
+    return _tag_value(val)
+
+
+def _from_json(val):
+    """Return a value converted to a JSON value by :func:`_to_json`, without
+    evaluating arbitrary code"""
+    if type(val) is not list:
+        return val
+    val_type, items = val
+    if type(items) is not list:
+        return _untag_value(val)
+    if val_type == 'dict':
+        return dict((_from_json(k), _from_json(v)) for k, v in items)
+    items = [_from_json(v) for v in items]
+    return tuple(items) if val_type == 'tuple' else items
+
+
 def xml_indent(elem, level=0):
     """Indent the elements of the XML tree
 
@@ -224,3 +315,42 @@ def geographical_distance(lat_u, lon_u, lat_v, lon_v):
     return 2 * EARTH_RADIUS * asin(sqrt(sin((lat_u - lat_v) / 2) ** 2 +
                                     cos(lat_v) * cos(lat_u)
                                     * sin((lon_u - lon_v) / 2) ** 2))
+
+
+def _lazy_attributes(package, modules):
+    """Return the module-level *__getattr__* and *__dir__* functions
+    (PEP 562) of a package exposing the public names of its modules, which
+    are only imported when one of their names is first accessed.
+
+    Parameters
+    ----------
+    package : str
+        The name of the package
+    modules : dict
+        The public names of the modules of the package, keyed by module
+        name, relative to the package. The modules themselves are also
+        attributes of the package
+
+    Returns
+    -------
+    getattr, dir : functions
+        The *__getattr__* and *__dir__* functions of the package
+    """
+    names = dict((name, module) for module in modules
+                 for name in modules[module])
+
+    def __getattr__(name):
+        if name in modules:
+            return import_module('%s.%s' % (package, name))
+        if name not in names:
+            raise AttributeError('module %r has no attribute %r'
+                                 % (package, name))
+        value = getattr(import_module('%s.%s' % (package, names[name])), name)
+        # cache the attribute so that later accesses are direct
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])).union(modules, names))
+
+    return __getattr__, __dir__
@@ -8,7 +8,7 @@ from setuptools import setup, find_packages
 # Packages required to run FNSS
 requires = [
     'networkx (>=2.0)',
-    'numpy (>=1.4)',
+    'numpy (>=1.17)',
     'mako (>=0.4)',
     'looseversion (>=1.3.0)'
 ]
@@ -32,7 +32,7 @@ if __name__ == "__main__":
         version=release.version,
         author=release.author,
         author_email=release.author_email,
-        packages=find_packages(exclude=("test*",)),
+        packages=find_packages(exclude=("test*", "benchmarks*")),
         scripts=[
             'bin/fnss-troubleshoot',
             'bin/mn-fnss'
@@ -52,18 +52,17 @@ if __name__ == "__main__":
              'License :: OSI Approved :: BSD License',
              'Natural Language :: English',
              'Operating System :: OS Independent',
-             'Programming Language :: Python :: 2',
-             'Programming Language :: Python :: 2.7',
              'Programming Language :: Python :: 3',
-             'Programming Language :: Python :: 3.4',
              'Programming Language :: Python :: 3.5',
              'Programming Language :: Python :: 3.6',
+             'Programming Language :: Python :: 3.7',
+             'Programming Language :: Python :: 3.8',
              'Topic :: Software Development :: Libraries :: Python Modules',
              'Topic :: Scientific/Engineering',
         ],
         description=release.description_short,
         long_description=release.description_long,
-        python_requires='>=2.7.9, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*',
+        python_requires='>=3.5',
         install_requires=requires,
         keywords=[
             'network',
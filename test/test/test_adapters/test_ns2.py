@@ -30,3 +30,14 @@ class Test(unittest.TestCase):
         fnss.set_delays_constant(t, 2, 'us')
         fnss.set_buffer_sizes_constant(t, 20, 'packets')
         fnss.to_ns2(t, path.join(TMP_DIR, 'ns2-dir.tcl'), stacks=False)
+
+    def test_validate_ns2_stacks(self):
+        t = fnss.line_topology(3)
+        fnss.add_stack(t, 0, 'tcp', {'class': 'Agent/TCP'})
+        fnss.add_application(t, 0, 'ftp', {'class': 'Application/FTP'})
+        self.assertTrue(fnss.validate_ns2_stacks(t))
+        # stacks whose name is not hashable are validated as well
+        t.node[1]['stack'] = (['udp'], {})
+        self.assertFalse(fnss.validate_ns2_stacks(t))
+        t.node[1]['stack'] = (['udp'], {'class': 'Agent/UDP'})
+        self.assertTrue(fnss.validate_ns2_stacks(t))
@@ -1,6 +1,11 @@
 import unittest
+from unittest import mock
+
+import networkx as nx
 
 import fnss
+import fnss.topologies.routing as routing
+from fnss.util import package_available
 
 class Test(unittest.TestCase):
 
@@ -31,6 +36,30 @@ class Test(unittest.TestCase):
         self.assertTrue(all(self.topo.adj[u][v]['buffer'] is not None
                          for (u, v) in self.topo.edges()))
 
+    def test_buffer_sizes_bw_delay_prod_single_pass(self):
+        # routes are computed once for end-to-end delays and link RTTs
+        topo = self.topo.copy()
+        with mock.patch.object(nx, 'all_pairs_dijkstra_path',
+                               wraps=nx.all_pairs_dijkstra_path) as dijkstra:
+            fnss.set_buffer_sizes_bw_delay_prod(topo)
+        self.assertEqual(1, dijkstra.call_count)
+
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_buffer_sizes_bw_delay_prod_single_pass_scipy(self):
+        topo = self.topo.copy()
+        expected = topo.copy()
+        fnss.set_routing_backend('scipy')
+        try:
+            fnss.set_buffer_sizes_bw_delay_prod(expected)
+            with mock.patch.object(
+                    routing, 'shortest_path_predecessors',
+                    wraps=routing.shortest_path_predecessors) as dijkstra:
+                fnss.set_buffer_sizes_bw_delay_prod(topo)
+        finally:
+            fnss.set_routing_backend('networkx')
+        self.assertEqual(1, dijkstra.call_count)
+        self.assertEqual(expected.buffers(), topo.buffers())
+
     def test_buffer_sizes_bw_delay_prod_unused_links(self):
         topo = fnss.Topology()
         topo.add_edge(1, 2, weight=100)
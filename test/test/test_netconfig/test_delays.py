@@ -1,8 +1,10 @@
 import unittest
 
 import networkx as nx
+import numpy as np
 
 import fnss
+from fnss.util import package_available
 
 class Test(unittest.TestCase):
 
@@ -98,3 +100,53 @@ class Test(unittest.TestCase):
                          len(nx.get_edge_attributes(topo, 'delay')))
         fnss.clear_delays(topo)
         self.assertEqual(0, len(nx.get_edge_attributes(topo, 'delay')))
+
+    def _e2e_delay_topology(self):
+        topo = fnss.waxman_1_topology(40, alpha=0.5, beta=0.3, L=1, seed=1)
+        for i, (u, v) in enumerate(topo.edges()):
+            topo.adj[u][v]['weight'] = 1 + 0.001 * i
+            topo.adj[u][v]['delay'] = 1 + (i % 7)
+        topo.graph['delay_unit'] = 'ms'
+        return topo
+
+    def _check_e2e_delay_matrix(self, backend):
+        topo = self._e2e_delay_topology()
+        nodes, delays = fnss.e2e_delay_matrix(topo, backend=backend)
+        paths = dict(nx.all_pairs_dijkstra_path(topo, weight='weight'))
+        for i, o in enumerate(nodes):
+            for j, d in enumerate(nodes):
+                if d not in paths[o]:
+                    self.assertTrue(np.isinf(delays[i, j]))
+                    continue
+                path = paths[o][d]
+                expected = sum(topo.adj[u][v]['delay']
+                               for u, v in zip(path[:-1], path[1:]))
+                self.assertAlmostEqual(expected, delays[i, j])
+        _, rtt = fnss.rtt_matrix(topo, backend=backend)
+        self.assertTrue(np.array_equal(rtt, rtt.T))
+        self.assertTrue(np.array_equal(rtt, 2 * delays))
+
+    def test_e2e_delay_matrix_networkx(self):
+        self._check_e2e_delay_matrix('networkx')
+
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_e2e_delay_matrix_scipy(self):
+        self._check_e2e_delay_matrix('scipy')
+
+    def test_e2e_delay_matrix_cache(self):
+        topo = fnss.line_topology(4)
+        fnss.set_delays_constant(topo, 2, 'ms')
+        nodes, delays = fnss.e2e_delay_matrix(topo)
+        self.assertIs(delays, fnss.e2e_delay_matrix(topo)[1])
+        self.assertFalse(delays.flags.writeable)
+        self.assertEqual(6, delays[nodes.index(0), nodes.index(3)])
+        fnss.set_delays_constant(topo, 3, 'ms', links=[(0, 1)])
+        nodes, delays = fnss.e2e_delay_matrix(topo)
+        self.assertEqual(7, delays[nodes.index(0), nodes.index(3)])
+        topo.add_edge(0, 3, delay=1)
+        nodes, delays = fnss.e2e_delay_matrix(topo)
+        self.assertEqual(1, delays[nodes.index(0), nodes.index(3)])
+
+    def test_e2e_delay_matrix_no_delays(self):
+        topo = fnss.line_topology(4)
+        self.assertRaises(ValueError, fnss.e2e_delay_matrix, topo)
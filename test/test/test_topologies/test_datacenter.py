@@ -19,6 +19,13 @@ class DatacenterTopologiesTest(unittest.TestCase):
         self.assertEqual(host_list, topology.hosts())
         self.assertEqual(len(switch_list), topology.number_of_switches())
         self.assertEqual(len(host_list), topology.number_of_hosts())
+        topology.node[4]['type'] = 'switch'
+        topology.remove_node(1)
+        self.assertEqual([2, 3, 4], topology.switches())
+        self.assertEqual([5, 6, 7], topology.hosts())
+        # nodes are returned in node order, not in the order of their types
+        topology.node[4]['type'] = 'host'
+        self.assertEqual([4, 5, 6, 7], topology.hosts())
 
     def test_fat_tree(self):
         topology = fnss.fat_tree_topology(8)
@@ -0,0 +1,189 @@
+from os import environ, path
+import json
+import random
+import unittest
+from unittest import mock
+
+import networkx as nx
+import numpy as np
+
+import fnss
+import fnss.topologies.routing as routing
+from fnss.util import package_available
+
+TMP_DIR = environ['test.tmp.dir'] if 'test.tmp.dir' in environ else None
+
+
+class Test(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.topo = fnss.waxman_1_topology(60, alpha=0.5, beta=0.3, L=1)
+        rand = random.Random(0)
+        for u, v in cls.topo.edges():
+            # random weights ensure shortest paths are unique
+            cls.topo.adj[u][v]['weight'] = 1 + rand.random()
+
+    def tearDown(self):
+        fnss.set_routing_backend('networkx')
+
+    def test_set_routing_backend(self):
+        fnss.set_routing_backend('scipy')
+        self.assertEqual('scipy', fnss.get_routing_backend())
+        fnss.set_routing_backend('networkx')
+        self.assertEqual('networkx', fnss.get_routing_backend())
+        self.assertRaises(ValueError, fnss.set_routing_backend, 'invalid')
+
+    def test_all_pairs_shortest_paths_networkx(self):
+        paths = fnss.all_pairs_shortest_paths(self.topo, backend='networkx')
+        expected = dict(nx.all_pairs_dijkstra_path(self.topo, weight='weight'))
+        self.assertEqual(expected, paths)
+
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_all_pairs_shortest_paths_scipy(self):
+        paths = fnss.all_pairs_shortest_paths(self.topo, backend='scipy')
+        expected = dict(nx.all_pairs_dijkstra_path(self.topo, weight='weight'))
+        self.assertEqual(expected, paths)
+
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_all_pairs_shortest_paths_scipy_sources(self):
+        topo = fnss.DirectedTopology()
+        topo.add_path([1, 2, 3, 4])
+        topo.add_edge(4, 1)
+        paths = fnss.all_pairs_shortest_paths(topo, sources=[2, 3],
+                                              backend='scipy')
+        self.assertEqual([2, 3], sorted(paths))
+        self.assertEqual([3, 4, 1], paths[3][1])
+        self.assertEqual([2], paths[2][2])
+
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_all_pairs_shortest_paths_disconnected(self):
+        topo = fnss.Topology()
+        topo.add_path([1, 2, 3])
+        topo.add_path([4, 5])
+        paths = fnss.all_pairs_shortest_paths(topo, backend='scipy')
+        self.assertNotIn(4, paths[1])
+        self.assertEqual([4, 5], paths[4][5])
+
+    def test_all_pairs_shortest_paths_networkx_ties(self):
+        grid = fnss.Topology(nx.grid_2d_graph(6, 6))
+        for topo in (fnss.ring_topology(10), grid, grid.to_directed()):
+            self.assertEqual(dict(nx.all_pairs_dijkstra_path(topo)),
+                             fnss.all_pairs_shortest_paths(topo))
+
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_all_pairs_shortest_paths_scipy_ties(self):
+        # the route goes through the lowest-index neighbor on a shortest path
+        paths = fnss.all_pairs_shortest_paths(fnss.ring_topology(10),
+                                              backend='scipy')
+        self.assertEqual([0, 1, 2, 3, 4, 5], paths[0][5])
+        self.assertEqual([5, 4, 3, 2, 1, 0], paths[5][0])
+        grid = fnss.Topology(nx.grid_2d_graph(6, 6))
+        paths = fnss.all_pairs_shortest_paths(grid, backend='scipy')
+        self.assertEqual([(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)],
+                         paths[(0, 0)][(2, 2)])
+        paths = fnss.all_pairs_shortest_paths(grid.to_directed(),
+                                              backend='scipy')
+        self.assertEqual([(2, 2), (1, 2), (0, 2), (0, 1), (0, 0)],
+                         paths[(2, 2)][(0, 0)])
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_routing_store_ties(self):
+        topo = fnss.Topology(nx.grid_2d_graph(5, 5))
+        store = fnss.build_routing_store(topo, path.join(TMP_DIR, 'rs-ties'),
+                                         shard_size=4, processes=1)
+        paths = fnss.all_pairs_shortest_paths(topo, backend='scipy')
+        for o in paths:
+            self.assertEqual(paths[o], {d: store[o][d] for d in store[o]})
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_routing_store_index(self):
+        topo = fnss.Topology()
+        topo.add_path(['a', 'b', 'c'])
+        store_dir = path.join(TMP_DIR, 'rs-index')
+        fnss.build_routing_store(topo, store_dir, processes=1)
+        with open(path.join(store_dir, 'index.json')) as f:
+            self.assertFalse(json.load(f)['directed'])
+        store = fnss.RoutingStore(store_dir)
+        self.assertEqual(['a', 'b', 'c'], store.nodes)
+        self.assertEqual(['c', 'b', 'a'], store.path('c', 'a'))
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_routing_store_memory_budget(self):
+        store_dir = path.join(TMP_DIR, 'rs-budget')
+        n = len(self.topo)
+        # budgets fitting 5 sources per shard and 2 shards overall
+        with mock.patch.object(routing, '_STORE_SHARD_MEMORY', 80 * n), \
+                mock.patch.object(routing, '_STORE_MEMORY', 160 * n), \
+                mock.patch.object(routing.mp, 'cpu_count', return_value=4), \
+                mock.patch.object(routing.mp, 'Pool',
+                                  wraps=routing.mp.Pool) as pool:
+            store = fnss.build_routing_store(self.topo, store_dir)
+        self.assertEqual(2, pool.call_args[0][0])
+        with open(path.join(store_dir, 'index.json')) as f:
+            index = json.load(f)
+        self.assertEqual(5, index['shard_size'])
+        self.assertEqual(12, index['shards'])
+        expected = dict(nx.all_pairs_dijkstra_path(self.topo, weight='weight'))
+        for o in expected:
+            self.assertEqual(expected[o], {d: store[o][d] for d in store[o]})
+
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_shortest_path_length_matrix(self):
+        nodes, nx_dist = fnss.shortest_path_length_matrix(self.topo,
+                                                          backend='networkx')
+        sp_nodes, sp_dist = fnss.shortest_path_length_matrix(self.topo,
+                                                             backend='scipy')
+        self.assertEqual(nodes, sp_nodes)
+        self.assertTrue(np.allclose(nx_dist, sp_dist))
+
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_default_backend_used_by_link_loads(self):
+        topo = fnss.ring_topology(5)
+        fnss.set_capacities_constant(topo, 100, capacity_unit='Mbps')
+        tm = fnss.TrafficMatrix(volume_unit='Mbps')
+        tm.add_flow(0, 2, 40)
+        tm.add_flow(1, 4, 70)
+        expected = fnss.link_loads(topo, tm)
+        fnss.set_routing_backend('scipy')
+        self.assertEqual(expected, fnss.link_loads(topo, tm))
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_routing_store(self):
+        store_dir = path.join(TMP_DIR, 'routing-store')
+        store = fnss.build_routing_store(self.topo, store_dir, shard_size=7,
+                                         distances=True, processes=2)
+        expected = dict(nx.all_pairs_dijkstra_path(self.topo, weight='weight'))
+        self.assertEqual(len(self.topo), len(store))
+        for o in expected:
+            self.assertEqual(len(expected[o]), len(store[o]))
+            for d in expected[o]:
+                self.assertIn(d, store[o])
+                self.assertEqual(expected[o][d], store.path(o, d))
+        o, d = list(self.topo.edges())[0]
+        self.assertAlmostEqual(self.topo.adj[o][d]['weight'],
+                               store.distances(o)[store.node_index[d]])
+        reopened = fnss.RoutingStore(store_dir)
+        self.assertEqual(expected[o], {d: reopened[o][d] for d in reopened[o]})
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_routing_store_link_loads(self):
+        topo = fnss.DirectedTopology()
+        topo.add_path([1, 2, 3, 1])
+        topo.add_node(4)
+        fnss.set_capacities_constant(topo, 100, capacity_unit='Mbps')
+        store = fnss.build_routing_store(topo, path.join(TMP_DIR, 'rs-loads'),
+                                         processes=1)
+        self.assertRaises(KeyError, store.path, 1, 4)
+        self.assertEqual([3, 1, 2], store[3][2])
+        tm = fnss.TrafficMatrix(volume_unit='Mbps')
+        tm.add_flow(3, 2, 40)
+        load = fnss.link_loads(topo, tm, routing_matrix=store)
+        self.assertAlmostEqual(0.4, load[(3, 1)])
+        self.assertAlmostEqual(0.4, load[(1, 2)])
+        self.assertAlmostEqual(0.0, load[(2, 3)])
@@ -1,7 +1,15 @@
 from os import path, environ
+import gc
+import pickle
 import unittest
+import weakref
+import xml.etree.cElementTree as ET
+
+import networkx as nx
+import numpy as np
 
 import fnss
+from fnss.util import package_available
 
 TMP_DIR = environ['test.tmp.dir'] if 'test.tmp.dir' in environ else None
 
@@ -113,6 +121,428 @@ class Test(unittest.TestCase):
         self.assertEqual({0: 30, 1: 10, 2: 10, 3: 10}, in_cap)
         self.assertEqual(in_cap, out_cap)
 
+    def test_copy(self):
+        topology = self.G.copy()
+        self.assertIsInstance(topology, fnss.Topology)
+        self.assertEqual(list(self.G.edges(data=True)),
+                         list(topology.edges(data=True)))
+        self.assertEqual(dict(self.G.nodes(data=True)),
+                         dict(topology.nodes(data=True)))
+        self.assertEqual(self.G.graph, topology.graph)
+        u, v = next(iter(topology.edges()))
+        self.assertIs(topology.adj[u][v], topology.adj[v][u])
+        topology.adj[u][v]['capacity'] = -1
+        topology.graph['capacity_unit'] = 'Gbps'
+        topology.add_edge(u, 1000)
+        self.assertNotEqual(-1, self.G.adj[u][v]['capacity'])
+        self.assertEqual('Mbps', self.G.graph['capacity_unit'])
+        self.assertFalse(self.G.has_node(1000))
+
+    def test_to_directed_to_undirected(self):
+        directed = self.G.to_directed()
+        self.assertIsInstance(directed, fnss.DirectedTopology)
+        self.assertEqual(2 * self.G.number_of_edges(),
+                         directed.number_of_edges())
+        u, v = next(iter(self.G.edges()))
+        self.assertEqual(self.G.adj[u][v], directed.adj[v][u])
+        self.assertIsNot(directed.adj[u][v], directed.adj[v][u])
+        self.assertIs(directed.succ[u][v], directed.pred[v][u])
+        self.assertEqual(fnss.get_stack(self.G, 2),
+                         fnss.get_stack(directed, 2))
+        self.assertIsNot(self.G.nodes[2]['stack'], directed.nodes[2]['stack'])
+        directed_copy = directed.copy()
+        directed_copy.remove_edge(u, v)
+        self.assertTrue(directed.has_edge(u, v))
+        self.assertEqual(list(directed.predecessors(v)),
+                         list(directed.to_directed().predecessors(v)))
+        undirected = directed.to_undirected()
+        self.assertIsInstance(undirected, fnss.Topology)
+        self.assertEqual(set(map(frozenset, self.G.edges())),
+                         set(map(frozenset, undirected.edges())))
+        self.assertIsInstance(self.G.to_undirected(), fnss.Topology)
+
+    def test_subgraph(self):
+        nodes = [0, 1, 2, 3]
+        topology = self.G.subgraph(nodes)
+        self.assertIsInstance(topology, fnss.Topology)
+        self.assertEqual(list(nx.Graph.subgraph(self.G, nodes).edges()),
+                         list(topology.edges()))
+        directed = self.G.to_directed().subgraph(nodes)
+        self.assertIsInstance(directed, fnss.DirectedTopology)
+        self.assertEqual(2 * topology.number_of_edges(),
+                         directed.number_of_edges())
+        topology.add_edge(0, 1000)
+        self.assertFalse(self.G.has_node(1000))
+
+    def test_directed_view(self):
+        view = fnss.directed_view(self.G)
+        self.assertTrue(view.is_directed())
+        self.assertEqual(2 * self.G.number_of_edges(), view.number_of_edges())
+        u, v = next(iter(self.G.edges()))
+        self.assertIs(self.G.adj[u][v], view.adj[v][u])
+        self.assertRaises(nx.NetworkXError, view.add_edge, 1000, 1001)
+        self.G.add_edge(1000, 1001)
+        try:
+            self.assertTrue(view.has_edge(1001, 1000))
+        finally:
+            self.G.remove_nodes_from([1000, 1001])
+        topology = fnss.DirectedTopology()
+        topology.add_edge(0, 1)
+        self.assertEqual([(0, 1)], list(fnss.directed_view(topology).edges()))
+        self.assertEqual(2 * self.G.number_of_edges(),
+                         fnss.directed_view(self.G.freeze()).number_of_edges())
+
+    def test_edge_array(self):
+        topology = fnss.line_topology(4)
+        links = list(topology.edges())
+        topology.set_edge_array('capacity', np.array([10, 20, 30]))
+        self.assertEqual([10, 20, 30], [topology.adj[u][v]['capacity']
+                                        for u, v in links])
+        self.assertIsInstance(topology.adj[0][1]['capacity'], int)
+        np.testing.assert_array_equal([10, 20, 30],
+                                      topology.get_edge_array('capacity'))
+        topology.set_edge_array('delay', 2.5, links=[(2, 1)])
+        np.testing.assert_array_equal(
+                [-1, 2.5, -1], topology.get_edge_array('delay', default=-1))
+        np.testing.assert_array_equal(
+                [30, 10], topology.get_edge_array('capacity',
+                                                  links=[(3, 2), (0, 1)]))
+        np.testing.assert_array_equal(
+                [10, 20, 30], fnss.get_edge_array(topology.freeze(),
+                                                  'capacity'))
+        self.assertRaises(ValueError, topology.set_edge_array, 'weight',
+                          [1, 2])
+        self.assertRaises(TypeError, fnss.set_edge_array, topology.freeze(),
+                          'weight', 1)
+
+    def test_node_array(self):
+        topology = fnss.line_topology(3)
+        topology.set_node_array('name', ['a', 'b', 'c'])
+        np.testing.assert_array_equal(
+                ['c', 'a'], topology.get_node_array('name', nodes=[2, 0],
+                                                    dtype=object))
+        topology.set_node_array('rank', 1, nodes=[1])
+        np.testing.assert_array_equal(
+                [0, 1, 0], topology.get_node_array('rank', default=0))
+
+    def test_nodes_by_type(self):
+        topology = fnss.star_topology(3)
+        topology.node[1]['type'] = 'switch'
+        topology.add_node(4, type='switch')
+        self.assertEqual([0], topology.nodes_by_type('root'))
+        self.assertEqual([1, 4], topology.nodes_by_type('switch'))
+        self.assertEqual([2, 3], topology.nodes_by_type('leaf'))
+        del topology.node[1]['type']
+        topology.node[2].update(type='switch')
+        topology.remove_node(4)
+        self.assertEqual([2], topology.nodes_by_type('switch'))
+        self.assertEqual([], topology.nodes_by_type('host'))
+        for copy in (topology.copy(), topology.to_directed(),
+                     topology.subgraph([0, 2, 3]),
+                     pickle.loads(pickle.dumps(topology)),
+                     topology.freeze()):
+            self.assertEqual([2], copy.nodes_by_type('switch'))
+            self.assertEqual([3], copy.nodes_by_type('leaf'))
+        topology.node[3].clear()
+        self.assertEqual([2], topology.nodes_by_type('switch'))
+        self.assertEqual([], topology.nodes_by_type('leaf'))
+
+    def test_nodes_by_stack_application(self):
+        topology = fnss.line_topology(4)
+        fnss.add_stack(topology, 0, 'tcp')
+        fnss.add_stack(topology, 2, 'tcp')
+        fnss.add_stack(topology, 3, 'udp')
+        fnss.add_application(topology, 1, 'client', {})
+        fnss.add_application(topology, 1, 'server', {})
+        fnss.add_application(topology, 2, 'server', {})
+        self.assertEqual([0, 2], topology.nodes_by_stack('tcp'))
+        self.assertEqual([1, 2], topology.nodes_by_application('server'))
+        fnss.add_stack(topology, 2, 'udp')
+        fnss.remove_application(topology, 1, 'server')
+        self.assertEqual([0], topology.nodes_by_stack('tcp'))
+        # nodes are returned in node order
+        self.assertEqual([2, 3], topology.nodes_by_stack('udp'))
+        self.assertEqual([2], topology.nodes_by_application('server'))
+        self.assertEqual([1], topology.nodes_by_application('client'))
+        fnss.clear_applications(topology)
+        self.assertEqual([], topology.nodes_by_application('client'))
+        topology.remove_node(0)
+        topology.add_node(0)
+        fnss.add_stack(topology, 0, 'udp')
+        self.assertEqual([2, 3, 0], topology.nodes_by_stack('udp'))
+        self.assertEqual([2, 3, 0], topology.freeze().nodes_by_stack('udp'))
+
+    def test_fingerprint(self):
+        topology = self.G.copy()
+        fingerprint = topology.fingerprint()
+        structure = topology.fingerprint(attributes=())
+        weights = topology.fingerprint(attributes=['weight'])
+        self.assertEqual(fingerprint, self.G.copy().fingerprint())
+        u, v = next(iter(topology.edges()))
+        topology.adj[u][v]['capacity'] *= 2
+        self.assertNotEqual(fingerprint, topology.fingerprint())
+        self.assertEqual(structure, topology.fingerprint(attributes=()))
+        self.assertEqual(weights, topology.fingerprint(attributes=['weight']))
+        topology.adj[u][v]['weight'] *= 2
+        self.assertNotEqual(weights,
+                            topology.fingerprint(attributes=['weight']))
+        topology.remove_edge(u, v)
+        self.assertNotEqual(structure, topology.fingerprint(attributes=()))
+        frozen = self.G.freeze()
+        self.assertEqual(frozen.fingerprint(), frozen.fingerprint())
+        self.assertNotEqual(fingerprint, frozen.fingerprint())
+
+    def test_fingerprint_cache(self):
+        for topology in (self.G.copy(), self.G.to_directed()):
+            u, v = next(iter(topology.edges()))
+            fingerprint = topology.fingerprint()
+            weights = topology.fingerprint(attributes=['weight'])
+            self.assertIs(fingerprint, topology.fingerprint())
+            # topology properties are not part of restricted fingerprints
+            topology.graph['note'] = 'backbone'
+            self.assertNotEqual(fingerprint, topology.fingerprint())
+            self.assertEqual(weights,
+                             topology.fingerprint(attributes=['weight']))
+            fnss.set_capacities_constant(topology, 40, 'Mbps')
+            self.assertEqual(weights,
+                             topology.fingerprint(attributes=['weight']))
+            topology.edges[u, v].update(weight=100)
+            self.assertNotEqual(weights,
+                                topology.fingerprint(attributes=['weight']))
+            fingerprint = topology.fingerprint()
+            topology.nodes[u]['label'] = 'a'
+            self.assertNotEqual(fingerprint, topology.fingerprint())
+            structure = topology.fingerprint(attributes=())
+            topology.add_edge(u, 'new')
+            self.assertNotEqual(structure,
+                                topology.fingerprint(attributes=()))
+            structure = topology.fingerprint(attributes=())
+            topology.remove_node('new')
+            self.assertNotEqual(structure,
+                                topology.fingerprint(attributes=()))
+            # fingerprints are also cached for unpickled topologies
+            restored = pickle.loads(pickle.dumps(topology))
+            self.assertEqual(topology.fingerprint(), restored.fingerprint())
+            restored.adj[u][v]['weight'] = 1
+            self.assertNotEqual(topology.fingerprint(), restored.fingerprint())
+            # dictionaries shared with another topology are not cached
+            fingerprint = topology.fingerprint()
+            weights = topology.fingerprint(attributes=['weight'])
+            other = self.G.copy()
+            other.graph = topology.graph
+            other.fingerprint()
+            topology.graph['note'] = 'core'
+            self.assertNotEqual(fingerprint, topology.fingerprint())
+            self.assertEqual(weights,
+                             topology.fingerprint(attributes=['weight']))
+
+    def test_memo(self):
+        size = fnss.get_memo_size()
+        fnss.clear_memo()
+        topology = fnss.ring_topology(6)
+        fnss.set_delays_constant(topology, 1, 'ms')
+        try:
+            od_pairs = fnss.od_pairs_from_topology(topology)
+            od_pairs.pop()
+            self.assertEqual(30, len(fnss.od_pairs_from_topology(topology)))
+            delays = fnss.e2e_delay_matrix(topology)[1]
+            self.assertIs(delays, fnss.e2e_delay_matrix(topology)[1])
+            fnss.set_memo_size(1)
+            fnss.od_pairs_from_topology(topology)
+            self.assertIsNot(delays, fnss.e2e_delay_matrix(topology)[1])
+            fnss.set_memo_size(0)
+            self.assertIsNot(fnss.e2e_delay_matrix(topology)[1],
+                             fnss.e2e_delay_matrix(topology)[1])
+            topology.remove_edges_from([(0, 1), (3, 4)])
+            self.assertEqual(12, len(fnss.od_pairs_from_topology(topology)))
+            self.assertRaises(ValueError, fnss.set_memo_size, -1)
+        finally:
+            fnss.set_memo_size(size)
+            fnss.clear_memo()
+
+    def test_memo_per_topology(self):
+        topology = fnss.ring_topology(6)
+        fnss.set_delays_constant(topology, 1, 'ms')
+        delays = fnss.e2e_delay_matrix(topology)[1]
+        # results are discarded with the topology
+        ref = weakref.ref(delays)
+        del topology, delays
+        gc.collect()
+        self.assertIsNone(ref())
+        # views share the results of the topology they are a view of
+        topology = fnss.ring_topology(6)
+        fnss.set_delays_constant(topology, 1, 'ms')
+        view = fnss.directed_view(topology)
+        delays = fnss.e2e_delay_matrix(view)[1]
+        self.assertIs(delays, fnss.e2e_delay_matrix(
+                                    fnss.directed_view(topology))[1])
+        self.assertEqual(30, len(fnss.od_pairs_from_topology(view)))
+        topology.remove_edge(0, 1)
+        self.assertEqual(30, len(fnss.od_pairs_from_topology(view)))
+        topology.remove_edge(3, 4)
+        self.assertEqual(12, len(fnss.od_pairs_from_topology(view)))
+
+    def test_memo_in_place_changes(self):
+        topology = fnss.ring_topology(4)
+        fnss.set_delays_constant(topology, 1, 'ms')
+        fnss.add_stack(topology, 0, 'tcp', {'protocol': 'cubic'})
+        topology.graph['tags'] = []
+        try:
+            self.assertEqual(1, fnss.e2e_delay_matrix(topology)[1][0, 1])
+            data = topology.adj[0][1]
+            data |= {'delay': 50}
+            self.assertEqual(50, fnss.e2e_delay_matrix(topology)[1][0, 1])
+            node_data = topology.nodes[0]
+            node_data |= {'type': 'host'}
+            self.assertEqual([0], topology.nodes_by_type('host'))
+            fingerprint = topology.fingerprint()
+            graph = topology.graph
+            graph |= {'note': 'backbone'}
+            self.assertNotEqual(fingerprint, topology.fingerprint())
+            # changes to mutable attribute values require clearing the memo
+            for change in (lambda: topology.graph['tags'].append('core'),
+                           lambda: topology.nodes[0]['stack'][1].update(
+                                                protocol='reno')):
+                fingerprint = topology.fingerprint()
+                change()
+                self.assertEqual(fingerprint, topology.fingerprint())
+                fnss.clear_memo()
+                self.assertNotEqual(fingerprint, topology.fingerprint())
+        finally:
+            fnss.clear_memo()
+
+    def test_freeze(self):
+        frozen = self.G.freeze()
+        self.assertFalse(frozen.is_directed())
+        self.assertEqual(list(self.G.nodes()), frozen.nodes())
+        self.assertEqual(list(self.G.edges()), frozen.edges())
+        self.assertEqual(self.G.graph['capacity_unit'],
+                         frozen.graph['capacity_unit'])
+        for u, v in self.G.edges():
+            i = frozen.edge_index[(u, v)]
+            self.assertEqual(i, frozen.edge_index[(v, u)])
+            self.assertEqual(self.G.adj[u][v]['capacity'], frozen.capacity[i])
+            self.assertEqual(self.G.adj[u][v]['delay'], frozen.delay[i])
+            self.assertEqual(self.G.adj[u][v]['weight'], frozen.weight[i])
+        self.assertTrue(np.isnan(frozen.buffer).all())
+        self.assertRaises(ValueError, frozen.capacity.__setitem__, 0, 1)
+        nodes = frozen.nodes()
+        for v in self.G.nodes():
+            i = frozen.node_index[v]
+            start, stop = frozen.indptr[i], frozen.indptr[i + 1]
+            self.assertEqual(list(self.G.adj[v]),
+                             [nodes[j] for j in frozen.indices[start:stop]])
+            for j, e in zip(frozen.indices[start:stop],
+                            frozen.edge_ids[start:stop]):
+                self.assertEqual(frozen.edge_index[(v, nodes[j])], e)
+        self.assertEqual(self.G.capacities(), fnss.get_capacities(frozen))
+
+    def test_freeze_directed(self):
+        topology = fnss.DirectedTopology()
+        topology.add_edge(0, 1, capacity=10)
+        topology.add_edge(1, 0, capacity=20)
+        topology.add_edge(1, 2)
+        frozen = topology.freeze()
+        self.assertTrue(frozen.is_directed())
+        self.assertEqual([0, 2], frozen.indices[frozen.indptr[1]:
+                                                frozen.indptr[2]].tolist())
+        self.assertTrue(frozen.has_edge(1, 0))
+        self.assertFalse(frozen.has_edge(2, 1))
+        self.assertEqual([10, 20, 5],
+                         frozen.edge_array('capacity', 5).tolist())
+        self.assertEqual([1, 1, 1], frozen.edge_array('cost', 1).tolist())
+
+    def test_frozen_to_topology(self):
+        topology = self.G.freeze().to_topology()
+        self.assertIsInstance(topology, fnss.Topology)
+        self.assertEqual(list(self.G.edges(data=True)),
+                         list(topology.edges(data=True)))
+        self.assertEqual(dict(self.G.nodes(data=True)),
+                         dict(topology.nodes(data=True)))
+        self.assertEqual(self.G.graph, topology.graph)
+        for v in self.G.nodes():
+            self.assertEqual(list(self.G.adj[v]), list(topology.adj[v]))
+        topology.add_edge(1000, 1001)
+        self.assertFalse(self.G.has_node(1000))
+        directed = fnss.DirectedTopology()
+        directed.add_edges_from([(2, 0), (0, 1), (1, 0), (2, 1)])
+        topology = directed.freeze().to_topology()
+        self.assertIsInstance(topology, fnss.DirectedTopology)
+        for v in directed.nodes():
+            self.assertEqual(list(directed.succ[v]), list(topology.succ[v]))
+            self.assertEqual(set(directed.pred[v]), set(topology.pred[v]))
+
+    def test_frozen_od_pairs_fan_in_out_capacities(self):
+        frozen = self.G.freeze()
+        self.assertEqual(fnss.od_pairs_from_topology(self.G),
+                         fnss.od_pairs_from_topology(frozen))
+        self.assertEqual(fnss.fan_in_out_capacities(self.G),
+                         fnss.fan_in_out_capacities(frozen))
+        topology = fnss.DirectedTopology()
+        topology.add_edge(0, 1)
+        topology.add_edge(1, 0)
+        topology.add_edge(1, 2)
+        fnss.set_capacities_constant(topology, 10, 'Mbps')
+        self.assertEqual(fnss.fan_in_out_capacities(topology),
+                         fnss.fan_in_out_capacities(topology.freeze()))
+
+    def test_frozen_routing(self):
+        frozen = self.G.freeze()
+        self.assertEqual(fnss.all_pairs_shortest_paths(self.G),
+                         fnss.all_pairs_shortest_paths(frozen))
+
+    def test_frozen_link_loads_ties(self):
+        # links are unweighted, hence there are many equal-cost paths
+        topology = fnss.waxman_1_topology(60, seed=1)
+        fnss.set_capacities_constant(topology, 10, 'Mbps')
+        traffic_matrix = fnss.TrafficMatrix(volume_unit='Mbps')
+        for u, paths in fnss.all_pairs_shortest_paths(topology).items():
+            for v in paths:
+                if u != v:
+                    traffic_matrix.add_flow(u, v, 0.01)
+        frozen = topology.freeze()
+        self.assertEqual(fnss.link_loads(topology, traffic_matrix),
+                         fnss.link_loads(frozen, traffic_matrix))
+        self.assertEqual(fnss.all_pairs_shortest_paths(topology),
+                         fnss.all_pairs_shortest_paths(frozen.to_topology()))
+
+    @unittest.skipUnless(package_available('scipy'), 'Requires Scipy')
+    def test_frozen_routing_scipy(self):
+        frozen = self.G.freeze()
+        self.assertEqual(
+                fnss.all_pairs_shortest_paths(self.G, backend='scipy'),
+                fnss.all_pairs_shortest_paths(frozen, backend='scipy'))
+        nodes, delays = fnss.e2e_delay_matrix(self.G, backend='scipy')
+        frozen_nodes, frozen_delays = fnss.e2e_delay_matrix(frozen,
+                                                            backend='scipy')
+        self.assertEqual(nodes, frozen_nodes)
+        np.testing.assert_array_equal(delays, frozen_delays)
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    def test_read_write_topology_exact(self):
+        tmp_topo_file = path.join(TMP_DIR, 'toporw-directed.xml')
+        topology = self.G.to_directed()
+        topology.add_node('isolated', weight=2.5)
+        fnss.write_topology(topology, tmp_topo_file)
+        read_topo = fnss.read_topology(tmp_topo_file)
+        self.assertIsInstance(read_topo, fnss.DirectedTopology)
+        self.assertEqual(topology.graph, read_topo.graph)
+        self.assertEqual(list(topology.nodes(data=True)),
+                         list(read_topo.nodes(data=True)))
+        self.assertEqual(list(topology.edges(data=True)),
+                         list(read_topo.edges(data=True)))
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    def test_read_topology_multiple_stacks(self):
+        tmp_topo_file = path.join(TMP_DIR, 'topo-stacks.xml')
+        with open(tmp_topo_file, 'w') as f:
+            f.write('<topology linkdefault="undirected">'
+                    '<node id="1" id.type="int">'
+                    '<stack name="tcp" name.type="string"/>'
+                    '<stack name="udp" name.type="string"/>'
+                    '</node></topology>')
+        self.assertRaises(ET.ParseError, fnss.read_topology, tmp_topo_file)
+
     @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
     def test_read_write_topology(self):
         tmp_topo_file = path.join(TMP_DIR, 'toporw.xml')
@@ -135,3 +565,61 @@ class Test(unittest.TestCase):
                                    if 'client' in fnss.get_application_names(read_topo, v)])
         self.assertEqual([2], [ v for v in read_topo.nodes()
                                 if 'server' in fnss.get_application_names(read_topo, v)])
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    def test_read_write_topology_binary(self):
+        tmp_topo_file = path.join(TMP_DIR, 'toporw.bin')
+        topology = self.G.copy()
+        topology.add_node('isolated', weight=2.5)
+        u, v = next(iter(topology.edges()))
+        topology.adj[u][v]['label'] = 'backbone'
+        topology.adj[u][v]['capacity'] = 12.5
+        topology.adj[u][v]['path'] = [u, v]
+        topology.add_edge((1, 'a'), u, tag=None)
+        topology.graph['origin'] = (1, 2.5)
+        fnss.add_stack(topology, u, 'tcp', {'protocol': 'reno'})
+        fnss.add_application(topology, v, 'server', {'ports': (80, 443)})
+        fnss.write_topology_binary(topology, tmp_topo_file)
+        for mmap in (False, True):
+            read_topo = fnss.read_topology_binary(tmp_topo_file, mmap=mmap)
+            self.assertIsInstance(read_topo, fnss.Topology)
+            self.assertEqual(topology.graph, read_topo.graph)
+            self.assertEqual(list(topology.nodes(data=True)),
+                             list(read_topo.nodes(data=True)))
+            self.assertEqual(list(topology.edges(data=True)),
+                             list(read_topo.edges(data=True)))
+            self.assertIsInstance(read_topo.adj[u][v]['label'], str)
+            self.assertIsInstance(read_topo.adj[u][v]['capacity'], float)
+        # files of the first version had a pickled header
+        with open(tmp_topo_file, 'wb') as f:
+            f.write(b'FNSSTP\x01\x00')
+        self.assertRaises(ValueError, fnss.read_topology_binary,
+                          tmp_topo_file)
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    def test_read_topology_binary_frozen(self):
+        tmp_topo_file = path.join(TMP_DIR, 'toporw-directed.bin')
+        topology = self.G.to_directed()
+        fnss.write_topology_binary(topology, tmp_topo_file)
+        expected = topology.freeze()
+        for mmap in (False, True):
+            frozen = fnss.read_topology_binary(tmp_topo_file, mmap=mmap,
+                                               frozen=True)
+            self.assertIsInstance(frozen, fnss.FrozenTopology)
+            self.assertTrue(frozen.is_directed())
+            for attr in ('sources', 'targets', 'indptr', 'indices',
+                         'edge_ids') + expected.edge_attributes:
+                np.testing.assert_array_equal(getattr(expected, attr),
+                                              getattr(frozen, attr))
+            self.assertFalse(frozen.capacity.flags.writeable)
+            self.assertEqual(expected.nodes(data=True),
+                             frozen.nodes(data=True))
+            self.assertEqual(expected.edges(data=True),
+                             frozen.edges(data=True))
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    def test_read_topology_binary_invalid(self):
+        tmp_topo_file = path.join(TMP_DIR, 'toporw.xml')
+        fnss.write_topology(self.G, tmp_topo_file)
+        self.assertRaises(ValueError, fnss.read_topology_binary,
+                          tmp_topo_file)
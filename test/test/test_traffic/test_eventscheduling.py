@@ -2,10 +2,21 @@ from os import environ, path
 import unittest
 import random
 
+import numpy as np
+
 import fnss
 
 TMP_DIR = environ['test.tmp.dir'] if 'test.tmp.dir' in environ else None
 
+
+def link_event(link, action):
+    return {'link': link, 'action': action}
+
+
+def seeded_link_event(link, seed):
+    return {'link': link, 'seed': seed}
+
+
 class Test(unittest.TestCase):
 
     @classmethod
@@ -98,6 +109,43 @@ class Test(unittest.TestCase):
         self.assertEqual(5, es3[2][0])
         self.assertEqual(7, es3[3][0])
 
+    def test_event_schedule_add_many(self):
+        es = fnss.EventSchedule()
+        es.add(4, {'event_order': 1}, absolute_time=True)
+        es.add_many([9, 5, 4, 2], [{'event_order': i} for i in (5, 3, 2, 0)])
+        self.assertEqual([2, 4, 4, 5, 9], [t for t, _ in es])
+        self.assertEqual(list(range(4)) + [5],
+                         [e['event_order'] for _, e in es])
+        self.assertEqual(9, es.attrib['t_end'])
+        es.add_many([1, 2], [{'event_order': 6}, {'event_order': 7}],
+                    absolute_time=False)
+        self.assertEqual([10, 12], [t for t, _ in es[-2:]])
+        self.assertRaises(ValueError, es.add_many, [-1], [{}])
+        self.assertRaises(ValueError, es.add_many, [1, 2], [{}])
+
+    def test_event_schedule_merge(self):
+        es1 = fnss.EventSchedule(t_unit='s')
+        es1.add_many([3, 5], [{'event_order': 1}, {'event_order': 4}])
+        es2 = fnss.EventSchedule(t_unit='ms')
+        es2.add_many([4000, 5000], [{'event_order': 2}, {'event_order': 5}])
+        es3 = fnss.EventSchedule(t_unit='s')
+        es3.add_many([1, 4, 8], [{'event_order': i} for i in (0, 3, 6)])
+        es1.merge(es2, fnss.EventSchedule(), es3)
+        self.assertEqual([1, 3, 4, 4, 5, 5, 8], [t for t, _ in es1])
+        self.assertEqual([0, 1, 2, 3, 4, 5, 6],
+                         [e['event_order'] for _, e in es1])
+        self.assertEqual(8, es1.attrib['t_end'])
+
+    def test_event_schedule_add_operator_no_side_effects(self):
+        es1 = fnss.EventSchedule()
+        es1.add_many([1, 3], [{}, {}])
+        es2 = fnss.EventSchedule()
+        es2.add_many([2, 4], [{}, {}])
+        es3 = es1 + es2
+        self.assertEqual(4, len(es3))
+        self.assertEqual(2, len(es1))
+        self.assertEqual(3, es1.attrib['t_end'])
+
     def test_event_schedule_operators(self):
         es = fnss.EventSchedule()
         es.add(5, {'event_order': 3}, absolute_time=True)
@@ -115,6 +163,73 @@ class Test(unittest.TestCase):
             self.assertGreaterEqual(t, es.attrib['t_start'])
             self.assertLessEqual(t, es.attrib['t_end'])
 
+    def test_columnar_event_schedule(self):
+        es = fnss.EventSchedule(t_unit='s')
+        es.add_many([1, 2, 2, 3, 5],
+                    [{'link': (1, 2), 'action': 'down', 'capacity': 10},
+                     {'link': (2, 3), 'action': 'down', 'capacity': 20},
+                     {'link': (1, 2), 'action': 'up', 'capacity': 10},
+                     {'link': (2, 3), 'action': 'up', 'capacity': 20,
+                      'weight': 1.5},
+                     {'link': (3, 4), 'action': 'down', 'capacity': 5}])
+        ces = fnss.ColumnarEventSchedule(es)
+        self.assertEqual(5, len(ces))
+        self.assertEqual('s', ces.attrib['t_unit'])
+        self.assertEqual(['link', 'action', 'capacity'], list(ces.columns))
+        self.assertEqual('int64', ces.columns['capacity'].dtype)
+        self.assertEqual((2, 3), ces.columns['link'][1])
+        self.assertEqual({'weight': 1.5}, ces.extra[3])
+        self.assertEqual(es[3], ces[3])
+        self.assertEqual(es[-1], ces[-1])
+        self.assertEqual(list(es), list(ces))
+        window = ces.events_between(2, 5)
+        self.assertEqual(list(es.events_between(2, 5)), list(window))
+        self.assertEqual(2, window.attrib['t_start'])
+        self.assertEqual(5, window.attrib['t_end'])
+        self.assertTrue(np.shares_memory(window.time, ces.time))
+        self.assertEqual(0, len(ces.events_between(3.5, 4)))
+        self.assertEqual(list(es)[1:4], list(ces[1:4]))
+        converted = ces.to_event_schedule()
+        self.assertEqual(es.attrib, converted.attrib)
+        self.assertEqual(list(es), list(converted))
+
+    def test_columnar_event_schedule_empty(self):
+        ces = fnss.ColumnarEventSchedule(fnss.EventSchedule(t_unit='s'))
+        self.assertEqual(0, len(ces))
+        self.assertEqual(0, len(ces.events_between(0, 10)))
+        self.assertEqual([], list(ces.to_event_schedule()))
+        self.assertRaises(IndexError, ces.__getitem__, 0)
+        self.assertRaises(ValueError, fnss.ColumnarEventSchedule,
+                          t_unit='invalid')
+
+    def test_event_tick_index(self):
+        schedule = fnss.EventSchedule(t_unit='s')
+        schedule.add_many([0.001, 0.0012, 0.003, 0.003, 0.0039, 0.0071],
+                          [{'id': i} for i in range(6)])
+        index = schedule.tick_index(1, 'ms')
+        self.assertEqual([1, 3, 7], index.ticks.tolist())
+        self.assertEqual(3, len(index))
+        self.assertEqual([0, 1], [e['id'] for _, e in index[1]])
+        self.assertEqual([2, 3, 4], [e['id'] for _, e in index[3]])
+        self.assertEqual([], index[2])
+        self.assertEqual(0, index.count(5))
+        self.assertEqual(3, index.count(3))
+        self.assertIn(7, index)
+        self.assertNotIn(0, index)
+        self.assertEqual([(1, 2), (3, 3), (7, 1)],
+                         [(k, len(events)) for k, events in index])
+        coarse = schedule.tick_index(2, 'ms')
+        self.assertEqual([0, 1, 3], coarse.ticks.tolist())
+        self.assertEqual(3, len(coarse[1]))
+
+    def test_event_tick_index_columnar(self):
+        schedule = fnss.EventSchedule(t_unit='ms')
+        schedule.add_many([1000, 1500, 3000], [{'id': i} for i in range(3)])
+        index = fnss.EventTickIndex(fnss.ColumnarEventSchedule(schedule),
+                                    1, 's')
+        self.assertEqual([0, 1], index[1].columns['id'].tolist())
+        self.assertEqual(0, len(index[2]))
+        self.assertEqual(0, len(fnss.EventSchedule().tick_index()))
 
     def test_deterministic_process_event_schedule(self):
         action = ['read_email', 'watch_video']
@@ -140,6 +255,200 @@ class Test(unittest.TestCase):
             self.assertTrue(time >= 0)
             self.assertTrue(time <= 8000)
 
+    def test_poisson_process_event_schedule_seed(self):
+        action = ['read_email', 'watch_video']
+        schedules = [fnss.poisson_process_event_schedule(15, 0, 8000, 'ms',
+                                                         self.event_gen, 0.5,
+                                                         action=action,
+                                                         seed=1)
+                     for _ in range(2)]
+        self.assertEqual([t for t, _ in schedules[0]],
+                         [t for t, _ in schedules[1]])
+
+    def test_poisson_process_event_schedule_random_seed(self):
+        action = ['read_email', 'watch_video']
+        schedules = []
+        for _ in range(2):
+            random.seed(1)
+            schedules.append(fnss.poisson_process_event_schedule(
+                    15, 0, 8000, 'ms', self.event_gen, 0.5, action=action))
+        self.assertEqual(list(schedules[0]), list(schedules[1]))
+
+    def test_poisson_process_event_schedule_duration(self):
+        # a short schedule has the same events as the beginning of a long one
+        short, long = [fnss.poisson_process_event_schedule(
+                                15, 0, duration, 'ms', dict, seed=1)
+                       for duration in (100, 10 ** 6)]
+        self.assertLess(0, len(short))
+        self.assertEqual(list(short), list(long)[:len(short)])
+        self.assertLess(100, list(long)[len(short)][0])
+
+    def test_process_event_schedule_batch(self):
+        def batch_event_gen(n, action):
+            return [{'action': action, 'id': i} for i in range(n)]
+        schedule = fnss.poisson_process_event_schedule(2, 10, 300000, 'ms',
+                                                       batch_event_gen,
+                                                       'read_email', seed=1,
+                                                       batch=True)
+        times = [t for t, _ in schedule]
+        self.assertEqual(sorted(times), times)
+        self.assertGreater(times[0], 10)
+        self.assertLess(times[-1], 300010)
+        self.assertAlmostEqual(150000, len(schedule), delta=2000)
+        self.assertEqual(list(range(len(schedule))),
+                         [e['id'] for _, e in schedule])
+        schedule = fnss.deterministic_process_event_schedule(
+                        2, 0, 200000, 'ms', batch_event_gen, batch=True,
+                        action='watch_video')
+        self.assertEqual(99999, len(schedule))
+        self.assertEqual(2, schedule[0][0])
+        self.assertEqual(199998, schedule[-1][0])
+        self.assertEqual({'action': 'watch_video', 'id': 0}, schedule[0][1])
+        self.assertRaises(ValueError, fnss.deterministic_process_event_schedule,
+                          2, 0, 10, 'ms', lambda n: [{}], batch=True)
+
+    def test_nonhomogeneous_poisson_process_event_schedule_piecewise(self):
+        rates = [10, 0, 30]
+        schedule = fnss.nonhomogeneous_poisson_process_event_schedule(
+                        rates, 5, 3000, 's', dict, interval=10, seed=1)
+        times = np.asarray([t for t, _ in schedule])
+        self.assertTrue((np.diff(times) >= 0).all())
+        self.assertTrue((times >= 5).all() and (times < 3005).all())
+        pieces = ((times - 5) // 10).astype(int) % 3
+        counts = np.bincount(pieces, minlength=3)
+        self.assertEqual(0, counts[1])
+        self.assertAlmostEqual(10000, counts[0], delta=600)
+        self.assertAlmostEqual(30000, counts[2], delta=1000)
+        self.assertRaises(ValueError,
+                          fnss.nonhomogeneous_poisson_process_event_schedule,
+                          rates, 0, 10, 's', dict)
+
+    def test_nonhomogeneous_poisson_process_event_schedule_function(self):
+        def rate(t):
+            return 50 * (1 + np.sin(2 * np.pi * t / 100))
+        schedule = fnss.nonhomogeneous_poisson_process_event_schedule(
+                        rate, 0, 1000, 's', dict, max_rate=100, seed=1)
+        times = np.asarray([t for t, _ in schedule])
+        self.assertAlmostEqual(50000, len(times), delta=1500)
+        # the first half of each period has a higher rate
+        first_half = ((times % 100) < 50).sum()
+        self.assertGreater(first_half, 2 * (len(times) - first_half))
+        self.assertRaises(ValueError,
+                          fnss.nonhomogeneous_poisson_process_event_schedule,
+                          rate, 0, 1000, 's', dict, max_rate=10)
+        estimated = fnss.nonhomogeneous_poisson_process_event_schedule(
+                        rate, 0, 1000, 's', dict, seed=1)
+        self.assertAlmostEqual(50000, len(estimated), delta=1500)
+
+    def test_markov_modulated_poisson_process_event_schedule(self):
+        schedule = fnss.markov_modulated_poisson_process_event_schedule(
+                        [1, 20], [[0, 0.1], [0.1, 0]], 0, 20000, 's',
+                        lambda: {'action': 'down'}, seed=1)
+        times = np.asarray([t for t, _ in schedule])
+        self.assertTrue((np.diff(times) >= 0).all())
+        self.assertTrue((times >= 0).all() and (times < 20000).all())
+        # both states have the same stationary probability
+        self.assertAlmostEqual(210000, len(times), delta=15000)
+        absorbing = fnss.markov_modulated_poisson_process_event_schedule(
+                        [0, 20], [[0, 0], [1, 0]], 0, 1000, 's', dict,
+                        seed=1)
+        self.assertEqual(0, len(absorbing))
+        self.assertRaises(ValueError,
+                          fnss.markov_modulated_poisson_process_event_schedule,
+                          [1, 2], [[0, 1]], 0, 10, 's', dict)
+
+    def test_parallel_event_schedule(self):
+        links = list(fnss.ring_topology(20).edges())
+        schedules = [fnss.parallel_event_schedule(
+                            links, fnss.poisson_process_event_schedule,
+                            (100, 0, 100000, 's'), link_event, ('down',),
+                            seed=1, processes=processes)
+                     for processes in (1, 2)]
+        self.assertEqual(list(schedules[0]), list(schedules[1]))
+        schedule = schedules[0]
+        self.assertEqual('s', schedule.attrib['t_unit'])
+        times = [t for t, _ in schedule]
+        self.assertEqual(sorted(times), times)
+        self.assertEqual(set(links), set(e['link'] for _, e in schedule))
+        self.assertAlmostEqual(20000, len(schedule), delta=600)
+        # each entity has a different seed
+        link_times = {}
+        for t, e in schedule:
+            link_times.setdefault(e['link'], []).append(t)
+        self.assertEqual(len(links),
+                         len(set(ts[0] for ts in link_times.values())))
+
+    def test_parallel_event_schedule_deterministic(self):
+        schedule = fnss.parallel_event_schedule(
+                        [1, 2, 3], fnss.deterministic_process_event_schedule,
+                        (10, 0, 100, 's'), link_event,
+                        kwargs={'action': 'tick'}, processes=1)
+        self.assertEqual(27, len(schedule))
+        self.assertEqual([(10, {'link': i, 'action': 'tick'})
+                          for i in (1, 2, 3)], schedule[:3])
+
+    def test_deterministic_process_event_generator_seed(self):
+        # a seed argument is passed to the generator of deterministic events
+        schedule = fnss.deterministic_process_event_schedule(10, 0, 30, 's',
+                                                             dict, seed=3)
+        self.assertEqual([(10, {'seed': 3}), (20, {'seed': 3})],
+                         list(schedule))
+        stream = fnss.deterministic_process_event_stream(10, 0, 30, 's',
+                                                         dict, seed=3)
+        self.assertEqual(list(schedule), list(stream))
+        schedule = fnss.parallel_event_schedule(
+                        [1, 2], fnss.deterministic_process_event_schedule,
+                        (10, 0, 30, 's'), seeded_link_event,
+                        kwargs={'seed': 3}, seed=1, processes=1)
+        self.assertEqual([{'link': i, 'seed': 3} for i in (1, 2, 1, 2)],
+                         [event for _, event in schedule])
+
+    def test_poisson_process_event_stream(self):
+        action = ['read_email', 'watch_video']
+        schedule = fnss.poisson_process_event_schedule(5, 0, 800000, 'ms',
+                                                       self.event_gen, 0.5,
+                                                       action=action, seed=1)
+        stream = fnss.poisson_process_event_stream(5, 0, 800000, 'ms',
+                                                   self.event_gen, 0.5,
+                                                   action=action, seed=1)
+        self.assertEqual([t for t, _ in schedule], [t for t, _ in stream])
+
+    def test_deterministic_process_event_stream_window(self):
+        def batch_event_gen(n):
+            return [{'action': 'up'}] * n
+        windows = list(fnss.deterministic_process_event_stream(
+                                3, 0, 1000, 's', batch_event_gen,
+                                window=100, batch=True))
+        self.assertEqual(10, len(windows))
+        self.assertEqual(333, sum(len(w) for w in windows))
+        for i, window in enumerate(windows):
+            self.assertEqual('s', window.attrib['t_unit'])
+            self.assertEqual(100 * i, window.attrib['t_start'])
+            self.assertEqual(100 * (i + 1), window.attrib['t_end'])
+            for t, _ in window:
+                self.assertGreaterEqual(t, 100 * i)
+                self.assertLess(t, 100 * (i + 1))
+        self.assertEqual(3, windows[0][0][0])
+        self.assertEqual(999, windows[-1][-1][0])
+
+    def test_poisson_process_event_stream_empty_windows(self):
+        windows = list(fnss.poisson_process_event_stream(
+                            10000, 0, 1000, 's', dict, window=100, seed=1))
+        self.assertEqual(10, len(windows))
+
+    def test_merge_event_streams(self):
+        failures = fnss.poisson_process_event_stream(
+                        10, 0, 10000, 's', lambda: {'action': 'down'}, seed=1)
+        restores = fnss.poisson_process_event_stream(
+                        10, 0, 10000, 's', lambda: {'action': 'up'}, seed=2)
+        ticks = fnss.deterministic_process_event_stream(
+                        10, 0, 10000, 's', lambda: {'action': 'tick'})
+        events = list(fnss.merge_event_streams(failures, restores, ticks))
+        times = [t for t, _ in events]
+        self.assertEqual(sorted(times), times)
+        self.assertEqual(999, len([e for _, e in events
+                                   if e['action'] == 'tick']))
+
     @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
     def test_read_write_event_schedule(self):
         action = ['read_email', 'watch_video']
@@ -174,3 +483,168 @@ class Test(unittest.TestCase):
         self.assertEqual(event['dict_param'], read_event['dict_param'])
         self.assertEqual(event['list_param'], read_event['list_param'])
         self.assertEqual(event['tuple_param'], read_event['tuple_param'])
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    def test_iter_event_schedule(self):
+        schedule = fnss.EventSchedule(t_start=2, t_unit='s')
+        schedule.add_many([3, 4, 9], [{'link': (1, 2), 'action': 'down'},
+                                      {'link': (1, 2), 'action': 'up'},
+                                      {'capacity': 10, 'enabled': True}])
+        tmp_es_file = path.join(TMP_DIR, 'event-schedule-iter.xml')
+        fnss.write_event_schedule(schedule, tmp_es_file)
+        self.assertEqual(list(schedule),
+                         list(fnss.iter_event_schedule(tmp_es_file)))
+        read_schedule = fnss.read_event_schedule(tmp_es_file)
+        self.assertEqual(list(schedule), list(read_schedule))
+        self.assertEqual(schedule.attrib, read_schedule.attrib)
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    def test_read_write_event_schedule_binary(self):
+        schedule = fnss.EventSchedule(t_start=2, t_unit='s')
+        schedule.attrib['name'] = 'failures'
+        schedule.add_many([3, 4, 4, 9], [{'link': (1, 2), 'action': 'down'},
+                                         {'link': (1, 2), 'action': 'up'},
+                                         {'link': (2, 3), 'action': 'down'},
+                                         {'capacity': 10, 'enabled': True}])
+        schedule.add(10, {'path': [1, 2, 3], 'size': 1.5, 'note': None,
+                          'meta': {'id': 'a'}, 'count': np.int64(3)})
+        tmp_es_file = path.join(TMP_DIR, 'event-schedule.bin')
+        fnss.write_event_schedule_binary(schedule, tmp_es_file)
+        read_schedule = fnss.read_event_schedule_binary(tmp_es_file)
+        self.assertEqual(schedule.attrib, read_schedule.attrib)
+        self.assertEqual(list(schedule), list(read_schedule))
+        self.assertEqual(list(schedule),
+                         list(fnss.iter_event_schedule_binary(tmp_es_file)))
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    def test_event_schedule_writer(self):
+        tmp_es_file = path.join(TMP_DIR, 'event-schedule-stream.bin')
+        stream = fnss.deterministic_process_event_stream(
+                        5, 0, 1000, 'ms', lambda: {'action': 'tick'})
+        with fnss.EventScheduleWriter(tmp_es_file, t_unit='ms') as writer:
+            writer.write_many(stream)
+            self.assertRaises(ValueError, writer.write, 1, {})
+        read_schedule = fnss.read_event_schedule_binary(tmp_es_file)
+        self.assertEqual(199, len(read_schedule))
+        self.assertEqual(995, read_schedule.attrib['t_end'])
+        self.assertEqual('ms', read_schedule.attrib['t_unit'])
+        empty_file = path.join(TMP_DIR, 'event-schedule-empty.bin')
+        fnss.write_event_schedule_binary(fnss.EventSchedule(), empty_file)
+        self.assertEqual(0, len(fnss.read_event_schedule_binary(empty_file)))
+        invalid_file = path.join(TMP_DIR, 'event-schedule-invalid.bin')
+        with open(invalid_file, 'wb') as f:
+            f.write(b'<event-schedule/>')
+        self.assertRaises(ValueError, fnss.read_event_schedule_binary,
+                          invalid_file)
+        # Files of the first version stored pickled properties
+        with open(invalid_file, 'wb') as f:
+            f.write(b'FNSSES\x01\x00')
+        self.assertRaises(ValueError, fnss.read_event_schedule_binary,
+                          invalid_file)
+
+    def _sharding_schedule(self):
+        schedule = fnss.EventSchedule(t_unit='s')
+        schedule.add_many([1, 8, 12, 15, 25],
+                          [{'action': 'down', 'link': (1, 2)},
+                           {'action': 'down', 'link': (2, 3)},
+                           {'action': 'up', 'link': (1, 2)},
+                           {'action': 'reset'},
+                           {'action': 'up', 'node': 3}])
+        return schedule
+
+    def test_shard_event_schedule(self):
+        partition = {1: 0, 2: 0, 3: 1}
+        shards = fnss.shard_event_schedule(self._sharding_schedule(),
+                                           partition, window=10)
+        self.assertEqual(set((p, k) for p in (0, 1) for k in range(3)),
+                         set(shards))
+        self.assertEqual([1, 8], [t for t, _ in shards[(0, 0)]])
+        self.assertEqual([8], [t for t, _ in shards[(1, 0)]])
+        self.assertEqual([12, 15], [t for t, _ in shards[(0, 1)]])
+        self.assertEqual([15], [t for t, _ in shards[(1, 1)]])
+        self.assertEqual(0, len(shards[(0, 2)]))
+        self.assertEqual([25], [t for t, _ in shards[(1, 2)]])
+        self.assertEqual(10, shards[(1, 1)].attrib['t_start'])
+        self.assertEqual(20, shards[(1, 1)].attrib['window_end'])
+        self.assertEqual('s', shards[(1, 1)].attrib['t_unit'])
+
+    def test_shard_event_schedule_lookahead(self):
+        partition = {1: 0, 2: 0, 3: 1}
+        shards = fnss.shard_event_schedule(self._sharding_schedule(),
+                                           partition, window=10, lookahead=5)
+        self.assertEqual([1, 8, 12], [t for t, _ in shards[(0, 0)]])
+        self.assertEqual([12, 15], [t for t, _ in shards[(0, 1)]])
+        self.assertEqual([15], [t for t, _ in shards[(1, 1)]])
+
+    def test_shard_event_schedule_no_window(self):
+        shards = fnss.shard_event_schedule(
+                        self._sharding_schedule(), {1: 'a', 2: 'b', 3: 'b'},
+                        event_nodes=lambda event: None)
+        self.assertEqual({('a', 0), ('b', 0)}, set(shards))
+        self.assertEqual(5, len(shards[('a', 0)]))
+
+    @unittest.skipIf(TMP_DIR is None, "Temp folder not present")
+    def test_shard_event_schedule_binary(self):
+        schedule = self._sharding_schedule()
+        partition = {1: 0, 2: 0, 3: 1}
+        shard_dir = path.join(TMP_DIR, 'event-schedule-shards')
+        files = fnss.shard_event_schedule(schedule, partition, window=10,
+                                          lookahead=5, path=shard_dir)
+        shards = fnss.shard_event_schedule(schedule, partition, window=10,
+                                           lookahead=5)
+        self.assertEqual(set(shards), set(files))
+        for key, shard in shards.items():
+            read_shard = fnss.read_event_schedule_binary(files[key])
+            self.assertEqual(list(shard), list(read_shard))
+            self.assertEqual(key, (read_shard.attrib['partition'],
+                                   read_shard.attrib['window']))
+
+    def test_event_replayer(self):
+        topology = fnss.ring_topology(6)
+        fnss.set_capacities_constant(topology, 10, 'Mbps')
+        schedule = fnss.EventSchedule(t_unit='s')
+        schedule.add_many([1, 2, 2, 3, 3, 4, 4],
+                          [{'action': 'down', 'link': (1, 0)},
+                           {'action': 'down', 'link': (2, 3)},
+                           {'action': 'capacity', 'link': (3, 4),
+                            'capacity': 1, 'capacity_unit': 'Gbps'},
+                           {'action': 'capacity', 'link': (0, 1),
+                            'capacity': 20},
+                           {'action': 'up', 'link': (0, 1)},
+                           {'action': 'down', 'link': (4, 5)},
+                           {'action': 'up', 'link': (4, 5)}])
+        replayer = fnss.EventReplayer(topology, schedule)
+        batches = []
+        replayer.add_callback(lambda topo, changes: batches.append(
+                                (changes.time, set(changes.removed_links),
+                                 set(changes.added_links),
+                                 dict(changes.updated_links),
+                                 topo.number_of_edges())))
+        self.assertEqual(4, replayer.run())
+        self.assertEqual((1, {(1, 0)}, set(), {}, 5), batches[0])
+        self.assertEqual((2, {(2, 3)}, set(), {(3, 4): {'capacity'}}, 4),
+                         batches[1])
+        self.assertEqual((3, set(), {(1, 0)}, {}, 5), batches[2])
+        self.assertEqual((4, set(), set(), {(4, 5): set()}, 5), batches[3])
+        self.assertEqual(20, topology.adj[0][1]['capacity'])
+        self.assertEqual(1000, topology.adj[3][4]['capacity'])
+        self.assertFalse(topology.has_edge(2, 3))
+        self.assertEqual({(2, 3): {'capacity': 10}}, replayer.failed_links)
+
+    def test_event_replayer_custom_handler(self):
+        topology = fnss.line_topology(3)
+        schedule = fnss.EventSchedule()
+        schedule.add_many([1, 2], [{'action': 'weight', 'link': (0, 1),
+                                    'weight': 5},
+                                   {'action': 'unknown'}])
+
+        def set_weight(topology, event, changes):
+            u, v = event['link']
+            topology.adj[u][v]['weight'] = event['weight']
+            changes.update_link(u, v, 'weight')
+        replayer = fnss.EventReplayer(topology, schedule)
+        replayer.register_handler('weight', set_weight)
+        changes = replayer.replay()
+        self.assertEqual({(0, 1): {'weight'}}, next(changes).updated_links)
+        self.assertEqual(5, topology.adj[0][1]['weight'])
+        self.assertRaises(ValueError, next, changes)
@@ -0,0 +1,79 @@
+import pickle
+import unittest
+
+import numpy as np
+
+import fnss
+
+
+class Test(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.G = fnss.glp_topology(n=30, m=1, m0=10, p=0.2, beta=-2, seed=1)
+        fnss.set_capacities_random(cls.G, {10: 0.5, 20: 0.3, 40: 0.2},
+                                   capacity_unit='Mbps')
+        cls.tms = fnss.sin_cyclostationary_traffic_matrix(
+                    cls.G, mean=0.5, stddev=0.05, gamma=0.8, log_psi=-0.33,
+                    delta=0.2, n=10, periods=2, max_u=0.9)
+
+    def test_mean_max_min(self):
+        stats = fnss.link_load_statistics(self.G, iter(self.tms))
+        self.assertEqual(20, len(stats))
+        loads = [fnss.link_loads(self.G, tm) for tm in self.tms]
+        mean = stats.mean()
+        max_u = stats.max()
+        min_u = stats.min()
+        self.assertEqual(set(loads[0]), set(mean))
+        for link in loads[0]:
+            values = [load[link] for load in loads]
+            self.assertAlmostEqual(np.mean(values), mean[link])
+            self.assertAlmostEqual(max(values), max_u[link])
+            self.assertAlmostEqual(min(values), min_u[link])
+        self.assertAlmostEqual(0.9, max(max_u.values()))
+
+    def test_quantile(self):
+        accuracy = 0.01
+        stats = fnss.link_load_statistics(self.G, self.tms,
+                                          relative_accuracy=accuracy)
+        loads = [fnss.link_loads(self.G, tm) for tm in self.tms]
+        p90 = stats.quantile(0.9)
+        median = stats.quantile(0.5)
+        for link in loads[0]:
+            values = sorted(load[link] for load in loads)
+            for q, estimate in ((0.9, p90[link]), (0.5, median[link])):
+                exact = values[int(q * (len(values) - 1))]
+                if exact < stats.attrib['min_utilization']:
+                    self.assertEqual(0, estimate)
+                else:
+                    self.assertLessEqual(abs(estimate - exact),
+                                         accuracy * exact + 1e-12)
+        self.assertEqual(stats.min(), stats.quantile(0))
+        self.assertEqual(stats.max(), stats.quantile(1))
+
+    def test_merge(self):
+        stats = fnss.link_load_statistics(self.G, self.tms)
+        first = fnss.LinkLoadStatistics(self.G)
+        first.update_from(self.tms[:7])
+        second = pickle.loads(pickle.dumps(
+                        fnss.link_load_statistics(self.G, self.tms[7:])))
+        first.merge(second)
+        self.assertEqual(stats.count, first.count)
+        self.assertEqual(stats.quantile(0.95), first.quantile(0.95))
+        self.assertEqual(stats.max(), first.max())
+        for link, mean in stats.mean().items():
+            self.assertAlmostEqual(mean, first.mean()[link])
+
+    def test_merge_different_parameters(self):
+        stats = fnss.LinkLoadStatistics(self.G, relative_accuracy=0.01)
+        other = fnss.LinkLoadStatistics(self.G, relative_accuracy=0.02)
+        self.assertRaises(ValueError, stats.merge, other)
+
+    def test_empty(self):
+        stats = fnss.LinkLoadStatistics(self.G)
+        self.assertRaises(ValueError, stats.mean)
+        self.assertRaises(ValueError, stats.quantile, 0.5)
+
+    def test_no_capacity(self):
+        self.assertRaises(ValueError, fnss.LinkLoadStatistics,
+                          fnss.ring_topology(4))
@@ -2,6 +2,7 @@ from os import environ, path
 from math import exp
 import unittest
 
+import numpy as np
 from numpy import isinf
 
 import fnss
@@ -88,6 +89,12 @@ class Test(unittest.TestCase):
         self.assertAlmostEqual(0.0, load[(2, 1)])
         self.assertAlmostEqual(0.7, load[(0, 4)])
         self.assertAlmostEqual(0.5, load[(4, 3)])
+        self.assertFalse(any('load' in data
+                             for _, _, data in topo.edges(data=True)))
+        frozen_load = fnss.link_loads(topo.freeze(), tm)
+        self.assertEqual(set(load), set(frozen_load))
+        for link in load:
+            self.assertAlmostEqual(load[link], frozen_load[link])
 
     def test_link_loads_ecmp(self):
         topo = fnss.ring_topology(5)
@@ -145,6 +152,18 @@ class Test(unittest.TestCase):
         self.assertAlmostEqual(0.0, load[(4, 0)])
         self.assertAlmostEqual(0.0, load[(2, 1)])
         self.assertAlmostEqual(0.0, load[(2, 3)])
+        frozen_load = fnss.link_loads(topo.freeze(), tm, routing_matrix=rm,
+                                      ecmp=True)
+        for link in load:
+            self.assertAlmostEqual(load[link], frozen_load[link])
+
+    def test_frozen_topology_traffic_matrix(self):
+        frozen = self.G.freeze()
+        tm = fnss.static_traffic_matrix(frozen, 10, 8, max_u=0.9)
+        fnss.validate_traffic_matrix(frozen, tm, validate_load=True)
+        self.assertAlmostEqual(0.9, max(fnss.link_loads(frozen, tm).values()))
+        stats = fnss.link_load_statistics(frozen, [tm])
+        self.assertAlmostEqual(0.9, max(stats.max().values()))
         
     def test_static_traffic_matrix(self):
         tm = fnss.static_traffic_matrix(self.G, 10, 8, max_u=0.9)
@@ -190,6 +209,35 @@ class Test(unittest.TestCase):
         self.assertAlmostEqual(0.9, max([max(fnss.link_loads(self.G, tm).values()) for tm in tms]))
         self.assertLessEqual(0, min([min(fnss.link_loads(self.G, tm).values()) for tm in tms]))
     
+    def test_sin_cyclostationary_traffic_matrix_generator(self):
+        tms = fnss.sin_cyclostationary_traffic_matrix_generator(
+                    self.G, 10, 0.2, gamma=0.3, log_psi=-0.3, delta=0.2,
+                    n=24, periods=2, max_u=0.9, seed=3)
+        tms = list(tms)
+        self.assertEqual(48, len(tms))
+        self.assertAlmostEqual(0.9, max([max(fnss.link_loads(self.G, tm).values()) for tm in tms]))
+        self.assertLessEqual(0, min([min(fnss.link_loads(self.G, tm).values()) for tm in tms]))
+
+    def test_sin_cyclostationary_traffic_matrix_generator_seed(self):
+        sequences = []
+        for state in (1, 2):
+            # the seed determines both the mean volumes and the fluctuations
+            np.random.seed(state)
+            tms = fnss.sin_cyclostationary_traffic_matrix_generator(
+                        self.G, 10, 0.2, gamma=0.3, log_psi=-0.3, n=4,
+                        periods=1, max_u=0.9, seed=3)
+            sequences.append([tm.flows() for tm in tms])
+        self.assertEqual(sequences[0], sequences[1])
+
+    def test_sin_cyclostationary_traffic_matrix_generator_unscaled(self):
+        tms = fnss.sin_cyclostationary_traffic_matrix_generator(
+                    self.G, 10, 0.2, gamma=0.3, log_psi=-0.3, n=4, periods=3,
+                    max_u=None, seed=3)
+        self.assertEqual(12, len(list(tms)))
+        self.assertRaises(ValueError,
+                          fnss.sin_cyclostationary_traffic_matrix_generator,
+                          self.G, 10, 0.2, gamma=0.3, log_psi=-1500)
+
     def test_sin_cyclostationary_traffic_matrix_low_log_psi(self):
         # Test that with very low value of log_psi and/or gamma to test 
         # that FNSS deals properly with division by 0 cases
@@ -1,5 +1,9 @@
+from importlib import import_module
+import subprocess
+import sys
 import unittest
 
+import fnss
 import fnss.util as util
 
 
@@ -23,3 +27,55 @@ class TestGeographicalDistance(unittest.TestCase):
     def test_pole_node(self):
         d = util.geographical_distance(90, 30, 40, 90)
         self.assertGreater(d, 0)
+
+
+class TestXmlCastType(unittest.TestCase):
+
+    def test_cast_type(self):
+        self.assertEqual(3, util.xml_cast_type('int', '3'))
+        self.assertEqual(2.5, util.xml_cast_type('float', '2.5'))
+        self.assertIs(True, util.xml_cast_type('boolean', 'True'))
+        self.assertIs(False, util.xml_cast_type('boolean', 'False'))
+        self.assertEqual((1, 'a'), util.xml_cast_type('tuple', "(1, 'a')"))
+        self.assertEqual({'a': [1]}, util.xml_cast_type('dict', "{'a': [1]}"))
+        self.assertEqual('text', util.xml_cast_type('string', 'text'))
+
+    def test_cast_function(self):
+        self.assertIs(util.xml_cast_function('int'),
+                      util.xml_cast_function('int'))
+        self.assertEqual([1, 2], util.xml_cast_function('list')('[1, 2]'))
+        self.assertEqual('5', util.xml_cast_function('unknown')('5'))
+
+
+class TestLazyAttributes(unittest.TestCase):
+
+    @unittest.skipIf(sys.version_info[:2] < (3, 7), "Requires Python 3.7+")
+    def test_import_fnss(self):
+        # importing fnss must not import the modules of its subpackages
+        code = ('import sys, fnss; '
+                'print(any(m.startswith("fnss.topologies.") '
+                'or m == "networkx" for m in sys.modules))')
+        out = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(b'False', out.strip())
+
+    def test_names(self):
+        for package in (fnss.topologies, fnss.netconfig, fnss.traffic,
+                        fnss.adapters):
+            for module, names in package._modules.items():
+                module = import_module('%s.%s' % (package.__name__, module))
+                self.assertEqual(sorted(module.__all__), sorted(names))
+                for name in names:
+                    self.assertIs(getattr(module, name),
+                                  getattr(package, name))
+                    self.assertIs(getattr(module, name), getattr(fnss, name))
+                    self.assertIn(name, dir(fnss))
+        self.assertIs(fnss.topologies.datacenter, fnss.datacenter)
+        namespace = {}
+        exec('from fnss import *', namespace)
+        self.assertEqual(set(name for name in dir(fnss)
+                             if not name.startswith('_')),
+                         set(name for name in namespace
+                             if not name.startswith('_')))
+        self.assertRaises(AttributeError, getattr, fnss, 'no_topology')
+        self.assertRaises(AttributeError, getattr, fnss.traffic,
+                          'no_traffic_matrix')